@@ -1,26 +1,93 @@
 """ODM Plugin Module."""
 
-from .depends import depends_odm_client, depends_odm_database
-from .documents import BaseDocument
+from .advisor import IndexAdvisor
+from .cache import EntityCache
+from .depends import (
+    depends_odm_buffered_writers,
+    depends_odm_cache_invalidator,
+    depends_odm_client,
+    depends_odm_command_profiler,
+    depends_odm_database,
+    depends_odm_index_advisor,
+    depends_odm_loaders,
+    depends_odm_pagination_secret,
+    depends_odm_retry_policy,
+)
+from .documents import CREATED_AT_PAGINATION_INDEX, BaseDocument
+from .enums import CompressorEnum, ExportFormatEnum, ReadPreferenceEnum, SessionPolicyEnum
 from .exceptions import (
+    InvalidPaginationCursorError,
     ODMPluginBaseException,
     ODMPluginConfigError,
     OperationError,
     UnableToCreateEntityDueToDuplicateKeyError,
 )
+from .exports import export_response
 from .helpers import PersistedEntity
+from .invalidation import ChangeStreamCacheInvalidator
+from .loaders import EntityLoader, EntityLoaders
+from .monitoring import CommandProfiler, PoolMetricsListener
 from .plugins import ODMPlugin
 from .repositories import AbstractRepository
+from .retries import RetryBudget, RetryPolicy
+from .types import (
+    BufferedWriterStats,
+    BulkUpdateResult,
+    BulkWriteItemError,
+    EntityCacheStats,
+    IndexAdvice,
+    IndexAdvisorReport,
+    InsertManyResult,
+    Page,
+    SlowCommand,
+)
+from .unit_of_work import UnitOfWork
+from .writers import BufferedWriter, BufferedWriters
 
 __all__: list[str] = [
+    "CREATED_AT_PAGINATION_INDEX",
     "AbstractRepository",
     "BaseDocument",
+    "BufferedWriter",
+    "BufferedWriterStats",
+    "BufferedWriters",
+    "BulkUpdateResult",
+    "BulkWriteItemError",
+    "ChangeStreamCacheInvalidator",
+    "CommandProfiler",
+    "CompressorEnum",
+    "EntityCache",
+    "EntityCacheStats",
+    "EntityLoader",
+    "EntityLoaders",
+    "ExportFormatEnum",
+    "IndexAdvice",
+    "IndexAdvisor",
+    "IndexAdvisorReport",
+    "InsertManyResult",
+    "InvalidPaginationCursorError",
     "ODMPlugin",
     "ODMPluginBaseException",
     "ODMPluginConfigError",
     "OperationError",
+    "Page",
     "PersistedEntity",
+    "PoolMetricsListener",
+    "ReadPreferenceEnum",
+    "RetryBudget",
+    "RetryPolicy",
+    "SessionPolicyEnum",
+    "SlowCommand",
     "UnableToCreateEntityDueToDuplicateKeyError",
+    "UnitOfWork",
+    "depends_odm_buffered_writers",
+    "depends_odm_cache_invalidator",
     "depends_odm_client",
+    "depends_odm_command_profiler",
     "depends_odm_database",
+    "depends_odm_index_advisor",
+    "depends_odm_loaders",
+    "depends_odm_pagination_secret",
+    "depends_odm_retry_policy",
+    "export_response",
 ]
@@ -0,0 +1,247 @@
+"""Provides the index advisor explaining the queries of the repositories."""
+
+import asyncio
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from beanie import Document
+from beanie.odm.fields import IndexModelField
+from beanie.odm.utils.pydantic import get_model_fields
+from beanie.odm.utils.typing import get_index_attributes
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import IndexModel
+from structlog.stdlib import BoundLogger, get_logger
+
+from .monitoring import normalize_shape
+from .types import IndexAdvice, IndexAdvisorReport
+
+_logger: BoundLogger = get_logger()
+
+# Operators combining clauses, whose fields are fields of the query.
+_LOGICAL_OPERATORS: frozenset[str] = frozenset({"$and", "$or", "$nor"})
+
+
+def _find_key(value: Any, key: str) -> Any:
+    """Find the first value of the key in the nested documents, e.g. in the stages of an aggregation explain."""
+    if isinstance(value, Mapping):
+        if key in value:
+            return value[key]
+        value = list(value.values())
+    if isinstance(value, list):
+        for item in value:
+            found: Any = _find_key(item, key)
+            if found is not None:
+                return found
+    return None
+
+
+def _plan_stages(plan: Any) -> Iterator[Mapping[str, Any]]:
+    """Iterate the stages of a plan, from the root."""
+    if not isinstance(plan, Mapping):
+        return
+    if "stage" in plan:
+        yield plan
+    for key in ("queryPlan", "inputStage", "thenStage", "elseStage"):
+        yield from _plan_stages(plan.get(key))
+    for input_stage in plan.get("inputStages", []):
+        yield from _plan_stages(input_stage)
+
+
+def _filter_fields(query: Any) -> list[str]:
+    """List the fields filtered by the query, including those of its logical clauses."""
+    fields: list[str] = []
+    if not isinstance(query, Mapping):
+        return fields
+    for key, value in query.items():
+        if key in _LOGICAL_OPERATORS and isinstance(value, list):
+            for clause in value:
+                fields.extend(_filter_fields(clause))
+        elif not key.startswith("$"):
+            fields.append(key)
+    return fields
+
+
+def _query_fields(command: str, spec: Mapping[str, Any]) -> list[str]:
+    """List the fields filtered, then sorted, by the query."""
+    query: Any = spec.get("filter") or spec.get("query")
+    sort: Any = spec.get("sort")
+    if command == "aggregate":
+        # Only the leading $match and $sort stages can use an index.
+        for stage in spec.get("pipeline", []):
+            if "$match" in stage and query is None:
+                query = stage["$match"]
+            elif "$sort" in stage and sort is None:
+                sort = stage["$sort"]
+            else:
+                break
+    return _filter_fields(query) + (list(sort) if isinstance(sort, Mapping) else [])
+
+
+def declared_indexes(document_type: type[Document]) -> list[list[str]]:
+    """List the keys of the indexes declared by the document model, with Indexed annotations or in its Settings.
+
+    Args:
+        document_type (type[Document]): The document model, initialized by beanie.
+
+    Returns:
+        list[list[str]]: The keys of each index, "_id" first.
+    """
+    indexes: list[list[str]] = [["_id"]]
+    for field_name, field in get_model_fields(document_type).items():
+        if get_index_attributes(field) is not None:
+            indexes.append([field.alias or field_name])
+    for index in document_type.get_settings().indexes:
+        index_model: Any = index.index if isinstance(index, IndexModelField) else index
+        if isinstance(index_model, IndexModel):
+            indexes.append(list(index_model.document["key"]))
+        elif isinstance(index_model, str):
+            indexes.append([index_model])
+        elif isinstance(index_model, list | tuple):
+            indexes.append([key if isinstance(key, str) else key[0] for key in index_model])
+    return indexes
+
+
+class IndexAdvisor:
+    """Explain each query shape of the repositories and flag the ones not served by an index.
+
+    A query is flagged when its winning plan scans the collection, or when it examines more than
+    `max_examined_ratio` documents per document returned. The fields of a flagged query are compared with the
+    indexes declared on the document model, telling a missing index from a declared one the query cannot use.
+
+    The advisor is opt-in, given to the repositories observed, e.g. for a test session:
+
+    ```python
+    advisor = IndexAdvisor()
+    repository = BookRepository(database=database, index_advisor=advisor)
+    # ... run the tests ...
+    report: IndexAdvisorReport = advisor.report()
+    assert not report.has_problems, str(report)
+    ```
+
+    Each query shape is explained once, with the values of its first query. Explaining runs the query again:
+    by default the explain is awaited before the query, use `background=True` to explain in the background
+    (shadow mode), without delaying the queries.
+    """
+
+    def __init__(self, max_examined_ratio: float = 10.0, background: bool = False) -> None:
+        """Initialize the advisor.
+
+        Args:
+            max_examined_ratio (float): The number of documents examined per document returned above which a query
+                is flagged. Defaults to 10.
+            background (bool): Whether the queries are explained in background tasks. Defaults to False.
+        """
+        self._max_examined_ratio: float = max_examined_ratio
+        self._background: bool = background
+        # The advices by query shape, None while the shape is being explained.
+        self._advices: dict[str, IndexAdvice | None] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def observe(self, document_type: type[Document], command: str, spec: Mapping[str, Any]) -> None:
+        """Explain the query if its shape is new.
+
+        Args:
+            document_type (type[Document]): The document model of the collection queried.
+            command (str): The command of the query: find, count or aggregate.
+            spec (Mapping[str, Any]): The fields of the command besides the collection, e.g. filter and sort.
+        """
+        collection: AsyncIOMotorCollection[Any] = document_type.get_motor_collection()
+        shape: Any = normalize_shape(dict(spec))
+        key: str = repr((collection.name, command, shape))
+        if key in self._advices:
+            return
+        self._advices[key] = None
+        if not self._background:
+            await self._explain(key, document_type, collection, command, spec, shape)
+            return
+        task: asyncio.Task[None] = asyncio.get_running_loop().create_task(
+            self._explain(key, document_type, collection, command, spec, shape)
+        )
+        # Keep a reference to the task until it completes.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def wait(self) -> None:
+        """Wait for the explains running in the background."""
+        await asyncio.gather(*self._tasks)
+
+    def report(self) -> IndexAdvisorReport:
+        """Provide the query shapes explained so far.
+
+        Returns:
+            IndexAdvisorReport: The report.
+        """
+        return IndexAdvisorReport(advices=[advice for advice in self._advices.values() if advice is not None])
+
+    def clear(self) -> None:
+        """Forget the query shapes explained."""
+        self._advices.clear()
+
+    async def _explain(  # noqa: PLR0913
+        self,
+        key: str,
+        document_type: type[Document],
+        collection: AsyncIOMotorCollection[Any],
+        command: str,
+        spec: Mapping[str, Any],
+        shape: Any,
+    ) -> None:
+        try:
+            explained: Mapping[str, Any] = await collection.database.command(
+                {"explain": {command: collection.name, **spec}, "verbosity": "executionStats"}
+            )
+            advice: IndexAdvice = self._advice(collection.name, document_type, command, spec, shape, explained)
+        except Exception as exception:  # pylint: disable=broad-except
+            # The explain never fails the query, the shape is explained again next time.
+            self._advices.pop(key, None)
+            _logger.warning(f"Index advisor failed to explain a query on {collection.name}. {exception}")
+            return
+
+        self._advices[key] = advice
+        if advice.problems:
+            _logger.warning(
+                "Inefficient MongoDB query.", collection=advice.collection, shape=advice.shape, problems=advice.problems
+            )
+
+    def _advice(  # noqa: PLR0913
+        self,
+        collection_name: str,
+        document_type: type[Document],
+        command: str,
+        spec: Mapping[str, Any],
+        shape: Any,
+        explained: Mapping[str, Any],
+    ) -> IndexAdvice:
+        """Build the advice of a query shape from its explain."""
+        winning_plan: Any = (_find_key(explained, "queryPlanner") or {}).get("winningPlan")
+        stages: list[Mapping[str, Any]] = list(_plan_stages(winning_plan))
+        execution_stats: Mapping[str, Any] = _find_key(explained, "executionStats") or {}
+        docs_examined: int = execution_stats.get("totalDocsExamined", 0)
+        returned: int = execution_stats.get("nReturned", 0)
+        fields: list[str] = _query_fields(command, spec)
+        declared_index: list[str] | None = next(
+            (keys for keys in declared_indexes(document_type) if keys[0] in fields), None
+        )
+
+        problems: list[str] = []
+        stage_names: list[str] = [stage["stage"] for stage in stages]
+        if "COLLSCAN" in stage_names:
+            problems.append(
+                f"collection scan although the index {declared_index} is declared"
+                if declared_index is not None
+                else f"collection scan, no declared index starts with one of {fields}"
+            )
+        if docs_examined > self._max_examined_ratio * max(returned, 1):
+            problems.append(f"{docs_examined} documents examined for {returned} returned")
+
+        return IndexAdvice(
+            collection=collection_name,
+            command=command,
+            shape=shape,
+            stages=stage_names,
+            indexes=[stage["indexName"] for stage in stages if "indexName" in stage],
+            docs_examined=docs_examined,
+            returned=returned,
+            declared_index=declared_index,
+            problems=problems,
+        )
@@ -0,0 +1,157 @@
+"""Provides the builders of the common aggregation pipeline stages.
+
+```python
+pipeline: list[Stage] = [
+    match({"status": "active"}),
+    group("$category", total={"$sum": 1}),
+    sort(("total", SortDirection.DESCENDING)),
+    limit(10),
+]
+async for row in repository.aggregate(pipeline, output_model=CategoryTotal):
+    ...
+```
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from beanie import SortDirection
+
+Stage = dict[str, Any]
+
+
+def match(query: Mapping[str, Any]) -> Stage:
+    """Build a $match stage keeping the documents matching the query.
+
+    Args:
+        query (Mapping[str, Any]): The filter of the documents.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$match": dict(query)}
+
+
+def group(key: Any, **accumulators: Mapping[str, Any]) -> Stage:
+    """Build a $group stage.
+
+    Args:
+        key (Any): The group key, e.g. "$category", or None to group every document.
+        **accumulators (Mapping[str, Any]): The output fields and their accumulator, e.g. total={"$sum": 1}.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$group": {"_id": key, **{field: dict(accumulator) for field, accumulator in accumulators.items()}}}
+
+
+def sort(*keys: tuple[str, SortDirection]) -> Stage:
+    """Build a $sort stage.
+
+    Args:
+        *keys (tuple[str, SortDirection]): The fields to sort on, by priority.
+
+    Returns:
+        Stage: The stage.
+
+    Raises:
+        ValueError: If no key is given.
+    """
+    if len(keys) == 0:
+        raise ValueError("At least one key is required to sort.")
+    return {"$sort": {field: int(direction) for field, direction in keys}}
+
+
+def skip(count: int) -> Stage:
+    """Build a $skip stage.
+
+    Args:
+        count (int): The number of documents to skip.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$skip": count}
+
+
+def limit(count: int) -> Stage:
+    """Build a $limit stage.
+
+    Args:
+        count (int): The maximum number of documents passed on.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$limit": count}
+
+
+def project(**fields: Any) -> Stage:
+    """Build a $project stage.
+
+    Args:
+        **fields (Any): The fields to include (1), exclude (0) or compute (an expression).
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$project": fields}
+
+
+def unwind(path: str, preserve_null_and_empty_arrays: bool = False) -> Stage:
+    """Build an $unwind stage outputting one document per element of an array field.
+
+    Args:
+        path (str): The array field, prefixed with "$".
+        preserve_null_and_empty_arrays (bool): Whether the documents without element are kept. Defaults to False.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$unwind": {"path": path, "preserveNullAndEmptyArrays": preserve_null_and_empty_arrays}}
+
+
+def lookup(from_collection: str, local_field: str, foreign_field: str, as_field: str) -> Stage:
+    """Build a $lookup stage joining the documents of another collection.
+
+    Args:
+        from_collection (str): The collection to join.
+        local_field (str): The field of the input documents.
+        foreign_field (str): The field of the joined documents.
+        as_field (str): The array field receiving the joined documents.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {
+        "$lookup": {
+            "from": from_collection,
+            "localField": local_field,
+            "foreignField": foreign_field,
+            "as": as_field,
+        }
+    }
+
+
+def count_stage(field: str) -> Stage:
+    """Build a $count stage outputting the number of documents.
+
+    Args:
+        field (str): The output field of the count.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$count": field}
+
+
+def facet(**pipelines: Sequence[Stage]) -> Stage:
+    """Build a $facet stage running several pipelines on the same input documents.
+
+    Args:
+        **pipelines (Sequence[Stage]): The output fields and the pipeline computing each of them.
+
+    Returns:
+        Stage: The stage.
+    """
+    return {"$facet": {field: list(pipeline) for field, pipeline in pipelines.items()}}
@@ -16,6 +16,7 @@ from fastapi_factory_utilities.core.utils.yaml_reader import (
 
 from .configs import ODMConfig
 from .exceptions import ODMPluginConfigError
+from .monitoring import CommandProfiler, PoolMetricsListener
 
 _logger = get_logger()
 
@@ -61,6 +62,7 @@ class ODMBuilder:
         self._config: ODMConfig | None = odm_config
         self._odm_client: AsyncIOMotorClient[Any] | None = odm_client
         self._odm_database: AsyncIOMotorDatabase[Any] | None = odm_database
+        self._command_profiler: CommandProfiler | None = None
 
     @property
     def config(self) -> ODMConfig | None:
@@ -89,6 +91,15 @@ class ODMBuilder:
         """
         return self._odm_database
 
+    @property
+    def command_profiler(self) -> CommandProfiler | None:
+        """Provide the command profiler of the client built, if enabled.
+
+        Returns:
+            CommandProfiler | None: The command profiler.
+        """
+        return self._command_profiler
+
     def build_odm_config(
         self,
     ) -> Self:
@@ -154,6 +165,20 @@ class ODMBuilder:
     #     raise TimeoutError("The ODM client is not ready in the given timeout.")
     # ======
 
+    def _client_options(self) -> dict[str, Any]:
+        """Provide the client options set in the configuration, the others being left to the connection string."""
+        assert self._config is not None
+        options: dict[str, Any] = {
+            "maxPoolSize": self._config.max_pool_size,
+            "minPoolSize": self._config.min_pool_size,
+            "maxIdleTimeMS": self._config.max_idle_time_ms,
+            "waitQueueTimeoutMS": self._config.wait_queue_timeout_ms,
+            "maxConnecting": self._config.max_connecting,
+            "compressors": ",".join(self._config.compressors) if self._config.compressors is not None else None,
+            "readPreference": self._config.read_preference,
+        }
+        return {option: value for option, value in options.items() if value is not None}
+
     def build_client(
         self,
     ) -> Self:
@@ -174,6 +199,14 @@ class ODMBuilder:
                 "build_odm_config method or through parameter."
             )
 
+        event_listeners: list[Any] = [PoolMetricsListener()]
+        if self._config.command_profiler:
+            self._command_profiler = CommandProfiler(
+                slow_threshold_ms=self._config.slow_command_threshold_ms,
+                max_slow_commands=self._config.slow_commands_kept,
+            )
+            event_listeners.append(self._command_profiler)
+
         self._odm_client = AsyncIOMotorClient(
             host=self._config.uri,
             connect=True,
@@ -181,6 +214,8 @@ class ODMBuilder:
             serverSelectionTimeoutMS=self._config.connection_timeout_ms,
             server_api=ServerApi(version=ServerApiVersion.V1),
             tz_aware=True,
+            event_listeners=event_listeners,
+            **self._client_options(),
         )
 
         # KEEP IT, Waiting for additional tests
@@ -0,0 +1,178 @@
+"""Provides the read-through entity cache of the repositories."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Generic, NamedTuple, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from .types import EntityCacheStats
+
+EntityGenericType = TypeVar("EntityGenericType", bound=BaseModel)  # pylint: disable=invalid-name
+
+
+class _CacheEntry(NamedTuple, Generic[EntityGenericType]):
+    entity: EntityGenericType
+    snapshot: dict[str, Any] | None
+    expires_at: float
+
+
+class EntityCache(Generic[EntityGenericType]):
+    """In-process LRU cache of entities with a time to live, filled by `AbstractRepository.get_one_by_id`.
+
+    The repositories are usually built per request, so a cache is created once and given to each of them.
+    The entries hold the revision read or written along with its stored document. The writes of the repository
+    refresh or invalidate the entry, and a read started before a write of the same entity is not cached, so the
+    cache never serves a revision older than the last one written by this process. The writes of other processes
+    are only seen once the entry expires.
+
+    The entries are keyed by entity ID, not by (ID, revision_id): the reads by ID do not know the current revision,
+    so a key holding it could not be looked up, and would keep the older revisions until they expire. Instead, the
+    reads filling the cache are tracked between `start_fill` and `finish_fill`, and an entity written or
+    invalidated while a read of it is in flight is not cached by the reads in flight, whatever the revision they
+    read, until the last of them finishes.
+
+    The cache stores and returns deep copies, so the entities handed out can be modified freely.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_size (int): The maximum number of entities kept. Defaults to 1024.
+            ttl (float): The number of seconds an entity is kept. Defaults to 60.
+            clock (Callable[[], float]): The clock measuring the time to live, in seconds. Defaults to time.monotonic.
+
+        Raises:
+            ValueError: If the maximum size or the time to live is not strictly positive.
+        """
+        if max_size <= 0:
+            raise ValueError(f"The cache size must be strictly positive, got {max_size}.")
+        if ttl <= 0:
+            raise ValueError(f"The cache time to live must be strictly positive, got {ttl}.")
+        self._max_size: int = max_size
+        self._ttl: float = ttl
+        self._clock: Callable[[], float] = clock
+        self._entries: OrderedDict[UUID, _CacheEntry[EntityGenericType]] = OrderedDict()
+        # Number of reads in flight per entity ID, and the IDs written while one of them was in flight.
+        self._fills: dict[UUID, int] = {}
+        self._stale_fills: set[UUID] = set()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    def __len__(self) -> int:
+        """Provide the number of entities cached, including the expired ones not evicted yet."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> EntityCacheStats:
+        """The metrics of the cache."""
+        return EntityCacheStats(
+            hits=self._hits, misses=self._misses, evictions=self._evictions, size=len(self._entries)
+        )
+
+    def get(self, entity_id: UUID) -> tuple[EntityGenericType, dict[str, Any] | None] | None:
+        """Get a copy of the cached entity.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+
+        Returns:
+            tuple[EntityGenericType, dict[str, Any] | None] | None: The entity and its stored document,
+            None if not cached or expired.
+        """
+        entry: _CacheEntry[EntityGenericType] | None = self._entries.get(entity_id)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[entity_id]
+            self._evictions += 1
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(entity_id)
+        self._hits += 1
+        return entry.entity.model_copy(deep=True), entry.snapshot
+
+    def start_fill(self, entity_id: UUID) -> None:
+        """Record that the entity is being read from the database to fill the cache.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+        """
+        self._fills[entity_id] = self._fills.get(entity_id, 0) + 1
+
+    def finish_fill(
+        self,
+        entity_id: UUID,
+        entity: EntityGenericType | None,
+        snapshot: dict[str, Any] | None = None,
+    ) -> None:
+        """Cache the entity read, unless it was written since the read started.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+            entity (EntityGenericType | None): The entity read, None if not found or the read failed.
+            snapshot (dict[str, Any] | None): The document read, as stored in the database. Defaults to None.
+        """
+        stale: bool = entity_id in self._stale_fills
+        remaining: int = self._fills.get(entity_id, 1) - 1
+        if remaining > 0:
+            self._fills[entity_id] = remaining
+        else:
+            self._fills.pop(entity_id, None)
+            self._stale_fills.discard(entity_id)
+        if entity is not None and not stale:
+            self._store(entity_id, entity, snapshot)
+
+    def refresh(
+        self,
+        entity_id: UUID,
+        entity: EntityGenericType,
+        snapshot: dict[str, Any] | None = None,
+    ) -> None:
+        """Cache the entity just written by this process.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+            entity (EntityGenericType): The entity written.
+            snapshot (dict[str, Any] | None): The document written, as stored in the database. Defaults to None.
+        """
+        self._mark_written(entity_id)
+        self._store(entity_id, entity, snapshot)
+
+    def invalidate(self, entity_id: UUID) -> None:
+        """Drop the cached entity.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+        """
+        self._mark_written(entity_id)
+        self._entries.pop(entity_id, None)
+
+    def clear(self) -> None:
+        """Drop all the cached entities."""
+        self._stale_fills.update(self._fills)
+        self._entries.clear()
+
+    def _mark_written(self, entity_id: UUID) -> None:
+        if entity_id in self._fills:
+            self._stale_fills.add(entity_id)
+
+    def _store(
+        self,
+        entity_id: UUID,
+        entity: EntityGenericType,
+        snapshot: dict[str, Any] | None,
+    ) -> None:
+        self._entries[entity_id] = _CacheEntry(
+            entity=entity.model_copy(deep=True),
+            snapshot=snapshot,
+            expires_at=self._clock() + self._ttl,
+        )
+        self._entries.move_to_end(entity_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
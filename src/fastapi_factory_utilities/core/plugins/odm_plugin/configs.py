@@ -1,6 +1,10 @@
 """Provides the configuration for the ODM plugin."""
 
-from pydantic import BaseModel, ConfigDict
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from .enums import CompressorEnum, ReadPreferenceEnum
 
 
 class ODMConfig(BaseModel):
@@ -13,3 +17,70 @@ class ODMConfig(BaseModel):
     database: str = "test"
 
     connection_timeout_ms: int = 4000
+
+    # Client options, left to the connection string or the driver defaults when None.
+    # Connection pool, per server.
+    max_pool_size: int | None = None
+
+    min_pool_size: int | None = None
+
+    # Close the connections idle for longer.
+    max_idle_time_ms: int | None = None
+
+    # Fail a checkout waiting for longer on a starved pool.
+    wait_queue_timeout_ms: int | None = None
+
+    # Maximum number of connections a pool establishes concurrently.
+    max_connecting: int | None = None
+
+    # Compressors offered to the server, by preference, e.g. "zstd,zlib" from the environment.
+    compressors: list[CompressorEnum] | None = None
+
+    read_preference: ReadPreferenceEnum | None = None
+
+    # Record the duration of the commands and keep the slow ones, see depends_odm_command_profiler.
+    command_profiler: bool = False
+
+    slow_command_threshold_ms: int = 100
+
+    slow_commands_kept: int = 100
+
+    # Explain the query shapes of the repositories given the advisor of depends_odm_index_advisor in the background
+    # and log the ones not served by an index. Each shape is run once more, keep it for staging or shadow traffic.
+    index_advisor: bool = False
+
+    # Retry the repository reads failing with a transient error, e.g. during an election, for the repositories
+    # given the policy of depends_odm_retry_policy. 1 attempt disables the retries. The writes are left to the
+    # retryWrites of the driver.
+    retry_max_attempts: int = 3
+
+    retry_base_delay_ms: int = 50
+
+    retry_max_delay_ms: int = 1000
+
+    # Retries allowed per repository call, beyond a burst of 10 retries.
+    retry_budget_ratio: float = 0.1
+
+    # Secret signing the pagination cursors of the repositories given it by depends_odm_pagination_secret, e.g.
+    # injected from the environment. Share it between the replicas so that the cursors stay valid across them and
+    # the restarts. The repositories without a secret refuse to paginate.
+    pagination_secret: str | None = None
+
+    # Tail the change stream to invalidate the entity caches with the writes of the other replicas.
+    # Requires a replica set or a sharded cluster.
+    change_stream_invalidation: bool = False
+
+    # Settings of the buffered writers, see depends_odm_buffered_writers.
+    buffered_writer_batch_size: int = 500
+
+    buffered_writer_flush_interval: float = 1.0
+
+    buffered_writer_queue_size: int = 10_000
+
+    @field_validator("compressors", mode="before")
+    @classmethod
+    def split_compressors(cls, value: Any) -> Any:
+        """Split the comma-separated compressors injected from the environment."""
+        if isinstance(value, str):
+            return [compressor.strip() for compressor in value.split(",") if compressor.strip()]
+        return value
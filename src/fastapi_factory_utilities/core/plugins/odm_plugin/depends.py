@@ -5,6 +5,13 @@ from typing import Any
 from fastapi import Request
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
+from .advisor import IndexAdvisor
+from .invalidation import ChangeStreamCacheInvalidator
+from .loaders import EntityLoaders
+from .monitoring import CommandProfiler
+from .retries import RetryPolicy
+from .writers import BufferedWriters
+
 
 def depends_odm_client(request: Request) -> AsyncIOMotorClient[Any]:
     """Acquire the ODM client from the request.
@@ -28,3 +35,97 @@ def depends_odm_database(request: Request) -> AsyncIOMotorDatabase[Any]:
         AsyncIOMotorClient: The ODM database.
     """
     return request.app.state.odm_database
+
+
+def depends_odm_cache_invalidator(request: Request) -> ChangeStreamCacheInvalidator | None:
+    """Acquire the change stream cache invalidator from the request.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        ChangeStreamCacheInvalidator | None: The invalidator, None if the change stream invalidation is disabled.
+    """
+    return getattr(request.app.state, "odm_cache_invalidator", None)
+
+
+def depends_odm_command_profiler(request: Request) -> CommandProfiler | None:
+    """Acquire the command profiler of the ODM client from the request.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        CommandProfiler | None: The command profiler, None if the command profiler is disabled.
+    """
+    return getattr(request.app.state, "odm_command_profiler", None)
+
+
+def depends_odm_index_advisor(request: Request) -> IndexAdvisor | None:
+    """Acquire the index advisor of the repositories from the request.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        IndexAdvisor | None: The index advisor, None if the index advisor is disabled.
+    """
+    return getattr(request.app.state, "odm_index_advisor", None)
+
+
+def depends_odm_retry_policy(request: Request) -> RetryPolicy | None:
+    """Acquire the retry policy of the repository reads from the request.
+
+    The policy is shared by the repositories given it, so that they share its retry budget.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        RetryPolicy | None: The retry policy, None if the retries are disabled.
+    """
+    return getattr(request.app.state, "odm_retry_policy", None)
+
+
+def depends_odm_pagination_secret(request: Request) -> bytes | None:
+    """Acquire the secret signing the pagination cursors of the repositories from the request.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        bytes | None: The secret, None if ODMConfig.pagination_secret is not set.
+    """
+    return getattr(request.app.state, "odm_pagination_secret", None)
+
+
+def depends_odm_loaders(request: Request) -> EntityLoaders:
+    """Acquire the entity loaders of the request, created on first use.
+
+    The dependencies of a request share the loaders, so their lookups by ID are batched and deduplicated.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        EntityLoaders: The entity loaders of the request.
+    """
+    loaders: EntityLoaders | None = getattr(request.state, "odm_loaders", None)
+    if loaders is None:
+        loaders = EntityLoaders()
+        request.state.odm_loaders = loaders
+    return loaders
+
+
+def depends_odm_buffered_writers(request: Request) -> BufferedWriters:
+    """Acquire the buffered writers of the application from the request.
+
+    The writers are flushed when the ODM plugin shuts down.
+
+    Args:
+        request (Request): The request.
+
+    Returns:
+        BufferedWriters: The buffered writers.
+    """
+    return request.app.state.odm_buffered_writers
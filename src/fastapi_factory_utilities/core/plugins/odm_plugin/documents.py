@@ -6,7 +6,12 @@ from uuid import UUID, uuid4
 
 from beanie import Document, Indexed  # pyright: ignore[reportUnknownVariableType]
 from pydantic import Field
-from pymongo import DESCENDING
+from pymongo import DESCENDING, IndexModel
+
+# Serves the keyset pagination by creation date, i.e. the PAGINATION_SORT_KEYS [("created_at", DESCENDING)].
+# Opt-in, add it to the indexes of the Settings of the document: init_beanie builds it on the next startup, which
+# scans the whole collection.
+CREATED_AT_PAGINATION_INDEX: IndexModel = IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)])
 
 
 class BaseDocument(Document):
@@ -0,0 +1,41 @@
+"""Provides the enums for the ODM plugin."""
+
+from enum import StrEnum
+
+
+class SessionPolicyEnum(StrEnum):
+    """Defines how a repository call acquires a session when none is given.
+
+    - NONE: no client session is started, the driver binds an implicit server session to each operation.
+    - IMPLICIT: a client session without causal consistency is started for the call.
+    - EXPLICIT_CAUSAL: a causally consistent client session is started for the call.
+    """
+
+    NONE = "none"
+    IMPLICIT = "implicit"
+    EXPLICIT_CAUSAL = "explicit_causal"
+
+
+class ReadPreferenceEnum(StrEnum):
+    """Defines the members of the replica set the reads are sent to, named as in the connection string."""
+
+    PRIMARY = "primary"
+    PRIMARY_PREFERRED = "primaryPreferred"
+    SECONDARY = "secondary"
+    SECONDARY_PREFERRED = "secondaryPreferred"
+    NEAREST = "nearest"
+
+
+class CompressorEnum(StrEnum):
+    """Defines the compressors of the wire protocol, zstd and snappy requiring the zstandard and python-snappy."""
+
+    ZSTD = "zstd"
+    SNAPPY = "snappy"
+    ZLIB = "zlib"
+
+
+class ExportFormatEnum(StrEnum):
+    """Defines the formats of the streaming exports, one line per entity."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
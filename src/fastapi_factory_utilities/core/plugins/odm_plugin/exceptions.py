@@ -23,3 +23,9 @@ class OperationError(ODMPluginBaseException):
     """Exception for when an operation fails."""
 
     pass
+
+
+class InvalidPaginationCursorError(ODMPluginBaseException):
+    """Exception for when a pagination cursor is malformed, altered or does not match the query."""
+
+    pass
@@ -0,0 +1,156 @@
+"""Provides the streaming exports of the repository queries, as NDJSON or CSV responses."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncGenerator, AsyncIterable, Callable
+from contextlib import aclosing
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from .enums import ExportFormatEnum
+
+_MEDIA_TYPES: dict[ExportFormatEnum, str] = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv; charset=utf-8",
+}
+
+
+async def _chunks(
+    entities: AsyncIterable[BaseModel], encode: Callable[[BaseModel], bytes], chunk_size: int
+) -> AsyncGenerator[bytes, None]:
+    """Encode the entities and group them by chunk, closing the source when the response ends or is aborted."""
+    lines: list[bytes] = []
+    try:
+        async for entity in entities:
+            lines.append(encode(entity))
+            if len(lines) >= chunk_size:
+                yield b"".join(lines)
+                lines.clear()
+        if lines:
+            yield b"".join(lines)
+    finally:
+        # Release the cursor and the session of the repository when the client disconnects.
+        aclose: Callable[[], Any] | None = getattr(entities, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def encode_ndjson(
+    entities: AsyncIterable[BaseModel], fields: list[str] | None = None, chunk_size: int = 500
+) -> AsyncGenerator[bytes, None]:
+    """Encode the entities as newline-delimited JSON, one object per line.
+
+    Args:
+        entities (AsyncIterable[BaseModel]): The entities, e.g. from `AbstractRepository.stream`.
+        fields (list[str] | None): The fields exported. Defaults to None (all the fields).
+        chunk_size (int): The number of entities per chunk yielded. Defaults to 500.
+
+    Yields:
+        bytes: The chunks of lines.
+    """
+    include: set[str] | None = set(fields) if fields is not None else None
+
+    def encode(entity: BaseModel) -> bytes:
+        return entity.model_dump_json(include=include).encode() + b"\n"
+
+    async with aclosing(_chunks(entities, encode, chunk_size)) as chunks:
+        async for chunk in chunks:
+            yield chunk
+
+
+def _csv_cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    # Numbers, booleans and nested values are written as JSON, e.g. true or ["a", "b"].
+    return json.dumps(value, separators=(",", ":"))
+
+
+async def encode_csv(
+    entities: AsyncIterable[BaseModel], fields: list[str] | None = None, chunk_size: int = 500
+) -> AsyncGenerator[bytes, None]:
+    """Encode the entities as CSV, with a header row.
+
+    Args:
+        entities (AsyncIterable[BaseModel]): The entities, e.g. from `AbstractRepository.stream`.
+        fields (list[str] | None): The columns exported. Defaults to None (the fields of the first entity).
+        chunk_size (int): The number of entities per chunk yielded. Defaults to 500.
+
+    Yields:
+        bytes: The chunks of rows, the first one starting with the header.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    columns: list[str] | None = fields
+
+    def write(row: list[Any]) -> bytes:
+        writer.writerow(row)
+        line: str = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line.encode()
+
+    def encode(entity: BaseModel) -> bytes:
+        nonlocal columns
+        values: dict[str, Any] = entity.model_dump(mode="json", include=set(columns) if columns else None)
+        header: bytes = b""
+        if columns is None:
+            columns = list(values)
+            header = write(columns)
+        return header + write([_csv_cell(values.get(column)) for column in columns])
+
+    if fields is not None:
+        yield write(fields)
+    async with aclosing(_chunks(entities, encode, chunk_size)) as chunks:
+        async for chunk in chunks:
+            yield chunk
+
+
+def export_response(
+    entities: AsyncIterable[BaseModel],
+    export_format: ExportFormatEnum = ExportFormatEnum.NDJSON,
+    fields: list[str] | None = None,
+    filename: str | None = None,
+    chunk_size: int = 500,
+) -> StreamingResponse:
+    """Stream the entities of a query to the client, without holding the result in memory.
+
+    The entities are encoded chunk by chunk while the response is sent, the next chunk being read only once the
+    previous one is sent, so a slow client slows the cursor down and the memory used is bounded by the chunk and
+    cursor batch sizes, not by the size of the result.
+
+    ```python
+    @router.get("/books/export")
+    async def export_books(repository: BookRepository = Depends(depends_book_repository)) -> StreamingResponse:
+        books = repository.stream({"year": {"$gte": 1960}})
+        return export_response(books, ExportFormatEnum.CSV, filename="books.csv")
+    ```
+
+    Args:
+        entities (AsyncIterable[BaseModel]): The entities, e.g. from `AbstractRepository.stream`.
+        export_format (ExportFormatEnum): The format of the response. Defaults to NDJSON.
+        fields (list[str] | None): The fields exported. Defaults to None (all the fields).
+        filename (str | None): The name of the file downloaded. Defaults to None (displayed inline).
+        chunk_size (int): The number of entities per chunk sent. Defaults to 500.
+
+    Returns:
+        StreamingResponse: The response.
+
+    Raises:
+        ValueError: If the chunk size is not strictly positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError("The chunk size must be strictly positive.")
+    encoder = encode_csv if export_format == ExportFormatEnum.CSV else encode_ndjson
+    headers: dict[str, str] = {}
+    if filename is not None:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        encoder(entities, fields=fields, chunk_size=chunk_size),
+        media_type=_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
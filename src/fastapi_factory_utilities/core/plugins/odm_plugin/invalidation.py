@@ -0,0 +1,203 @@
+"""Provides the invalidation of the entity caches from the MongoDB change stream."""
+
+import asyncio
+from collections.abc import Mapping
+from typing import Any, ClassVar
+from uuid import UUID
+
+from beanie import Document
+from bson import Binary
+from bson.binary import UUID_SUBTYPE
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure, PyMongoError
+from structlog.stdlib import BoundLogger, get_logger
+
+from .cache import EntityCache
+
+_logger: BoundLogger = get_logger()
+
+
+class ChangeStreamCacheInvalidator:
+    """Invalidate the local entity caches with the changes made by every replica of the application.
+
+    The invalidator tails the change stream of the database, filtered on the collections of the registered
+    document models, and invalidates the entries of the changed documents in the caches registered for them.
+    It only receives the keys of the changed documents, never their content.
+
+    After a disconnection the stream resumes after the last change received, so no change is missed. When the
+    stream cannot resume (e.g. the oplog rolled over) or fails unexpectedly, the caches are cleared before tailing
+    the new stream. The stream is reopened after a delay doubling until a change is received again.
+    Change streams require a replica set or a sharded cluster.
+    """
+
+    # Error codes meaning the stream cannot be resumed from the resume token.
+    NON_RESUMABLE_ERROR_CODES: ClassVar[frozenset[int]] = frozenset(
+        {
+            136,  # CappedPositionLost
+            280,  # ChangeStreamFatalError
+            286,  # ChangeStreamHistoryLost
+        }
+    )
+    # Change events dropping every document of the collection.
+    COLLECTION_EVENTS: ClassVar[frozenset[str]] = frozenset({"drop", "rename"})
+    # Change events dropping every document of the database or closing the stream.
+    DATABASE_EVENTS: ClassVar[frozenset[str]] = frozenset({"dropDatabase", "invalidate"})
+
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase[Any],
+        document_models: list[type[Document]],
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        """Initialize the invalidator.
+
+        Args:
+            database (AsyncIOMotorDatabase[Any]): The database to watch.
+            document_models (list[type[Document]]): The document models whose collections are watched.
+            reconnect_delay (float): The seconds waited before the first reconnection. Defaults to 1.
+            max_reconnect_delay (float): The maximum seconds waited between reconnections, the delay doubling
+                after each failure. Defaults to 30.
+        """
+        self._database: AsyncIOMotorDatabase[Any] = database
+        self._document_models: list[type[Document]] = document_models
+        self._reconnect_delay: float = reconnect_delay
+        self._max_reconnect_delay: float = max_reconnect_delay
+        self._caches: dict[str, list[EntityCache[Any]]] = {}
+        self._resume_token: Mapping[str, Any] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._invalidations: int = 0
+
+    @property
+    def resume_token(self) -> Mapping[str, Any] | None:
+        """The token of the last change received, None before the first one."""
+        return self._resume_token
+
+    @property
+    def invalidations(self) -> int:
+        """The number of change events applied to the caches."""
+        return self._invalidations
+
+    @property
+    def running(self) -> bool:
+        """Whether the change stream is tailed."""
+        return self._task is not None and not self._task.done()
+
+    def register(self, document_type: type[Document], cache: EntityCache[Any]) -> None:
+        """Register a cache of entities stored with the document type.
+
+        Args:
+            document_type (type[Document]): The document type, one of the document models watched.
+            cache (EntityCache[Any]): The cache to invalidate.
+
+        Raises:
+            ValueError: If the document type is not watched.
+        """
+        if document_type not in self._document_models:
+            raise ValueError(f"The document model {document_type.__name__} is not watched.")
+        caches: list[EntityCache[Any]] = self._caches.setdefault(document_type.get_collection_name(), [])
+        if all(registered is not cache for registered in caches):
+            caches.append(cache)
+
+    def start(self) -> None:
+        """Start tailing the change stream in the background."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._watch(), name="odm-change-stream-cache-invalidator")
+
+    async def stop(self) -> None:
+        """Stop tailing the change stream."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _pipeline(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "$match": {
+                    "$or": [
+                        {"ns.coll": {"$in": [model.get_collection_name() for model in self._document_models]}},
+                        {"operationType": {"$in": list(self.DATABASE_EVENTS)}},
+                    ]
+                }
+            },
+            # Keep the event ID, required to resume, and drop the content of the documents.
+            {"$project": {"operationType": 1, "ns": 1, "documentKey": 1}},
+        ]
+
+    async def _watch(self) -> None:
+        delay: float = self._reconnect_delay
+        while True:
+            try:
+                async with self._database.watch(pipeline=self._pipeline(), resume_after=self._resume_token) as stream:
+                    if self._resume_token is None:
+                        # The changes made before the stream was opened are unknown.
+                        self._clear_all()
+                    while stream.alive:  # type: ignore[truthy-function]  # A property, typed as a method.
+                        change: Mapping[str, Any] | None = await stream.try_next()
+                        if change is not None:
+                            self.apply(change)
+                            # The stream delivers the changes again, reconnect promptly next time.
+                            delay = self._reconnect_delay
+                        self._resume_token = stream.resume_token
+                        if change is not None and change.get("operationType") == "invalidate":
+                            # The stream is closed and cannot be resumed after an invalidate event.
+                            self._resume_token = None
+                            break
+                _logger.info(f"ODM change stream closed, reopening in {delay}s.")
+            except OperationFailure as error:
+                if error.code in self.NON_RESUMABLE_ERROR_CODES:
+                    _logger.warning(f"ODM change stream cannot be resumed, clearing the caches. {error}")
+                    self._resume_token = None
+                    self._clear_all()
+                else:
+                    _logger.warning(f"ODM change stream failed, reconnecting in {delay}s. {error}")
+            except PyMongoError as error:
+                _logger.warning(f"ODM change stream disconnected, reconnecting in {delay}s. {error}")
+            except Exception as exception:  # pylint: disable=broad-except
+                # E.g. a change failing to decode or to apply, which the caches may have missed.
+                _logger.error(
+                    f"ODM change stream failed unexpectedly, clearing the caches and reconnecting in {delay}s. "
+                    f"{exception}"
+                )
+                self._clear_all()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_reconnect_delay)
+
+    def apply(self, change: Mapping[str, Any]) -> None:
+        """Apply a change event to the registered caches.
+
+        Args:
+            change (Mapping[str, Any]): The change event.
+        """
+        operation_type: str | None = change.get("operationType")
+        self._invalidations += 1
+        if operation_type in self.DATABASE_EVENTS:
+            self._clear_all()
+            return
+
+        caches: list[EntityCache[Any]] = self._caches.get(change.get("ns", {}).get("coll"), [])
+        document_id: UUID | None = self._to_uuid(change.get("documentKey", {}).get("_id"))
+        for cache in caches:
+            if operation_type in self.COLLECTION_EVENTS or document_id is None:
+                cache.clear()
+            else:
+                cache.invalidate(document_id)
+
+    def _clear_all(self) -> None:
+        for caches in self._caches.values():
+            for cache in caches:
+                cache.clear()
+
+    @classmethod
+    def _to_uuid(cls, value: Any) -> UUID | None:
+        if isinstance(value, UUID):
+            return value
+        if isinstance(value, Binary) and value.subtype == UUID_SUBTYPE:
+            return value.as_uuid()
+        return None
@@ -0,0 +1,139 @@
+"""Provides the request-scoped batching of the repository lookups."""
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from .exceptions import ODMPluginBaseException
+from .repositories import AbstractRepository
+
+EntityGenericType = TypeVar("EntityGenericType", bound=BaseModel)  # pylint: disable=invalid-name
+
+
+class EntityLoader(Generic[EntityGenericType]):
+    """Coalesce the lookups by ID made in the same event loop tick into one get_many_by_ids call.
+
+    The loader is an identity map: an ID is fetched once and every lookup of it returns the same entity object,
+    for the life of the loader. It is meant to live for one request, see `depends_odm_loaders`.
+    The writes made through the repository are not seen by the loader, use `prime` or `clear` after them.
+    """
+
+    def __init__(self, repository: AbstractRepository[Any, EntityGenericType]) -> None:
+        """Initialize the loader.
+
+        Args:
+            repository (AbstractRepository[Any, EntityGenericType]): The repository reading the entities.
+        """
+        self._repository: AbstractRepository[Any, EntityGenericType] = repository
+        self._entities: dict[UUID, asyncio.Future[EntityGenericType | None]] = {}
+        self._pending: dict[UUID, asyncio.Future[EntityGenericType | None]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, entity_id: UUID) -> EntityGenericType | None:
+        """Get the entity by its ID.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+
+        Returns:
+            EntityGenericType | None: The entity or None if not found.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        future: asyncio.Future[EntityGenericType | None] | None = self._entities.get(entity_id)
+        if future is None:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._entities[entity_id] = future
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending[entity_id] = future
+        return await asyncio.shield(future)
+
+    async def load_many(self, entity_ids: Iterable[UUID]) -> list[EntityGenericType | None]:
+        """Get the entities by their IDs, in one batch.
+
+        Args:
+            entity_ids (Iterable[UUID]): The IDs of the entities.
+
+        Returns:
+            list[EntityGenericType | None]: The entities in the requested order, None for the IDs not found.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        return list(await asyncio.gather(*(self.load(entity_id) for entity_id in entity_ids)))
+
+    def prime(self, entity_id: UUID, entity: EntityGenericType | None) -> None:
+        """Set the entity returned for the ID, e.g. after a write.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+            entity (EntityGenericType | None): The entity, None if deleted.
+        """
+        future: asyncio.Future[EntityGenericType | None] = asyncio.get_running_loop().create_future()
+        future.set_result(entity)
+        self._entities[entity_id] = future
+
+    def clear(self, entity_id: UUID | None = None) -> None:
+        """Forget the entity, or every entity, so that the next lookup reads it again.
+
+        Args:
+            entity_id (UUID | None): The ID of the entity. Defaults to None (every entity).
+        """
+        if entity_id is None:
+            self._entities.clear()
+        else:
+            self._entities.pop(entity_id, None)
+
+    def _dispatch(self) -> None:
+        futures: dict[UUID, asyncio.Future[EntityGenericType | None]] = self._pending
+        self._pending = {}
+        task: asyncio.Task[None] = asyncio.get_running_loop().create_task(self._fetch(futures))
+        # Keep a reference to the task until it completes.
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, futures: dict[UUID, asyncio.Future[EntityGenericType | None]]) -> None:
+        try:
+            entities: dict[UUID, EntityGenericType | None] = await self._repository.get_many_by_ids(
+                entity_ids=list(futures)
+            )
+        except (Exception, ODMPluginBaseException) as error:  # pylint: disable=broad-except
+            for entity_id, future in futures.items():
+                # A failed lookup is not remembered, the next one tries again.
+                if self._entities.get(entity_id) is future:
+                    del self._entities[entity_id]
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for entity_id, future in futures.items():
+            if not future.done():
+                future.set_result(entities.get(entity_id))
+
+
+class EntityLoaders:
+    """Provide one EntityLoader per repository type, for the life of a request."""
+
+    def __init__(self) -> None:
+        """Initialize the loaders."""
+        self._loaders: dict[type[AbstractRepository[Any, Any]], EntityLoader[Any]] = {}
+
+    def get(self, repository: AbstractRepository[Any, EntityGenericType]) -> EntityLoader[EntityGenericType]:
+        """Get the loader of the repository type, created with the repository on first use.
+
+        Args:
+            repository (AbstractRepository[Any, EntityGenericType]): The repository.
+
+        Returns:
+            EntityLoader[EntityGenericType]: The loader.
+        """
+        loader: EntityLoader[Any] | None = self._loaders.get(type(repository))
+        if loader is None:
+            loader = EntityLoader(repository=repository)
+            self._loaders[type(repository)] = loader
+        return loader
@@ -0,0 +1,237 @@
+"""Provides the metrics of the connection pools and the commands of the MongoDB client."""
+
+import datetime
+import threading
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+from opentelemetry import metrics
+from pymongo import monitoring
+from structlog.stdlib import BoundLogger, get_logger
+
+from .types import SlowCommand
+
+_logger: BoundLogger = get_logger()
+
+_meter: metrics.Meter = metrics.get_meter(__name__)
+
+# Field of the command holding its filter or pipeline, by command name.
+_SHAPE_FIELDS: dict[str, str] = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+    "update": "updates",
+    "delete": "deletes",
+}
+
+
+def _server(address: tuple[str, int | None]) -> str:
+    host, port = address
+    return f"{host}:{port}" if port is not None else host
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Record the wait for a pooled connection, the first symptom of a pool too small for the load.
+
+    - odm.pool.checkout.duration: the seconds waited for a connection, by server and outcome.
+    - odm.pool.connections.used: the number of connections checked out, by server.
+    """
+
+    def __init__(self, meter: metrics.Meter | None = None) -> None:
+        """Initialize the listener.
+
+        Args:
+            meter (metrics.Meter | None): The meter. Defaults to None (the meter of the global provider).
+        """
+        meter = meter or _meter
+        self._checkout_duration: metrics.Histogram = meter.create_histogram(
+            name="odm.pool.checkout.duration",
+            unit="s",
+            description="The duration of the connection checkouts from the pool.",
+        )
+        self._used_connections: metrics.UpDownCounter = meter.create_up_down_counter(
+            name="odm.pool.connections.used",
+            unit="{connection}",
+            description="The number of connections checked out from the pool.",
+        )
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        """Record the successful checkout."""
+        server: str = _server(event.address)
+        self._checkout_duration.record(event.duration or 0.0, attributes={"server": server, "outcome": "success"})
+        self._used_connections.add(1, attributes={"server": server})
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        """Record the failed checkout, e.g. on waitQueueTimeoutMS."""
+        self._checkout_duration.record(
+            event.duration or 0.0, attributes={"server": _server(event.address), "outcome": event.reason}
+        )
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        """Record the connection returned to the pool."""
+        self._used_connections.add(-1, attributes={"server": _server(event.address)})
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        """Ignore the event."""
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        """Ignore the event."""
+
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None:
+        """Ignore the event."""
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        """Ignore the event."""
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        """Ignore the event."""
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        """Ignore the event."""
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        """Ignore the event."""
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        """Ignore the event."""
+
+
+def normalize_shape(value: Any) -> Any:
+    """Replace the values of a filter or pipeline by "?", keeping the fields, the operators and the field paths.
+
+    The commands differing only by their values share the same shape, e.g. {"status": "?", "age": {"$gt": "?"}}.
+
+    Args:
+        value (Any): The filter, the pipeline or one of their values.
+
+    Returns:
+        Any: The shape.
+    """
+    if isinstance(value, Mapping):
+        return {key: normalize_shape(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, Mapping) for item in value):
+        # The arrays of documents are clauses or stages, e.g. $or or a pipeline, the other arrays are values.
+        return [normalize_shape(item) for item in value]
+    if isinstance(value, str) and value.startswith("$"):
+        return value
+    return "?"
+
+
+def _command_shape(command_name: str, command: Mapping[str, Any]) -> Any:
+    shape: Any = command.get(_SHAPE_FIELDS.get(command_name, ""))
+    if command_name in ("update", "delete") and isinstance(shape, list) and shape:
+        # Bulk statements share their shape, the one of the first statement is kept.
+        shape = shape[0].get("q")
+    return normalize_shape(shape) if shape is not None else None
+
+
+class CommandProfiler(monitoring.CommandListener):
+    """Record the duration of the commands sent by the client and keep the slowest ones.
+
+    - odm.command.duration: the seconds taken by the commands, by collection and command name.
+    - The commands slower than the threshold are logged with the shape of their filter or pipeline, and the most
+      recent of them are kept in memory, see `slow_commands`.
+
+    The driver calls the listener from its threads, the listener is thread-safe.
+    """
+
+    def __init__(
+        self, slow_threshold_ms: int = 100, max_slow_commands: int = 100, meter: metrics.Meter | None = None
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            slow_threshold_ms (int): The duration from which a command is slow. Defaults to 100.
+            max_slow_commands (int): The number of slow commands kept, the oldest being dropped. Defaults to 100.
+            meter (metrics.Meter | None): The meter. Defaults to None (the meter of the global provider).
+        """
+        meter = meter or _meter
+        self._slow_threshold: float = slow_threshold_ms / 1000
+        self._command_duration: metrics.Histogram = meter.create_histogram(
+            name="odm.command.duration",
+            unit="s",
+            description="The duration of the commands sent to MongoDB.",
+        )
+        self._lock: threading.Lock = threading.Lock()
+        # The commands started, by server and request, until they finish.
+        self._started: dict[tuple[Any, int], tuple[str | None, Mapping[str, Any]]] = {}
+        self._slow_commands: deque[SlowCommand] = deque(maxlen=max_slow_commands)
+
+    def slow_commands(self, limit: int | None = None) -> list[SlowCommand]:
+        """Provide the slow commands kept, the slowest first.
+
+        Args:
+            limit (int | None): The maximum number of commands returned. Defaults to None (all of them).
+
+        Returns:
+            list[SlowCommand]: The slow commands.
+        """
+        with self._lock:
+            slow_commands: list[SlowCommand] = sorted(
+                self._slow_commands, key=lambda slow_command: slow_command.duration, reverse=True
+            )
+        return slow_commands[:limit]
+
+    def clear(self) -> None:
+        """Forget the slow commands kept."""
+        with self._lock:
+            self._slow_commands.clear()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Remember the collection and the command until it finishes."""
+        target: Any = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (
+                target if isinstance(target, str) else None,
+                event.command,
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Record the duration of the command."""
+        self._finished(event, outcome="success")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Record the duration of the command."""
+        self._finished(event, outcome="failure")
+
+    def _finished(self, event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent, outcome: str) -> None:
+        with self._lock:
+            started: tuple[str | None, Mapping[str, Any]] | None = self._started.pop(
+                (event.connection_id, event.request_id), None
+            )
+        if started is None:
+            return
+        collection, command = started
+        duration: float = event.duration_micros / 1_000_000
+        self._command_duration.record(
+            duration,
+            attributes={"collection": collection or "", "command": event.command_name, "outcome": outcome},
+        )
+        if duration < self._slow_threshold:
+            return
+
+        slow_command = SlowCommand(
+            database=event.database_name,
+            collection=collection,
+            command=event.command_name,
+            shape=_command_shape(event.command_name, command),
+            duration=duration,
+            server=_server(event.connection_id),
+            finished_at=datetime.datetime.now(tz=datetime.UTC),
+        )
+        with self._lock:
+            self._slow_commands.append(slow_command)
+        _logger.warning(
+            "Slow MongoDB command.",
+            database=slow_command.database,
+            collection=slow_command.collection,
+            command=slow_command.command,
+            shape=slow_command.shape,
+            duration_ms=round(duration * 1000, 3),
+            outcome=outcome,
+        )
@@ -0,0 +1,144 @@
+"""Provides the keyset pagination helpers for the repositories."""
+
+import base64
+import datetime
+import hashlib
+import hmac
+from collections.abc import Mapping
+from typing import Any
+
+from beanie import SortDirection
+from bson import json_util
+from bson.json_util import JSONMode, JSONOptions
+
+from .exceptions import InvalidPaginationCursorError
+
+_JSON_OPTIONS: JSONOptions = JSONOptions(json_mode=JSONMode.CANONICAL, tz_aware=True, tzinfo=datetime.UTC)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def get_value_at_path(document: Mapping[str, Any], path: str) -> Any:
+    """Get the value of a (dotted) path in a document.
+
+    Args:
+        document (Mapping[str, Any]): The document as stored in the database.
+        path (str): The path of the value, sub-fields separated by dots.
+
+    Returns:
+        Any: The value, or None if the path does not exist.
+    """
+    value: Any = document
+    for key in path.split("."):
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(key)
+    return value
+
+
+def build_keyset_filter(sort_keys: list[tuple[str, SortDirection]], values: list[Any]) -> dict[str, Any]:
+    """Build the filter selecting the documents placed after the given values in the sort order.
+
+    For the sort keys (k1, k2) and the values (v1, v2), the filter is
+    `{"$or": [{k1: {op: v1}}, {k1: v1, k2: {op: v2}}]}` with op being $gt for ascending keys and $lt for
+    descending keys.
+
+    Args:
+        sort_keys (list[tuple[str, SortDirection]]): The sort keys, the last one must be unique.
+        values (list[Any]): The values of the sort keys of the last document of the previous page.
+
+    Returns:
+        dict[str, Any]: The filter.
+
+    Raises:
+        ValueError: If the number of values does not match the number of sort keys.
+    """
+    if len(sort_keys) != len(values):
+        raise ValueError(f"Expected {len(sort_keys)} values for the sort keys, got {len(values)}.")
+    clauses: list[dict[str, Any]] = []
+    for position, (key, direction) in enumerate(sort_keys):
+        clause: dict[str, Any] = {
+            previous_key: values[index] for index, (previous_key, _) in enumerate(sort_keys[:position])
+        }
+        operator: str = "$gt" if direction == SortDirection.ASCENDING else "$lt"
+        clause[key] = {operator: values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+class KeysetCursorCodec:
+    """Encode and decode the opaque continuation tokens of the keyset pagination.
+
+    A token carries the sort keys and the values of the last document of a page, serialized as canonical
+    extended JSON and signed with HMAC-SHA256 so that clients can neither forge nor alter it.
+    """
+
+    def __init__(self, secret: bytes) -> None:
+        """Initialize the codec.
+
+        Args:
+            secret (bytes): The secret used to sign the tokens.
+
+        Raises:
+            ValueError: If the secret is empty.
+        """
+        if len(secret) == 0:
+            raise ValueError("The pagination secret must not be empty.")
+        self._secret: bytes = secret
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+    def encode(self, sort_keys: list[tuple[str, SortDirection]], values: list[Any]) -> str:
+        """Encode a continuation token.
+
+        Args:
+            sort_keys (list[tuple[str, SortDirection]]): The sort keys of the query.
+            values (list[Any]): The values of the sort keys of the last document of the page.
+
+        Returns:
+            str: The signed token.
+        """
+        payload: bytes = json_util.dumps(
+            {"k": [[key, int(direction)] for key, direction in sort_keys], "v": values},
+            json_options=_JSON_OPTIONS,
+        ).encode("utf-8")
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode(self, token: str, sort_keys: list[tuple[str, SortDirection]]) -> list[Any]:
+        """Decode a continuation token.
+
+        Args:
+            token (str): The token given by the client.
+            sort_keys (list[tuple[str, SortDirection]]): The sort keys of the query.
+
+        Returns:
+            list[Any]: The values of the sort keys of the last document of the previous page.
+
+        Raises:
+            InvalidPaginationCursorError: If the token is malformed, altered or built for other sort keys.
+        """
+        try:
+            encoded_payload, encoded_signature = token.split(".")
+            payload: bytes = _b64decode(encoded_payload)
+            signature: bytes = _b64decode(encoded_signature)
+        except ValueError as error:
+            raise InvalidPaginationCursorError("Malformed pagination cursor.") from error
+
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidPaginationCursorError("Invalid pagination cursor signature.")
+
+        try:
+            content: dict[str, Any] = json_util.loads(payload, json_options=_JSON_OPTIONS)
+        except ValueError as error:
+            raise InvalidPaginationCursorError("Malformed pagination cursor.") from error
+
+        if content.get("k") != [[key, int(direction)] for key, direction in sort_keys]:
+            raise InvalidPaginationCursorError("The pagination cursor was built for other sort keys.")
+        return list(content["v"])
@@ -21,13 +21,18 @@ from fastapi_factory_utilities.core.services.status.types import (
     Status,
 )
 
+from .advisor import IndexAdvisor
 from .builder import ODMBuilder
 from .configs import ODMConfig
-from .depends import depends_odm_client, depends_odm_database
+from .depends import depends_odm_cache_invalidator, depends_odm_client, depends_odm_database
 from .documents import BaseDocument
 from .exceptions import OperationError, UnableToCreateEntityDueToDuplicateKeyError
 from .helpers import PersistedEntity
+from .invalidation import ChangeStreamCacheInvalidator
 from .repositories import AbstractRepository
+from .retries import RetryBudget, RetryPolicy
+from .types import IndexAdvisorReport
+from .writers import BufferedWriters
 
 _logger: BoundLogger = get_logger()
 
@@ -46,6 +51,10 @@ class ODMPlugin(PluginAbstract):
         self._odm_config: ODMConfig | None = odm_config
         self._odm_client: AsyncIOMotorClient[Any] | None = None
         self._odm_database: AsyncIOMotorDatabase[Any] | None = None
+        self._cache_invalidator: ChangeStreamCacheInvalidator | None = None
+        self._buffered_writers: BufferedWriters | None = None
+        self._index_advisor: IndexAdvisor | None = None
+        self._retry_policy: RetryPolicy | None = None
 
     def set_application(self, application: ApplicationAbstractProtocol) -> Self:
         """Set the application."""
@@ -90,6 +99,44 @@ class ODMPlugin(PluginAbstract):
                 value=Status(health=HealthStatusEnum.UNHEALTHY, readiness=ReadinessStatusEnum.NOT_READY)
             )
 
+    def _setup_cache_invalidator(self) -> None:
+        assert self._odm_database is not None
+        assert self._document_models is not None
+        self._cache_invalidator = ChangeStreamCacheInvalidator(
+            database=self._odm_database, document_models=self._document_models
+        )
+        self._cache_invalidator.start()
+        self._add_to_state(key="odm_cache_invalidator", value=self._cache_invalidator)
+
+    def _setup_buffered_writers(self, config: ODMConfig | None) -> None:
+        self._buffered_writers = (
+            BufferedWriters(
+                max_batch_size=config.buffered_writer_batch_size,
+                flush_interval=config.buffered_writer_flush_interval,
+                max_queue_size=config.buffered_writer_queue_size,
+            )
+            if config is not None
+            else BufferedWriters()
+        )
+        self._add_to_state(key="odm_buffered_writers", value=self._buffered_writers)
+
+    def _setup_retry_policy(self, config: ODMConfig) -> None:
+        self._retry_policy = RetryPolicy(
+            max_attempts=config.retry_max_attempts,
+            base_delay=config.retry_base_delay_ms / ODMBuilder.MS_TO_S,
+            max_delay=config.retry_max_delay_ms / ODMBuilder.MS_TO_S,
+            budget=RetryBudget(ratio=config.retry_budget_ratio),
+        )
+        self._add_to_state(key="odm_retry_policy", value=self._retry_policy)
+
+    def _setup_pagination_secret(self, config: ODMConfig) -> None:
+        assert config.pagination_secret is not None
+        self._add_to_state(key="odm_pagination_secret", value=config.pagination_secret.encode())
+
+    def _setup_index_advisor(self) -> None:
+        self._index_advisor = IndexAdvisor(background=True)
+        self._add_to_state(key="odm_index_advisor", value=self._index_advisor)
+
     async def on_startup(self) -> None:
         """Actions to perform on startup for the ODM plugin."""
         assert self._application is not None
@@ -124,9 +171,24 @@ class ODMPlugin(PluginAbstract):
 
         self._add_to_state(key="odm_client", value=odm_factory.odm_client)
         self._add_to_state(key="odm_database", value=odm_factory.odm_database)
+        self._add_to_state(key="odm_command_profiler", value=odm_factory.command_profiler)
 
         await self._setup_beanie()
 
+        if odm_factory.config is not None and odm_factory.config.change_stream_invalidation:
+            self._setup_cache_invalidator()
+
+        self._setup_buffered_writers(config=odm_factory.config)
+
+        if odm_factory.config is not None and odm_factory.config.retry_max_attempts > 1:
+            self._setup_retry_policy(config=odm_factory.config)
+
+        if odm_factory.config is not None and odm_factory.config.index_advisor:
+            self._setup_index_advisor()
+
+        if odm_factory.config is not None and odm_factory.config.pagination_secret:
+            self._setup_pagination_secret(config=odm_factory.config)
+
         _logger.info(
             f"ODM plugin started. Database: {self._odm_database.name} - "
             f"Client: {self._odm_client.address} - "
@@ -139,6 +201,16 @@ class ODMPlugin(PluginAbstract):
 
     async def on_shutdown(self) -> None:
         """Actions to perform on shutdown for the ODM plugin."""
+        if self._buffered_writers is not None:
+            # Write the entities still queued before the client is closed.
+            await self._buffered_writers.close()
+        if self._index_advisor is not None:
+            await self._index_advisor.wait()
+            report: IndexAdvisorReport = self._index_advisor.report()
+            if report.has_problems:
+                _logger.warning(f"ODM index advisor found inefficient queries.\n{report}")
+        if self._cache_invalidator is not None:
+            await self._cache_invalidator.stop()
         if self._odm_client is not None:
             self._odm_client.close()
         _logger.debug("ODM plugin shutdown.")
@@ -147,9 +219,11 @@ class ODMPlugin(PluginAbstract):
 __all__: list[str] = [
     "AbstractRepository",
     "BaseDocument",
+    "ChangeStreamCacheInvalidator",
     "OperationError",
     "PersistedEntity",
     "UnableToCreateEntityDueToDuplicateKeyError",
+    "depends_odm_cache_invalidator",
     "depends_odm_client",
     "depends_odm_database",
 ]
@@ -1,38 +1,164 @@
 """Provides the abstract classes for the repositories."""
 
+import asyncio
 import datetime
+import inspect
 from abc import ABC
-from collections.abc import AsyncGenerator, Callable, Mapping
-from contextlib import asynccontextmanager
-from typing import Any, Generic, TypeVar, get_args
-from uuid import UUID
+from collections.abc import AsyncGenerator, Callable, Iterable, Iterator, Mapping, Sequence
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, ClassVar, Generic, TypeVar, get_args
+from uuid import UUID, uuid4
 
 from beanie import SortDirection
-from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
-from pydantic import BaseModel
-from pymongo.errors import DuplicateKeyError, PyMongoError
-from pymongo.results import DeleteResult
+from beanie.odm.queries.find import FindMany
+from beanie.odm.utils.dump import get_dict
+from beanie.odm.utils.encoder import Encoder
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from bson import CodecOptions
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pydantic import BaseModel, ValidationError
+from pymongo import DeleteOne, InsertOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from pymongo.read_preferences import Primary, _ServerMode, make_read_preference, read_pref_mode_from_name
+from pymongo.results import BulkWriteResult, DeleteResult, UpdateResult
 
+from .advisor import IndexAdvisor
+from .cache import EntityCache
+from .converters import RAW_CODEC_OPTIONS, EntityDocumentConverter, get_converter, raw_document_to_json
 from .documents import BaseDocument
-from .exceptions import OperationError, UnableToCreateEntityDueToDuplicateKeyError
+from .enums import ReadPreferenceEnum, SessionPolicyEnum
+from .exceptions import ODMPluginConfigError, OperationError, UnableToCreateEntityDueToDuplicateKeyError
+from .pagination import KeysetCursorCodec, build_keyset_filter, get_value_at_path
+from .retries import RetryPolicy
+from .tracking import EntitySnapshotTracker
+from .types import BulkUpdateResult, BulkWriteItemError, InsertManyResult, Page
+from .unit_of_work import get_unit_of_work_session, in_unit_of_work
 
 DocumentGenericType = TypeVar("DocumentGenericType", bound=BaseDocument)  # pylint: disable=invalid-name
 EntityGenericType = TypeVar("EntityGenericType", bound=BaseModel)  # pylint: disable=invalid-name
+ItemGenericType = TypeVar("ItemGenericType")  # pylint: disable=invalid-name
+OutputGenericType = TypeVar("OutputGenericType", bound=BaseModel)  # pylint: disable=invalid-name
+ProjectionGenericType = TypeVar("ProjectionGenericType", bound=BaseModel)  # pylint: disable=invalid-name
 
 
-def managed_session() -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+def _chunked(items: Iterable[ItemGenericType], chunk_size: int) -> Iterator[list[ItemGenericType]]:
+    """Split the items into lists of at most chunk_size items.
+
+    Args:
+        items (Iterable[ItemGenericType]): The items to split.
+        chunk_size (int): The maximum size of a chunk.
+
+    Yields:
+        list[ItemGenericType]: The chunks, in order.
+
+    Raises:
+        ValueError: If the chunk size is not strictly positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"The chunk size must be strictly positive, got {chunk_size}.")
+    chunk: list[ItemGenericType] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _database_now() -> datetime.datetime:
+    """Provide the current UTC time truncated to the millisecond precision of the database.
+
+    Entities stamped by the repository therefore hold the same timestamps as the stored documents.
+    """
+    now: datetime.datetime = datetime.datetime.now(tz=datetime.UTC)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+@asynccontextmanager
+async def _session_for_policy(
+    repository: Any, session_policy: SessionPolicyEnum
+) -> AsyncGenerator[AsyncIOMotorClientSession | None, None]:
+    """Yield the session to use for a call according to the session policy.
+
+    The session is ended in a finally block, also when an async generator holding it is closed early.
+    """
+    stack = AsyncExitStack()
+    session: AsyncIOMotorClientSession | None = None
+    if session_policy != SessionPolicyEnum.NONE:
+        session = await stack.enter_async_context(
+            repository.get_session(causal_consistency=session_policy == SessionPolicyEnum.EXPLICIT_CAUSAL)
+        )
+    try:
+        yield session
+    finally:
+        await stack.aclose()
+
+
+def _reject_unit_of_work_write(kwargs: dict[str, Any]) -> None:
+    session: AsyncIOMotorClientSession | None = kwargs.get("session")
+    if in_unit_of_work() and (session is None or session is get_unit_of_work_session()):
+        raise OperationError(
+            "The repositories cannot write inside a unit of work, the write would not be part of its transaction. "
+            "Register it with UnitOfWork.insert, update or delete instead."
+        )
+
+
+def managed_session(write: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     """Decorator to manage the session.
 
     It will introspect the function arguments and check if the session is passed as a keyword argument.
-    If it is not, it will create a new session and pass it to the function.
+    If it is not, the session of the unit of work running in the context is used, if any.
+    Otherwise the session is acquired according to the session policy, taken from the `session_policy`
+    keyword argument of the call or else from the SESSION_POLICY of the repository:
+    - NONE: the function is called with no session, avoiding the start of a client session.
+    - IMPLICIT / EXPLICIT_CAUSAL: a new session is created and passed to the function.
+    Async generator functions keep the session open until the generator is exhausted or closed.
+
+    Args:
+        write (bool): Whether the function writes, refused inside a unit of work unless given another session.
+            Defaults to False.
     """
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.isasyncgenfunction(func):
+
+            @wraps(func)
+            async def generator_wrapper(*args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+                if write:
+                    _reject_unit_of_work_write(kwargs)
+                session_policy: SessionPolicyEnum = kwargs.pop("session_policy", None) or args[0].SESSION_POLICY
+                if "session" not in kwargs and get_unit_of_work_session() is not None:
+                    kwargs["session"] = get_unit_of_work_session()
+                if "session" in kwargs:
+                    async with aclosing(func(*args, **kwargs)) as items:
+                        async for item in items:
+                            yield item
+                    return
+
+                async with (
+                    _session_for_policy(args[0], session_policy) as session,
+                    aclosing(func(*args, **kwargs, session=session)) as items,
+                ):
+                    async for item in items:
+                        yield item
+
+            return generator_wrapper
+
+        @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if write:
+                _reject_unit_of_work_write(kwargs)
+            session_policy: SessionPolicyEnum = kwargs.pop("session_policy", None) or args[0].SESSION_POLICY
+            if "session" not in kwargs and get_unit_of_work_session() is not None:
+                kwargs["session"] = get_unit_of_work_session()
             if "session" in kwargs:
                 return await func(*args, **kwargs)
 
-            async with args[0].get_session() as session:
+            async with _session_for_policy(args[0], session_policy) as session:
                 return await func(*args, **kwargs, session=session)
 
         return wrapper
@@ -40,28 +166,208 @@ def managed_session() -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     return decorator
 
 
+# Set while a call is retried, the calls it makes to the other methods are not retried on their own.
+_retrying: ContextVar[bool] = ContextVar("odm_retrying", default=False)
+
+
+def _mongo_error(exception: BaseException) -> PyMongoError | None:
+    """Provide the MongoDB error raised, or wrapped in the OperationError raised, if any."""
+    if isinstance(exception, PyMongoError):
+        return exception
+    if isinstance(exception, OperationError) and isinstance(exception.__cause__, PyMongoError):
+        return exception.__cause__
+    return None
+
+
+def _call_retry_policy(repository: Any, kwargs: dict[str, Any]) -> RetryPolicy | None:
+    """Provide the retry policy of the call, None when the call must not be retried on its own."""
+    policy: RetryPolicy | None = repository.retry_policy
+    if policy is None or _retrying.get():
+        return None
+    session: AsyncIOMotorClientSession | None = kwargs.get("session") or get_unit_of_work_session()
+    if session is not None and session.in_transaction:  # type: ignore[truthy-function]  # A property, typed as a method.
+        # The transaction is retried as a whole, see UnitOfWork.
+        return None
+    return policy
+
+
+def retried() -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator to retry the transient errors of a read according to the retry policy of the repository.
+
+    Each attempt runs the whole call, acquiring a new session. The calls made inside a transaction are not retried,
+    nor are the async generators once they yielded their first item.
+
+    Only the reads are decorated: running a write again may apply it twice, or restart a chunked write from its
+    first chunk. The writes are retried once by the driver instead (retryWrites, on by default), which the server
+    deduplicates.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.isasyncgenfunction(func):
+
+            @wraps(func)
+            async def generator_wrapper(*args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+                policy: RetryPolicy | None = _call_retry_policy(args[0], kwargs)
+                if policy is None:
+                    async with aclosing(func(*args, **kwargs)) as items:
+                        async for item in items:
+                            yield item
+                    return
+
+                operation: str = f"{type(args[0]).__name__}.{func.__name__}"
+                policy.budget.deposit()
+                attempt: int = 1
+                while True:
+                    generator: AsyncGenerator[Any, None] = func(*args, **kwargs)
+                    token = _retrying.set(True)
+                    try:
+                        first: Any = await anext(generator)  # noqa: F821  # A builtin since Python 3.10.
+                        break
+                    except StopAsyncIteration:
+                        return
+                    except (PyMongoError, OperationError) as exception:
+                        error: PyMongoError | None = _mongo_error(exception)
+                        if error is None or not policy.should_retry(operation, error, attempt):
+                            raise
+                    finally:
+                        _retrying.reset(token)
+                    await asyncio.sleep(policy.delay(attempt))
+                    attempt += 1
+
+                yield first
+                async with aclosing(generator):
+                    async for item in generator:
+                        yield item
+
+            return generator_wrapper
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            policy: RetryPolicy | None = _call_retry_policy(args[0], kwargs)
+            if policy is None:
+                return await func(*args, **kwargs)
+
+            async def call() -> Any:
+                token = _retrying.set(True)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _retrying.reset(token)
+
+            return await policy.run(f"{type(args[0]).__name__}.{func.__name__}", call, error_of=_mongo_error)
+
+        return wrapper
+
+    return decorator
+
+
 class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
-    """Abstract class for the repository."""
+    """Abstract class for the repository.
+
+    The methods managed by the session decorator accept a `session_policy` keyword argument
+    overriding SESSION_POLICY for the call.
+    """
+
+    # Session acquired by the calls made without a session, see SessionPolicyEnum.
+    SESSION_POLICY: ClassVar[SessionPolicyEnum] = SessionPolicyEnum.NONE
+
+    # Default number of entities sent to the database per bulk call.
+    BULK_CHUNK_SIZE: ClassVar[int] = 1000
+    # Default number of documents fetched per cursor batch when streaming.
+    STREAM_BATCH_SIZE: ClassVar[int] = 500
+    # Default number of documents fetched per cursor batch when aggregating.
+    AGGREGATE_BATCH_SIZE: ClassVar[int] = 500
+    # Default number of entities per page of the keyset pagination.
+    PAGE_SIZE: ClassVar[int] = 50
+    # Default sort order of the keyset pagination, served by the index of "_id" of every collection.
+    # E.g. [("created_at", SortDirection.DESCENDING)] requires the CREATED_AT_PAGINATION_INDEX of the documents.
+    PAGINATION_SORT_KEYS: ClassVar[list[tuple[str, SortDirection]]] = [("_id", SortDirection.ASCENDING)]
+    # Secret signing the pagination cursors, shared by the replicas so that the cursors stay valid across them and
+    # the restarts. Defaults to the pagination_secret given to the repository, e.g. from
+    # depends_odm_pagination_secret. The repositories without a secret refuse to paginate.
+    PAGINATION_SECRET: ClassVar[bytes | None] = None
+    # Whether the entities remember their stored state so that updates only send the changed fields.
+    CHANGE_TRACKING: ClassVar[bool] = True
+    # Whether the entities are built from the documents read without validation, see EntityDocumentConverter.
+    TRUSTED_CONVERSION: ClassVar[bool] = False
+    # Members of the replica set serving the reads of the repository. Defaults to None (the client's).
+    READ_PREFERENCE: ClassVar[ReadPreferenceEnum | None] = None
+    # Tags of the members eligible for the reads by priority, e.g. [{"dc": "east"}, {}], ignored for the primary.
+    READ_PREFERENCE_TAG_SETS: ClassVar[list[dict[str, str]] | None] = None
+    # Maximum replication lag of the members eligible for the reads, at least 90 seconds, -1 for no limit.
+    MAX_STALENESS_SECONDS: ClassVar[int] = -1
+    # Explains the query shapes of the repository to flag the ones not served by an index, see IndexAdvisor.
+    # Defaults to the index_advisor given to the repository, e.g. from depends_odm_index_advisor.
+    INDEX_ADVISOR: ClassVar[IndexAdvisor | None] = None
+    # Retries the reads failing with a transient error, e.g. during an election, see RetryPolicy.
+    # Defaults to the retry_policy given to the repository, e.g. from depends_odm_retry_policy.
+    RETRY_POLICY: ClassVar[RetryPolicy | None] = None
+
+    def __init__(
+        self,
+        database: AsyncIOMotorDatabase[Any],
+        entity_cache: EntityCache[EntityGenericType] | None = None,
+        retry_policy: RetryPolicy | None = None,
+        index_advisor: IndexAdvisor | None = None,
+        pagination_secret: bytes | None = None,
+    ) -> None:
+        """Initialize the repository.
 
-    def __init__(self, database: AsyncIOMotorDatabase[Any]) -> None:
-        """Initialize the repository."""
+        Args:
+            database (AsyncIOMotorDatabase[Any]): The database.
+            entity_cache (EntityCache[EntityGenericType] | None): The cache of get_one_by_id, shared by the
+                repositories of the same collection. Defaults to None (no cache).
+            retry_policy (RetryPolicy | None): The retry policy of the reads, e.g. from depends_odm_retry_policy.
+                Defaults to None (the RETRY_POLICY of the class).
+            index_advisor (IndexAdvisor | None): The index advisor of the queries, e.g. from
+                depends_odm_index_advisor. Defaults to None (the INDEX_ADVISOR of the class).
+            pagination_secret (bytes | None): The secret signing the pagination cursors, e.g. from
+                depends_odm_pagination_secret. Defaults to None (the PAGINATION_SECRET of the class).
+        """
         super().__init__()
         self._database: AsyncIOMotorDatabase[Any] = database
+        self._entity_cache: EntityCache[EntityGenericType] | None = entity_cache
+        self._retry_policy: RetryPolicy | None = retry_policy if retry_policy is not None else self.RETRY_POLICY
+        self._index_advisor: IndexAdvisor | None = index_advisor if index_advisor is not None else self.INDEX_ADVISOR
+        self._pagination_secret: bytes | None = pagination_secret or self.PAGINATION_SECRET
         # Retrieve the generic concrete types
         generic_args: tuple[Any, ...] = get_args(self.__orig_bases__[0])  # type: ignore
         self._document_type: type[DocumentGenericType] = generic_args[0]
         self._entity_type: type[EntityGenericType] = generic_args[1]
+        self._converter: EntityDocumentConverter[DocumentGenericType, EntityGenericType] = get_converter(
+            self._document_type, self._entity_type, self.TRUSTED_CONVERSION
+        )
+        self._tracker: EntitySnapshotTracker = EntitySnapshotTracker()
+
+    @property
+    def retry_policy(self) -> RetryPolicy | None:
+        """The retry policy of the reads, None if the reads are not retried."""
+        return self._retry_policy
+
+    @property
+    def index_advisor(self) -> IndexAdvisor | None:
+        """The index advisor of the queries, None if the queries are not explained."""
+        return self._index_advisor
+
+    @property
+    def pagination_secret(self) -> bytes | None:
+        """The secret signing the pagination cursors, None if the repository cannot paginate."""
+        return self._pagination_secret
 
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncIOMotorClientSession, None]:
-        """Yield a new session."""
+    async def get_session(self, causal_consistency: bool = True) -> AsyncGenerator[AsyncIOMotorClientSession, None]:
+        """Yield a new session.
+
+        Args:
+            causal_consistency (bool): Whether the session is causally consistent. Defaults to True.
+        """
         try:
-            async with await self._database.client.start_session() as session:
+            async with await self._database.client.start_session(causal_consistency=causal_consistency) as session:
                 yield session
         except PyMongoError as error:
             raise OperationError(f"Failed to create session: {error}") from error
 
-    @managed_session()
+    @managed_session(write=True)
     async def insert(
         self, entity: EntityGenericType, session: AsyncIOMotorClientSession | None = None
     ) -> EntityGenericType:
@@ -79,12 +385,11 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
             UnableToCreateEntityDueToDuplicateKeyError: If the entity cannot be created due to a duplicate key error.
             OperationError: If the operation fails.
         """
-        insert_time: datetime.datetime = datetime.datetime.now(tz=datetime.UTC)
+        insert_time: datetime.datetime = _database_now()
         try:
-            entity_dump: dict[str, Any] = entity.model_dump()
-            entity_dump["created_at"] = insert_time
-            entity_dump["updated_at"] = insert_time
-            document: DocumentGenericType = self._document_type(**entity_dump)
+            document: DocumentGenericType = self._converter.to_document(
+                entity, created_at=insert_time, updated_at=insert_time
+            )
 
         except ValueError as error:
             raise ValueError(f"Failed to create document from entity: {error}") from error
@@ -96,19 +401,93 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
         except PyMongoError as error:
             raise OperationError(f"Failed to insert document: {error}") from error
 
-        try:
-            entity_created: EntityGenericType = self._entity_type(**document_created.model_dump())
-        except ValueError as error:
-            raise ValueError(f"Failed to create entity from document: {error}") from error
-
+        entity_created: EntityGenericType = self._to_entity(document_created)
+        self._refresh_cache(document_created.id, entity_created)
         return entity_created
 
-    @managed_session()
+    @managed_session(write=True)
+    async def insert_many(
+        self,
+        entities: Iterable[EntityGenericType],
+        ordered: bool = False,
+        chunk_size: int | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> InsertManyResult[EntityGenericType]:
+        """Insert the entities into the database with one insert_many call per chunk.
+
+        Failures of individual items (e.g. duplicate keys) are reported in the result instead of aborting the batch.
+        When ordered is True, the insertion stops at the first failing item and the remaining entities are neither
+        inserted nor reported.
+
+        Args:
+            entities (Iterable[EntityGenericType]): The entities to insert.
+            ordered (bool): Whether to stop at the first failing item. Defaults to False.
+            chunk_size (int | None): The number of entities per insert_many call. Defaults to BULK_CHUNK_SIZE.
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            InsertManyResult[EntityGenericType]: The entities created and the items which failed.
+
+        Raises:
+            ValueError: If a document cannot be created from an entity or the chunk size is invalid.
+            OperationError: If the operation fails.
+        """
+        inserted: list[EntityGenericType] = []
+        errors: list[BulkWriteItemError] = []
+        use_revision: bool = self._document_type.get_settings().use_revision
+        offset: int = 0
+        for chunk in _chunked(entities, chunk_size or self.BULK_CHUNK_SIZE):
+            insert_time: datetime.datetime = _database_now()
+            try:
+                documents: list[DocumentGenericType] = []
+                for entity in chunk:
+                    document: DocumentGenericType = self._converter.to_document(
+                        entity, created_at=insert_time, updated_at=insert_time
+                    )
+                    if use_revision:
+                        document.revision_id = uuid4()
+                    documents.append(document)
+            except ValueError as error:
+                raise ValueError(f"Failed to create document from entity: {error}") from error
+
+            failed_indexes: set[int] = set()
+            try:
+                await self._document_type.insert_many(documents, session=session, ordered=ordered)
+            except BulkWriteError as error:
+                for write_error in error.details.get("writeErrors", []):
+                    failed_indexes.add(write_error["index"])
+                    errors.append(
+                        BulkWriteItemError(
+                            index=offset + write_error["index"],
+                            code=write_error.get("code"),
+                            message=write_error.get("errmsg", ""),
+                        )
+                    )
+            except PyMongoError as error:
+                raise OperationError(f"Failed to insert documents: {error}") from error
+
+            # With ordered inserts, nothing after the first failing item reached the database.
+            last_index: int = min(failed_indexes) if ordered and failed_indexes else len(documents)
+            for index, document in enumerate(documents[:last_index]):
+                if index not in failed_indexes:
+                    inserted.append(self._to_entity(document))
+                    self._invalidate_cache(document.id)
+
+            if ordered and failed_indexes:
+                break
+            offset += len(chunk)
+
+        return InsertManyResult(inserted=inserted, errors=errors)
+
+    @managed_session(write=True)
     async def update(
         self, entity: EntityGenericType, session: AsyncIOMotorClientSession | None = None
     ) -> EntityGenericType:
         """Update the entity in the database.
 
+        When the entity was loaded or written by this repository, only the changed fields are sent
+        with a single update_one guarded by the revision read; otherwise the whole document is saved.
+
         Args:
             entity (EntityGenericType): The entity to update.
             session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
@@ -118,39 +497,598 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
 
         Raises:
             ValueError: If the entity cannot be created from the document.
-            OperationError: If the operation fails.
+            OperationError: If the operation fails or the document changed since the entity was read.
         """
-        update_time: datetime.datetime = datetime.datetime.now(tz=datetime.UTC)
+        update_time: datetime.datetime = _database_now()
         try:
-            entity_dump: dict[str, Any] = entity.model_dump()
-            entity_dump["updated_at"] = update_time
-            document: DocumentGenericType = self._document_type(**entity_dump)
+            document: DocumentGenericType = self._converter.to_document(entity, updated_at=update_time)
 
         except ValueError as error:
             raise ValueError(f"Failed to create document from entity: {error}") from error
 
+        snapshot: dict[str, Any] | None = self._tracker.get(entity) if self.CHANGE_TRACKING else None
+        if snapshot is not None:
+            entity_updated: EntityGenericType = await self._update_changed_fields(
+                document=document, snapshot=snapshot, session=session
+            )
+            self._refresh_cache(document.id, entity_updated)
+            return entity_updated
+
         try:
             document_updated: DocumentGenericType = await document.save(session=session)
         except PyMongoError as error:
+            self._invalidate_cache(document.id)
+            raise OperationError(f"Failed to update document: {error}") from error
+
+        entity_updated = self._to_entity(document_updated)
+        self._refresh_cache(document_updated.id, entity_updated)
+        return entity_updated
+
+    async def _update_changed_fields(
+        self,
+        document: DocumentGenericType,
+        snapshot: dict[str, Any],
+        session: AsyncIOMotorClientSession | None,
+    ) -> EntityGenericType:
+        """Send the fields changed since the snapshot with a $set/$unset guarded by the revision.
+
+        Args:
+            document (DocumentGenericType): The document to store.
+            snapshot (dict[str, Any]): The document as stored in the database when the entity was read.
+            session (AsyncIOMotorClientSession | None): The session to use.
+
+        Returns:
+            EntityGenericType: The updated entity.
+
+        Raises:
+            OperationError: If the operation fails or the document changed since the snapshot.
+        """
+        use_revision: bool = self._document_type.get_settings().use_revision
+        if use_revision:
+            document.revision_id = uuid4()
+        document_dump: dict[str, Any] = self._document_to_db(document)
+        set_fields, unset_fields = EntitySnapshotTracker.diff(snapshot=snapshot, current=document_dump)
+        if not set_fields and not unset_fields:
+            # Nothing to write, the stored document already matches the entity.
+            try:
+                stored_document: DocumentGenericType = self._document_type.model_validate(snapshot)
+            except ValueError as error:
+                raise ValueError(f"Failed to create document from snapshot: {error}") from error
+            return self._to_entity(stored_document)
+
+        find_query: dict[str, Any] = {"_id": snapshot["_id"]}
+        set_fields["updated_at"] = document_dump["updated_at"]
+        if use_revision:
+            find_query["revision_id"] = snapshot.get("revision_id")
+            set_fields["revision_id"] = document_dump["revision_id"]
+        update_query: dict[str, Any] = {"$set": set_fields}
+        if unset_fields:
+            update_query["$unset"] = unset_fields
+
+        try:
+            result: UpdateResult = await self._document_type.get_motor_collection().update_one(
+                find_query, update_query, session=session
+            )
+        except PyMongoError as error:
+            self._invalidate_cache(document.id)
             raise OperationError(f"Failed to update document: {error}") from error
 
+        if result.matched_count == 0:
+            # The cached entity may be the stale revision.
+            self._invalidate_cache(document.id)
+            raise OperationError("Failed to update document: it was modified or deleted since it was read.")
+
+        return self._to_entity(document)
+
+    def _document_to_db(self, document: DocumentGenericType) -> dict[str, Any]:
+        """Encode the document as it is stored in the database."""
+        return get_dict(document, to_db=True, keep_nulls=document.get_settings().keep_nulls)
+
+    def _to_entity(self, document: DocumentGenericType) -> EntityGenericType:
+        """Convert the document to an entity and track its stored state.
+
+        Raises:
+            ValueError: If the entity cannot be created from the document.
+        """
         try:
-            entity_updated: EntityGenericType = self._entity_type(**document_updated.model_dump())
+            entity: EntityGenericType = self._converter.to_entity(document)
         except ValueError as error:
             raise ValueError(f"Failed to create entity from document: {error}") from error
+        if self.CHANGE_TRACKING:
+            self._tracker.track(entity, self._document_to_db(document))
+        return entity
 
-        return entity_updated
+    def _refresh_cache(self, entity_id: UUID, entity: EntityGenericType) -> None:
+        """Cache the entity just written, along with its stored state when tracked."""
+        if self._entity_cache is not None:
+            self._entity_cache.refresh(entity_id, entity, self._tracker.get(entity))
+
+    def _invalidate_cache(self, entity_id: UUID) -> None:
+        """Drop the cached entity after a write which did not return it."""
+        if self._entity_cache is not None:
+            self._entity_cache.invalidate(entity_id)
+
+    def _encode_query(self, query: Mapping[str, Any] | None) -> dict[str, Any]:
+        """Encode the values of a raw filter or stage as beanie does, e.g. the UUIDs to BSON binaries."""
+        return Encoder(to_db=True).encode(dict(query or {}))
+
+    def _document_field_alias(self, field_name: str) -> str:
+        """Provide the database name of a document field.
+
+        Raises:
+            ValueError: If the field does not exist on the document.
+        """
+        field_info = self._document_type.model_fields.get(field_name)
+        if field_info is None:
+            raise ValueError(f"Unknown field {field_name} for document {self._document_type.__name__}")
+        return field_info.alias or field_name
+
+    async def _bulk_write_chunk(
+        self,
+        operations: list[ReplaceOne[Any] | UpdateOne],
+        document_ids: list[UUID],
+        offset: int,
+        session: AsyncIOMotorClientSession | None,
+    ) -> BulkUpdateResult:
+        """Send one unordered bulk_write and summarize its result.
+
+        Args:
+            operations (list[ReplaceOne | UpdateOne]): The operations to send.
+            document_ids (list[UUID]): The document ID targeted by each operation.
+            offset (int): The position of the first operation in the whole batch.
+            session (AsyncIOMotorClientSession | None): The session to use.
+
+        Returns:
+            BulkUpdateResult: The result of the chunk.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        try:
+            result: BulkWriteResult = await self._document_type.get_motor_collection().bulk_write(
+                operations, ordered=False, session=session
+            )
+        except BulkWriteError as error:
+            return BulkUpdateResult(
+                matched_count=error.details.get("nMatched", 0),
+                modified_count=error.details.get("nModified", 0),
+                upserted_ids=[document_ids[upserted["index"]] for upserted in error.details.get("upserted", [])],
+                errors=[
+                    BulkWriteItemError(
+                        index=offset + write_error["index"],
+                        code=write_error.get("code"),
+                        message=write_error.get("errmsg", ""),
+                    )
+                    for write_error in error.details.get("writeErrors", [])
+                ],
+            )
+        except PyMongoError as error:
+            raise OperationError(f"Failed to bulk write documents: {error}") from error
+
+        return BulkUpdateResult(
+            matched_count=result.matched_count,
+            modified_count=result.modified_count,
+            upserted_ids=[document_ids[index] for index in result.upserted_ids or {}],
+        )
+
+    @classmethod
+    def _merge_bulk_results(cls, results: list[BulkUpdateResult]) -> BulkUpdateResult:
+        """Merge the results of several bulk_write chunks."""
+        return BulkUpdateResult(
+            matched_count=sum(result.matched_count for result in results),
+            modified_count=sum(result.modified_count for result in results),
+            upserted_ids=[upserted_id for result in results for upserted_id in result.upserted_ids],
+            errors=[error for result in results for error in result.errors],
+        )
+
+    @managed_session(write=True)
+    async def bulk_update(
+        self,
+        entities: Iterable[EntityGenericType],
+        chunk_size: int | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> BulkUpdateResult:
+        """Replace the stored documents of the entities with unordered bulk_write calls.
+
+        When the document uses revisions, an entity only replaces the document it was read from; an entity with a
+        stale revision is not matched and is reflected in the matched count.
+
+        Args:
+            entities (Iterable[EntityGenericType]): The entities to update.
+            chunk_size (int | None): The number of operations per bulk_write call. Defaults to BULK_CHUNK_SIZE.
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            BulkUpdateResult: The matched and modified counts and the items which failed.
+
+        Raises:
+            ValueError: If a document cannot be created from an entity or the chunk size is invalid.
+            OperationError: If the operation fails.
+        """
+        results: list[BulkUpdateResult] = []
+        offset: int = 0
+        for chunk in _chunked(entities, chunk_size or self.BULK_CHUNK_SIZE):
+            update_time: datetime.datetime = _database_now()
+            operations: list[ReplaceOne[Any] | UpdateOne] = []
+            document_ids: list[UUID] = []
+            for entity in chunk:
+                operation, document_id = self._replace_operation(entity, update_time=update_time)
+                operations.append(operation)
+                document_ids.append(document_id)
+                # The revision read is replaced, the snapshot cannot guard a partial update anymore.
+                self._tracker.forget(entity)
+
+            try:
+                results.append(await self._bulk_write_chunk(operations, document_ids, offset, session))
+            finally:
+                for document_id in document_ids:
+                    self._invalidate_cache(document_id)
+            offset += len(chunk)
+
+        return self._merge_bulk_results(results)
+
+    def _collection(self) -> AsyncIOMotorCollection[Any]:
+        """Provide the collection of the documents."""
+        return self._document_type.get_motor_collection()
+
+    def _read_preference(self, read_preference: ReadPreferenceEnum | _ServerMode | None) -> _ServerMode | None:
+        """Resolve the read preference of a call, None to keep the one of the client.
+
+        A mode given for the call is combined with the tag sets and the staleness of the repository.
+        """
+        mode: ReadPreferenceEnum | _ServerMode | None = read_preference or self.READ_PREFERENCE
+        if mode is None or isinstance(mode, _ServerMode):
+            return mode
+        if mode == ReadPreferenceEnum.PRIMARY:
+            return Primary()
+        return make_read_preference(
+            read_pref_mode_from_name(mode),
+            tag_sets=self.READ_PREFERENCE_TAG_SETS,
+            max_staleness=self.MAX_STALENESS_SECONDS,
+        )
+
+    def _read_cursor(
+        self, query: FindMany[Any], read_preference: _ServerMode | None, codec_options: CodecOptions[Any] | None = None
+    ) -> Any:
+        """Run the query built by beanie on the collection with options beanie cannot set."""
+        collection: AsyncIOMotorCollection[Any] = self._collection().with_options(
+            read_preference=read_preference,  # type: ignore[arg-type]  # Motor types it as ReadPreference.
+            codec_options=codec_options,
+        )
+        if query.fetch_links:
+            pipeline: list[dict[str, Any]] = query.build_aggregation_pipeline()
+            projection: dict[str, Any] | None = get_projection(query.get_projection_model())
+            if projection is not None:
+                pipeline.append({"$project": projection})
+            return collection.aggregate(pipeline, session=query.session, **query.pymongo_kwargs)
+        return collection.find(
+            filter=query.get_filter_query(),
+            sort=query.sort_expressions,
+            projection=get_projection(query.get_projection_model()),
+            skip=query.skip_number,
+            limit=query.limit_number,
+            session=query.session,
+            **query.pymongo_kwargs,
+        )
+
+    async def _advise(self, command: str, spec: Mapping[str, Any]) -> None:
+        """Submit the query to the index advisor, if any."""
+        if self._index_advisor is not None:
+            await self._index_advisor.observe(self._document_type, command, spec)
+
+    async def _advise_find(self, query: FindMany[Any]) -> None:
+        """Submit the query built by beanie to the index advisor, if any."""
+        if self._index_advisor is None:
+            return
+        spec: dict[str, Any] = {"filter": query.get_filter_query()}
+        if query.sort_expressions:
+            spec["sort"] = dict(query.sort_expressions)
+        if query.limit_number:
+            spec["limit"] = query.limit_number
+        await self._advise("find", spec)
+
+    async def _read(self, query: FindMany[Any], read_preference: _ServerMode | None) -> AsyncGenerator[Any, None]:
+        """Iterate the results of the query, parsed as its projection model."""
+        if read_preference is None:
+            async for result in query:
+                yield result
+            return
+        async for raw_document in self._read_cursor(query, read_preference):
+            yield parse_obj(query.get_projection_model(), raw_document, lazy_parse=query.lazy_parse)
+
+    def _insert_operation(
+        self, entity: EntityGenericType, insert_time: datetime.datetime | None = None
+    ) -> tuple[InsertOne[Any], UUID]:
+        """Build the operation inserting the entity, and provide the ID of its document.
+
+        Raises:
+            ValueError: If the document cannot be created from the entity.
+        """
+        insert_time = insert_time or _database_now()
+        try:
+            document: DocumentGenericType = self._converter.to_document(
+                entity, created_at=insert_time, updated_at=insert_time
+            )
+        except ValueError as error:
+            raise ValueError(f"Failed to create document from entity: {error}") from error
+        if self._document_type.get_settings().use_revision:
+            document.revision_id = uuid4()
+        return InsertOne(self._document_to_db(document)), document.id
+
+    def _replace_operation(
+        self, entity: EntityGenericType, update_time: datetime.datetime | None = None
+    ) -> tuple[ReplaceOne[Any], UUID]:
+        """Build the operation replacing the stored document of the entity, and provide its ID.
+
+        When the document uses revisions, the operation only matches the revision the entity was read from.
+
+        Raises:
+            ValueError: If the document cannot be created from the entity.
+        """
+        try:
+            document: DocumentGenericType = self._converter.to_document(
+                entity, updated_at=update_time or _database_now()
+            )
+        except ValueError as error:
+            raise ValueError(f"Failed to create document from entity: {error}") from error
+        encoder: Encoder = Encoder(to_db=True)
+        find_query: dict[str, Any] = {"_id": encoder.encode(document.id)}
+        if self._document_type.get_settings().use_revision:
+            if document.revision_id is not None:
+                find_query["revision_id"] = encoder.encode(document.revision_id)
+            document.revision_id = uuid4()
+        return ReplaceOne(find_query, self._document_to_db(document)), document.id
+
+    def _delete_operation(self, entity_id: UUID) -> DeleteOne:
+        """Build the operation deleting the document of the entity."""
+        return DeleteOne({"_id": Encoder(to_db=True).encode(entity_id)})
+
+    def _upsert_queries(
+        self, document: DocumentGenericType, key_aliases: list[str]
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Build the filter and the update upserting the document, matched on the key fields.
+
+        The ID and creation timestamp are only written when the document is created.
+        """
+        if self._document_type.get_settings().use_revision:
+            document.revision_id = uuid4()
+        document_dump: dict[str, Any] = self._document_to_db(document)
+        insert_only_aliases: set[str] = {"_id", self._document_field_alias("created_at")}
+        return {alias: document_dump.get(alias) for alias in key_aliases}, {
+            "$set": {key: value for key, value in document_dump.items() if key not in insert_only_aliases},
+            "$setOnInsert": {key: value for key, value in document_dump.items() if key in insert_only_aliases},
+        }
+
+    @managed_session(write=True)
+    async def bulk_upsert(
+        self,
+        entities: Iterable[EntityGenericType],
+        key_fields: tuple[str, ...] = ("id",),
+        chunk_size: int | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> BulkUpdateResult:
+        """Insert or update the entities, matched on the key fields, with unordered bulk_write calls.
+
+        The ID and creation timestamp are only written when the document is created.
+
+        Args:
+            entities (Iterable[EntityGenericType]): The entities to upsert.
+            key_fields (tuple[str, ...]): The document fields identifying an entity. Defaults to ("id",).
+            chunk_size (int | None): The number of operations per bulk_write call. Defaults to BULK_CHUNK_SIZE.
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            BulkUpdateResult: The matched, modified and upserted counts and the items which failed.
+
+        Raises:
+            ValueError: If a document cannot be created from an entity, a key field is unknown
+                or the chunk size is invalid.
+            OperationError: If the operation fails.
+        """
+        if len(key_fields) == 0:
+            raise ValueError("At least one key field is required to upsert entities.")
+        key_aliases: list[str] = [self._document_field_alias(field_name) for field_name in key_fields]
+        results: list[BulkUpdateResult] = []
+        offset: int = 0
+        for chunk in _chunked(entities, chunk_size or self.BULK_CHUNK_SIZE):
+            upsert_time: datetime.datetime = _database_now()
+            operations: list[ReplaceOne[Any] | UpdateOne] = []
+            document_ids: list[UUID] = []
+            try:
+                for entity in chunk:
+                    document: DocumentGenericType = self._converter.to_document(
+                        entity, created_at=upsert_time, updated_at=upsert_time
+                    )
+                    find_query, update_query = self._upsert_queries(document, key_aliases)
+                    operations.append(UpdateOne(find_query, update_query, upsert=True))
+                    document_ids.append(document.id)
+            except ValueError as error:
+                raise ValueError(f"Failed to create document from entity: {error}") from error
+
+            try:
+                results.append(await self._bulk_write_chunk(operations, document_ids, offset, session))
+            finally:
+                for document_id in document_ids:
+                    self._invalidate_cache(document_id)
+            offset += len(chunk)
+
+        return self._merge_bulk_results(results)
+
+    @managed_session(write=True)
+    async def find_one_and_update(  # noqa: PLR0913
+        self,
+        query: Mapping[str, Any],
+        update: Mapping[str, Any],
+        upsert: bool = False,
+        return_updated: bool = True,
+        sort: list[tuple[str, SortDirection]] | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> EntityGenericType | None:
+        """Update the first document matching the query and return it, in one atomic operation.
+
+        The update timestamp and the revision are set along with the update, and an upserted document gets
+        a new ID (unless the query sets it) and its creation timestamp.
+
+        Args:
+            query (Mapping[str, Any]): The filter of the document.
+            update (Mapping[str, Any]): The update operators, e.g. {"$set": {"status": "done"}}.
+            upsert (bool): Whether to insert a document when none matches. Defaults to False.
+            return_updated (bool): Whether to return the document after the update instead of before.
+                Defaults to True.
+            sort (list[tuple[str, SortDirection]] | None): The order picking the document when several match.
+                Defaults to None.
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            EntityGenericType | None: The entity, None if no document matched (and none was upserted, or
+            the document before the update is requested).
+
+        Raises:
+            ValueError: If the update has no operator or the entity cannot be created from the document.
+            UnableToCreateEntityDueToDuplicateKeyError: If the update conflicts with a unique index.
+            OperationError: If the operation fails.
+        """
+        if len(update) == 0 or not all(operator.startswith("$") for operator in update):
+            raise ValueError("The update must only contain update operators.")
+        encoder: Encoder = Encoder(to_db=True)
+        update_time: datetime.datetime = _database_now()
+        update_query: dict[str, Any] = {operator: dict(fields) for operator, fields in update.items()}
+        update_query.setdefault("$set", {})[self._document_field_alias("updated_at")] = update_time
+        if self._document_type.get_settings().use_revision:
+            update_query["$set"]["revision_id"] = uuid4()
+        if upsert:
+            set_on_insert: dict[str, Any] = update_query.setdefault("$setOnInsert", {})
+            set_on_insert.setdefault(self._document_field_alias("created_at"), update_time)
+            if "_id" not in query:
+                set_on_insert.setdefault("_id", uuid4())
+
+        try:
+            raw_document: dict[str, Any] | None = await self._document_type.get_motor_collection().find_one_and_update(
+                encoder.encode(dict(query)),
+                encoder.encode(update_query),
+                upsert=upsert,
+                sort=[(key, int(direction)) for key, direction in sort] if sort else None,
+                return_document=ReturnDocument.AFTER if return_updated else ReturnDocument.BEFORE,
+                session=session,
+            )
+        except DuplicateKeyError as error:
+            raise UnableToCreateEntityDueToDuplicateKeyError(f"Failed to find and update document: {error}") from error
+        except PyMongoError as error:
+            raise OperationError(f"Failed to find and update document: {error}") from error
+
+        if raw_document is None:
+            return None
+        return self._raw_document_to_entity(raw_document, refresh_cache=return_updated)
+
+    @managed_session(write=True)
+    async def upsert_one(
+        self,
+        entity: EntityGenericType,
+        key_fields: tuple[str, ...] = ("id",),
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> EntityGenericType:
+        """Insert or update the entity, matched on the key fields, in one atomic operation.
+
+        The ID and creation timestamp are only written when the document is created.
+
+        Args:
+            entity (EntityGenericType): The entity to upsert.
+            key_fields (tuple[str, ...]): The document fields identifying the entity. Defaults to ("id",).
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            EntityGenericType: The entity as stored.
+
+        Raises:
+            ValueError: If the document cannot be created from the entity or a key field is unknown.
+            UnableToCreateEntityDueToDuplicateKeyError: If the insertion conflicts with a unique index.
+            OperationError: If the operation fails.
+        """
+        if len(key_fields) == 0:
+            raise ValueError("At least one key field is required to upsert an entity.")
+        key_aliases: list[str] = [self._document_field_alias(field_name) for field_name in key_fields]
+        upsert_time: datetime.datetime = _database_now()
+        try:
+            document: DocumentGenericType = self._converter.to_document(
+                entity, created_at=upsert_time, updated_at=upsert_time
+            )
+        except ValueError as error:
+            raise ValueError(f"Failed to create document from entity: {error}") from error
+        find_query, update_query = self._upsert_queries(document, key_aliases)
 
+        try:
+            raw_document: dict[str, Any] = await self._document_type.get_motor_collection().find_one_and_update(
+                find_query, update_query, upsert=True, return_document=ReturnDocument.AFTER, session=session
+            )
+        except DuplicateKeyError as error:
+            raise UnableToCreateEntityDueToDuplicateKeyError(f"Failed to upsert document: {error}") from error
+        except PyMongoError as error:
+            raise OperationError(f"Failed to upsert document: {error}") from error
+
+        self._tracker.forget(entity)
+        return self._raw_document_to_entity(raw_document)
+
+    @managed_session(write=True)
+    async def increment(
+        self,
+        entity_id: UUID,
+        field: str,
+        by: int | float = 1,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> EntityGenericType | None:
+        """Increment a numeric field of the entity in one atomic operation.
+
+        Args:
+            entity_id (UUID): The ID of the entity.
+            field (str): The document field to increment.
+            by (int | float): The increment, negative to decrement. Defaults to 1.
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            EntityGenericType | None: The entity after the increment, None if not found.
+
+        Raises:
+            ValueError: If the field is unknown or the entity cannot be created from the document.
+            OperationError: If the operation fails.
+        """
+        return await self.find_one_and_update(
+            {"_id": entity_id}, {"$inc": {self._document_field_alias(field): by}}, session=session
+        )
+
+    def _raw_document_to_entity(self, raw_document: dict[str, Any], refresh_cache: bool = True) -> EntityGenericType:
+        """Convert a document returned by the driver to an entity, and cache it when it is the stored state.
+
+        Raises:
+            ValueError: If the entity cannot be created from the document.
+        """
+        try:
+            document: DocumentGenericType = self._document_type.model_validate(raw_document)
+        except ValueError as error:
+            raise ValueError(f"Failed to create document from database: {error}") from error
+        entity: EntityGenericType = self._to_entity(document)
+        if refresh_cache:
+            self._refresh_cache(document.id, entity)
+        else:
+            self._invalidate_cache(document.id)
+        return entity
+
+    @retried()
     @managed_session()
     async def get_one_by_id(
         self,
         entity_id: UUID,
+        read_preference: ReadPreferenceEnum | _ServerMode | None = None,
         session: AsyncIOMotorClientSession | None = None,
     ) -> EntityGenericType | None:
         """Get the entity by its ID.
 
+        When the repository has an entity cache, the entity is served from the cache if present.
+        The reads from the other members than the primary bypass the cache, since they may be stale.
+
         Args:
             entity_id (UUID): The ID of the entity.
+            read_preference (ReadPreferenceEnum | _ServerMode | None): The members of the replica set
+                serving the read. Defaults to None (READ_PREFERENCE).
             session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
 
         Returns:
@@ -160,8 +1098,51 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
             OperationError: If the operation fails.
 
         """
+        resolved_read_preference: _ServerMode | None = self._read_preference(read_preference)
+        reads_primary: bool = resolved_read_preference is None or isinstance(resolved_read_preference, Primary)
+        if self._entity_cache is None or not reads_primary:
+            return await self._get_one_by_id_from_database(
+                entity_id=entity_id, session=session, read_preference=resolved_read_preference
+            )
+
+        cached: tuple[EntityGenericType, dict[str, Any] | None] | None = self._entity_cache.get(entity_id)
+        if cached is not None:
+            entity_cached, snapshot = cached
+            if self.CHANGE_TRACKING and snapshot is not None:
+                self._tracker.track(entity_cached, snapshot)
+            return entity_cached
+
+        entity: EntityGenericType | None = None
+        self._entity_cache.start_fill(entity_id)
         try:
-            document: DocumentGenericType | None = await self._document_type.get(document_id=entity_id, session=session)
+            entity = await self._get_one_by_id_from_database(
+                entity_id=entity_id, session=session, read_preference=resolved_read_preference
+            )
+        finally:
+            self._entity_cache.finish_fill(entity_id, entity, self._tracker.get(entity) if entity is not None else None)
+        return entity
+
+    async def _get_one_by_id_from_database(
+        self,
+        entity_id: UUID,
+        session: AsyncIOMotorClientSession | None,
+        read_preference: _ServerMode | None = None,
+    ) -> EntityGenericType | None:
+        """Read the entity from the database.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        try:
+            document: DocumentGenericType | None
+            if read_preference is None:
+                document = await self._document_type.get(document_id=entity_id, session=session)
+            else:
+                document = None
+                async for document in self._read(
+                    self._document_type.find({"_id": entity_id}, limit=1, session=session), read_preference
+                ):
+                    break
         except PyMongoError as error:
             raise OperationError(f"Failed to get document: {error}") from error
 
@@ -170,14 +1151,46 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
             return None
 
         # Convert the document to an entity
-        try:
-            entity: EntityGenericType = self._entity_type(**document.model_dump())
-        except ValueError as error:
-            raise ValueError(f"Failed to create entity from document: {error}") from error
-
-        return entity
+        return self._to_entity(document)
 
+    @retried()
     @managed_session()
+    async def get_many_by_ids(
+        self,
+        entity_ids: Iterable[UUID],
+        chunk_size: int | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> dict[UUID, EntityGenericType | None]:
+        """Get the entities by their IDs with one $in query per chunk.
+
+        Args:
+            entity_ids (Iterable[UUID]): The IDs of the entities. Duplicates are resolved once.
+            chunk_size (int | None): The number of IDs per query. Defaults to BULK_CHUNK_SIZE.
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            dict[UUID, EntityGenericType | None]: The entities keyed by ID in the requested order,
+            None for the IDs not found.
+
+        Raises:
+            ValueError: If an entity cannot be created from a document or the chunk size is invalid.
+            OperationError: If the operation fails.
+        """
+        entities: dict[UUID, EntityGenericType | None] = dict.fromkeys(entity_ids)
+        for chunk in _chunked(list(entities), chunk_size or self.BULK_CHUNK_SIZE):
+            try:
+                documents: list[DocumentGenericType] = await self._document_type.find(
+                    {"_id": {"$in": chunk}}, session=session
+                ).to_list()
+            except PyMongoError as error:
+                raise OperationError(f"Failed to get documents: {error}") from error
+
+            for document in documents:
+                entities[document.id] = self._to_entity(document)
+
+        return entities
+
+    @managed_session(write=True)
     async def delete_one_by_id(
         self, entity_id: UUID, raise_if_not_found: bool = False, session: AsyncIOMotorClientSession | None = None
     ) -> None:
@@ -195,32 +1208,127 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
 
         """
         try:
-            document_to_delete: DocumentGenericType | None = await self._document_type.get(
-                document_id=entity_id, session=session
+            delete_result: DeleteResult | None = await self._document_type.find_one({"_id": entity_id}).delete_one(
+                session=session
             )
         except PyMongoError as error:
-            raise OperationError(f"Failed to get document to delete: {error}") from error
+            raise OperationError(f"Failed to delete document: {error}") from error
+        finally:
+            self._invalidate_cache(entity_id)
 
-        if document_to_delete is None:
-            if raise_if_not_found:
-                raise ValueError(f"Failed to find document with ID {entity_id}")
-            return
+        if delete_result is None or not delete_result.acknowledged:
+            raise OperationError("Failed to delete document.")
+
+        if delete_result.deleted_count == 0 and raise_if_not_found:
+            raise ValueError(f"Failed to find document with ID {entity_id}")
 
+    @managed_session(write=True)
+    async def delete_many(self, query: Mapping[str, Any], session: AsyncIOMotorClientSession | None = None) -> int:
+        """Delete the documents matching the query.
+
+        Args:
+            query (Mapping[str, Any]): The filter of the documents to delete.
+            session (AsyncIOMotorClientSession | None, optional): The session to use.
+            Defaults to None. (managed by decorator)
+
+        Returns:
+            int: The number of documents deleted.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
         try:
-            delete_result: DeleteResult | None = await document_to_delete.delete()
+            delete_result: DeleteResult | None = await self._document_type.find(query).delete_many(session=session)
         except PyMongoError as error:
-            raise OperationError(f"Failed to delete document: {error}") from error
+            raise OperationError(f"Failed to delete documents: {error}") from error
+        finally:
+            # The IDs of the documents deleted are unknown.
+            if self._entity_cache is not None:
+                self._entity_cache.clear()
 
-        if delete_result is not None and delete_result.deleted_count == 1 and delete_result.acknowledged:
-            return
+        if delete_result is None or not delete_result.acknowledged:
+            raise OperationError("Failed to delete documents.")
+
+        return delete_result.deleted_count
+
+    @retried()
+    @managed_session()
+    async def count(
+        self, query: Mapping[str, Any] | None = None, session: AsyncIOMotorClientSession | None = None
+    ) -> int:
+        """Count the documents matching the query, without fetching them.
+
+        Args:
+            query (Mapping[str, Any] | None): The filter of the documents. Defaults to None (all documents).
+            session (AsyncIOMotorClientSession | None, optional): The session to use.
+            Defaults to None. (managed by decorator)
+
+        Returns:
+            int: The number of documents.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        encoded_query: dict[str, Any] = self._encode_query(query)
+        await self._advise("count", {"query": encoded_query})
+        try:
+            return await self._document_type.get_motor_collection().count_documents(encoded_query, session=session)
+        except PyMongoError as error:
+            raise OperationError(f"Failed to count documents: {error}") from error
+
+    @retried()
+    async def estimated_count(self) -> int:
+        """Estimate the number of documents of the collection from its metadata, without scanning it.
+
+        The estimate may be inaccurate after an unclean shutdown or during orphaned chunk migrations of a sharded
+        cluster. It cannot run in a transaction.
+
+        Returns:
+            int: The estimated number of documents.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        try:
+            return await self._document_type.get_motor_collection().estimated_document_count()
+        except PyMongoError as error:
+            raise OperationError(f"Failed to estimate the document count: {error}") from error
+
+    @retried()
+    @managed_session()
+    async def exists(
+        self, query: Mapping[str, Any] | None = None, session: AsyncIOMotorClientSession | None = None
+    ) -> bool:
+        """Check whether a document matches the query, fetching at most its ID.
 
-        raise OperationError("Failed to delete document.")
+        Args:
+            query (Mapping[str, Any] | None): The filter of the documents. Defaults to None (any document).
+            session (AsyncIOMotorClientSession | None, optional): The session to use.
+            Defaults to None. (managed by decorator)
+
+        Returns:
+            bool: Whether a document matches.
 
+        Raises:
+            OperationError: If the operation fails.
+        """
+        encoded_query: dict[str, Any] = self._encode_query(query)
+        await self._advise("find", {"filter": encoded_query, "limit": 1})
+        try:
+            document: Mapping[str, Any] | None = await self._document_type.get_motor_collection().find_one(
+                encoded_query, projection={"_id": 1}, session=session
+            )
+        except PyMongoError as error:
+            raise OperationError(f"Failed to check the existence of documents: {error}") from error
+
+        return document is not None
+
+    @retried()
     @managed_session()
     async def find(  # noqa: PLR0913
         self,
         *args: Mapping[str, Any] | bool,
-        projection_model: None = None,
+        projection_model: type[ProjectionGenericType] | None = None,
         skip: int | None = None,
         limit: int | None = None,
         sort: None | str | list[tuple[str, SortDirection]] = None,
@@ -230,13 +1338,19 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
         lazy_parse: bool = False,
         nesting_depth: int | None = None,
         nesting_depths_per_field: dict[str, int] | None = None,
+        read_preference: ReadPreferenceEnum | _ServerMode | None = None,
         **pymongo_kwargs: Any,
-    ) -> list[EntityGenericType]:
+    ) -> list[EntityGenericType] | list[ProjectionGenericType]:
         """Find documents in the database.
 
+        With a projection model, only the fields of the model are fetched and the results are returned
+        as instances of the model, without conversion to entities. The fields of the model map to the
+        database names through their alias (e.g. `id: UUID = Field(alias="_id")`), unless the model
+        defines its projection with `Settings.projection`.
+
         Args:
             *args: The arguments to pass to the find method.
-            projection_model: The projection model to use.
+            projection_model: The projection model to use. Defaults to None (the entities).
             skip: The number of documents to skip.
             limit: The number of documents to return.
             sort: The sort order.
@@ -246,36 +1360,348 @@ class AbstractRepository(ABC, Generic[DocumentGenericType, EntityGenericType]):
             lazy_parse: Whether to lazy parse the documents.
             nesting_depth: The nesting depth.
             nesting_depths_per_field: The nesting depths per field.
+            read_preference: The members of the replica set serving the read. Defaults to None (READ_PREFERENCE).
             **pymongo_kwargs: Additional keyword arguments to pass to the find method.
 
         Returns:
-            list[EntityGenericType]: The list of entities.
+            list[EntityGenericType] | list[ProjectionGenericType]: The list of entities,
+            or of projections when a projection model is given.
 
         Raises:
             OperationError: If the operation fails.
-            ValueError: If the entity cannot be created from the document.
+            ValueError: If the entity or the projection cannot be created from the document.
         """
+        query: FindMany[Any] = self._document_type.find(
+            *args,
+            projection_model=projection_model,
+            skip=skip,
+            limit=limit,
+            sort=sort,
+            session=session,
+            ignore_cache=ignore_cache,
+            fetch_links=fetch_links,
+            lazy_parse=lazy_parse,
+            nesting_depth=nesting_depth,
+            nesting_depths_per_field=nesting_depths_per_field,
+            **pymongo_kwargs,
+        )
+        await self._advise_find(query)
+        resolved_read_preference: _ServerMode | None = self._read_preference(read_preference)
         try:
-            documents: list[DocumentGenericType] = await self._document_type.find(
+            results: list[Any] = (
+                await query.to_list()
+                if resolved_read_preference is None
+                else [result async for result in self._read(query, resolved_read_preference)]
+            )
+        except PyMongoError as error:
+            raise OperationError(f"Failed to find documents: {error}") from error
+
+        if projection_model is not None:
+            return results
+
+        entities: list[EntityGenericType] = [self._to_entity(document) for document in results]
+
+        return entities
+
+    @retried()
+    @managed_session()
+    async def stream(  # noqa: PLR0913
+        self,
+        *args: Mapping[str, Any] | bool,
+        projection_model: type[ProjectionGenericType] | None = None,
+        skip: int | None = None,
+        limit: int | None = None,
+        sort: None | str | list[tuple[str, SortDirection]] = None,
+        batch_size: int | None = None,
+        read_preference: ReadPreferenceEnum | _ServerMode | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+        **pymongo_kwargs: Any,
+    ) -> AsyncGenerator[EntityGenericType | ProjectionGenericType, None]:
+        """Stream the entities matching the query.
+
+        The documents are pulled from the cursor batch by batch and converted one at a time,
+        so the memory used does not grow with the size of the result.
+        With a projection model, only its fields are fetched, as for `find`.
+
+        Args:
+            *args: The arguments to pass to the find method.
+            projection_model: The projection model to use. Defaults to None (the entities).
+            skip: The number of documents to skip.
+            limit: The number of documents to return.
+            sort: The sort order.
+            batch_size: The number of documents per cursor batch. Defaults to STREAM_BATCH_SIZE.
+            read_preference: The members of the replica set serving the read. Defaults to None (READ_PREFERENCE).
+            session: The session to use. (managed by decorator)
+            **pymongo_kwargs: Additional keyword arguments to pass to the find method.
+
+        Yields:
+            EntityGenericType | ProjectionGenericType: The entities, or the projections when a projection model
+            is given, in cursor order.
+
+        Raises:
+            OperationError: If the operation fails.
+            ValueError: If the entity or the projection cannot be created from the document.
+        """
+        query: FindMany[Any] = self._document_type.find(
+            *args,
+            projection_model=projection_model,
+            skip=skip,
+            limit=limit,
+            sort=sort,
+            session=session,
+            batch_size=batch_size or self.STREAM_BATCH_SIZE,
+            **pymongo_kwargs,
+        )
+        await self._advise_find(query)
+        try:
+            async for document in self._read(query, self._read_preference(read_preference)):
+                yield document if projection_model is not None else self._to_entity(document)
+        except PyMongoError as error:
+            raise OperationError(f"Failed to stream documents: {error}") from error
+
+    @retried()
+    @managed_session()
+    async def stream_raw_json(  # noqa: PLR0913
+        self,
+        *args: Mapping[str, Any] | bool,
+        projection_model: type[BaseModel] | None = None,
+        rename: Mapping[str, str] | None = None,
+        skip: int | None = None,
+        limit: int | None = None,
+        sort: None | str | list[tuple[str, SortDirection]] = None,
+        batch_size: int | None = None,
+        read_preference: ReadPreferenceEnum | _ServerMode | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+        **pymongo_kwargs: Any,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream the documents matching the query as JSON objects, without building documents nor entities.
+
+        The documents are read as raw BSON and encoded straight to JSON, for the endpoints relaying the stored data
+        as is: no validation, no entity cache and no conversion to the entities take place.
+
+        Args:
+            *args: The arguments to pass to the find method.
+            projection_model: The model whose fields are fetched. Defaults to None (all the fields).
+            rename: The new names of the top-level fields, e.g. {"_id": "id"}. Defaults to None (the names stored).
+            skip: The number of documents to skip.
+            limit: The number of documents to return.
+            sort: The sort order.
+            batch_size: The number of documents per cursor batch. Defaults to STREAM_BATCH_SIZE.
+            read_preference: The members of the replica set serving the read. Defaults to None (READ_PREFERENCE).
+            session: The session to use. (managed by decorator)
+            **pymongo_kwargs: Additional keyword arguments to pass to the find method.
+
+        Yields:
+            bytes: The JSON object of each document, in cursor order.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        query: FindMany[Any] = self._document_type.find(
+            *args,
+            projection_model=projection_model,
+            skip=skip,
+            limit=limit,
+            sort=sort,
+            session=session,
+            batch_size=batch_size or self.STREAM_BATCH_SIZE,
+            **pymongo_kwargs,
+        )
+        await self._advise_find(query)
+        try:
+            async for document in self._read_cursor(
+                query, self._read_preference(read_preference), codec_options=RAW_CODEC_OPTIONS
+            ):
+                yield raw_document_to_json(document, rename=rename)
+        except PyMongoError as error:
+            raise OperationError(f"Failed to stream documents: {error}") from error
+
+    @retried()
+    @managed_session()
+    async def find_raw_json(  # noqa: PLR0913
+        self,
+        *args: Mapping[str, Any] | bool,
+        projection_model: type[BaseModel] | None = None,
+        rename: Mapping[str, str] | None = None,
+        skip: int | None = None,
+        limit: int | None = None,
+        sort: None | str | list[tuple[str, SortDirection]] = None,
+        read_preference: ReadPreferenceEnum | _ServerMode | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+        **pymongo_kwargs: Any,
+    ) -> bytes:
+        """Find the documents matching the query as a JSON array, without building documents nor entities.
+
+        ```python
+        @router.get("/books")
+        async def list_books(repository: BookRepository = Depends(depends_book_repository)) -> Response:
+            content: bytes = await repository.find_raw_json(rename={"_id": "id"}, limit=100)
+            return Response(content=content, media_type="application/json")
+        ```
+
+        Args:
+            *args: The arguments to pass to the find method.
+            projection_model: The model whose fields are fetched. Defaults to None (all the fields).
+            rename: The new names of the top-level fields, e.g. {"_id": "id"}. Defaults to None (the names stored).
+            skip: The number of documents to skip.
+            limit: The number of documents to return.
+            sort: The sort order.
+            read_preference: The members of the replica set serving the read. Defaults to None (READ_PREFERENCE).
+            session: The session to use. (managed by decorator)
+            **pymongo_kwargs: Additional keyword arguments to pass to the find method.
+
+        Returns:
+            bytes: The JSON array of the documents.
+
+        Raises:
+            OperationError: If the operation fails.
+        """
+        documents: list[bytes] = [
+            document
+            async for document in self.stream_raw_json(
                 *args,
                 projection_model=projection_model,
+                rename=rename,
                 skip=skip,
                 limit=limit,
                 sort=sort,
+                read_preference=read_preference,
                 session=session,
-                ignore_cache=ignore_cache,
-                fetch_links=fetch_links,
-                lazy_parse=lazy_parse,
-                nesting_depth=nesting_depth,
-                nesting_depths_per_field=nesting_depths_per_field,
                 **pymongo_kwargs,
-            ).to_list()
-        except PyMongoError as error:
-            raise OperationError(f"Failed to find documents: {error}") from error
+            )
+        ]
+        return b"[" + b",".join(documents) + b"]"
+
+    @retried()
+    @managed_session()
+    async def paginate(
+        self,
+        query: Mapping[str, Any] | None = None,
+        sort_keys: list[tuple[str, SortDirection]] | None = None,
+        after: str | None = None,
+        page_size: int | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> Page[EntityGenericType]:
+        """Get a page of entities with keyset pagination.
+
+        Instead of skipping the previous pages, the query starts right after the last document of the previous page,
+        so the cost of a page does not depend on its depth when the sort keys are indexed.
+        The "_id" key is appended to the sort keys when missing to make the order total.
+
+        Args:
+            query (Mapping[str, Any] | None): The filter of the documents. Defaults to None (all documents).
+            sort_keys (list[tuple[str, SortDirection]] | None): The database fields to sort on.
+                Defaults to PAGINATION_SORT_KEYS.
+            after (str | None): The cursor returned with the previous page. Defaults to None (first page).
+            page_size (int | None): The number of entities per page. Defaults to PAGE_SIZE.
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Returns:
+            Page[EntityGenericType]: The entities of the page and the cursor of the next page.
+
+        Raises:
+            ODMPluginConfigError: If the repository has no pagination secret.
+            InvalidPaginationCursorError: If the cursor is invalid for this query.
+            ValueError: If the page size is invalid or an entity cannot be created from a document.
+            OperationError: If the operation fails.
+        """
+        if self._pagination_secret is None:
+            raise ODMPluginConfigError(
+                "A pagination secret is required to sign the pagination cursors, see ODMConfig.pagination_secret."
+            )
+        page_size = page_size or self.PAGE_SIZE
+        if page_size <= 0:
+            raise ValueError(f"The page size must be strictly positive, got {page_size}.")
+        keys: list[tuple[str, SortDirection]] = list(sort_keys or self.PAGINATION_SORT_KEYS)
+        if all(key != "_id" for key, _ in keys):
+            keys.append(("_id", keys[-1][1] if keys else SortDirection.ASCENDING))
+        codec: KeysetCursorCodec = KeysetCursorCodec(secret=self._pagination_secret)
 
+        filters: list[Mapping[str, Any]] = [query] if query else []
+        if after is not None:
+            filters.append(build_keyset_filter(keys, codec.decode(after, keys)))
+
+        page_query: FindMany[DocumentGenericType] = self._document_type.find(
+            {"$and": filters} if filters else {},
+            sort=keys,
+            limit=page_size + 1,
+            session=session,
+        )
+        await self._advise_find(page_query)
         try:
-            entities: list[EntityGenericType] = [self._entity_type(**document.model_dump()) for document in documents]
-        except ValueError as error:
-            raise ValueError(f"Failed to create entity from document: {error}") from error
+            documents: list[DocumentGenericType] = await page_query.to_list()
+        except PyMongoError as error:
+            raise OperationError(f"Failed to paginate documents: {error}") from error
 
-        return entities
+        next_cursor: str | None = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            last_document: dict[str, Any] = self._document_to_db(documents[-1])
+            next_cursor = codec.encode(keys, [get_value_at_path(last_document, key) for key, _ in keys])
+
+        entities: list[EntityGenericType] = [self._to_entity(document) for document in documents]
+
+        return Page(items=entities, next_cursor=next_cursor)
+
+    @retried()
+    @managed_session()
+    async def aggregate(  # noqa: PLR0913
+        self,
+        pipeline: Sequence[Mapping[str, Any]],
+        output_model: type[OutputGenericType] | None = None,
+        allow_disk_use: bool = False,
+        batch_size: int | None = None,
+        read_preference: ReadPreferenceEnum | _ServerMode | None = None,
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> AsyncGenerator[OutputGenericType | dict[str, Any], None]:
+        """Run an aggregation pipeline on the collection and stream its results.
+
+        The pipeline runs in the database, only its results are sent to the application. The stages can be built
+        with the helpers of the aggregation module.
+
+        Args:
+            pipeline (Sequence[Mapping[str, Any]]): The stages of the pipeline.
+            output_model (type[OutputGenericType] | None): The model validating each result.
+                Defaults to None (the raw results).
+            allow_disk_use (bool): Whether the stages may write temporary files when exceeding their memory limit.
+                Defaults to False.
+            batch_size (int | None): The number of results per cursor batch. Defaults to AGGREGATE_BATCH_SIZE.
+            read_preference (ReadPreferenceEnum | _ServerMode | None): The members of the replica set running
+                the pipeline, unless it writes with $out or $merge. Defaults to None (READ_PREFERENCE).
+            session (AsyncIOMotorClientSession | None): The session to use. Defaults to None. (managed by decorator)
+
+        Yields:
+            OutputGenericType | dict[str, Any]: The results, validated with the output model when given.
+
+        Raises:
+            OperationError: If the operation fails.
+            ValueError: If a result does not match the output model.
+        """
+        collection: AsyncIOMotorCollection[Any] = self._collection()
+        resolved_read_preference: _ServerMode | None = self._read_preference(read_preference)
+        if resolved_read_preference is not None:
+            collection = collection.with_options(
+                read_preference=resolved_read_preference  # type: ignore[arg-type]  # Motor types it as ReadPreference.
+            )
+        # Encoded as beanie does, e.g. the UUIDs of a $match to BSON binaries.
+        stages: list[dict[str, Any]] = [self._encode_query(stage) for stage in pipeline]
+        await self._advise("aggregate", {"pipeline": stages, "cursor": {}})
+        try:
+            async for result in collection.aggregate(
+                stages,
+                session=session,
+                allowDiskUse=allow_disk_use,
+                batchSize=batch_size or self.AGGREGATE_BATCH_SIZE,
+            ):
+                if output_model is None:
+                    yield result
+                    continue
+                try:
+                    output: OutputGenericType = output_model.model_validate(result)
+                except ValidationError as error:
+                    raise ValueError(
+                        f"Failed to create {output_model.__name__} from aggregation result: {error}"
+                    ) from error
+                yield output
+        except PyMongoError as error:
+            raise OperationError(f"Failed to aggregate documents: {error}") from error
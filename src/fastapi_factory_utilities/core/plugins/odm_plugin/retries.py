@@ -0,0 +1,209 @@
+"""Provides the retry policy of the repository reads for the transient MongoDB errors."""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from opentelemetry import metrics
+from pymongo.errors import ConnectionFailure, PyMongoError, ServerSelectionTimeoutError
+from structlog.stdlib import BoundLogger, get_logger
+
+from .exceptions import OperationError
+
+_logger: BoundLogger = get_logger()
+
+_meter: metrics.Meter = metrics.get_meter(__name__)
+
+ResultGenericType = TypeVar("ResultGenericType")  # pylint: disable=invalid-name
+
+# Labels set by the server or the driver on the errors safe to retry.
+_RETRYABLE_LABELS: tuple[str, ...] = ("RetryableWriteError", "TransientTransactionError")
+
+
+def is_transient(error: PyMongoError) -> bool:
+    """Tell whether the error of a read is transient, the read being safe to run again.
+
+    The errors labelled RetryableWriteError or TransientTransactionError and the network errors are transient.
+    The server selection timeouts are not: the driver already waited for a server for serverSelectionTimeoutMS.
+    The writes are never retried by the policy, a write may have been applied before the connection failed.
+
+    Args:
+        error (PyMongoError): The error.
+
+    Returns:
+        bool: Whether the read can be retried.
+    """
+    if any(error.has_error_label(label) for label in _RETRYABLE_LABELS):
+        return True
+    return isinstance(error, ConnectionFailure) and not isinstance(error, ServerSelectionTimeoutError)
+
+
+class RetryBudget:
+    """Bound the retries to a ratio of the calls, so an outage does not turn into a retry storm.
+
+    Each call deposits `ratio` token and each retry withdraws one, the tokens being capped at `max_tokens`:
+    in the long run the retries are at most `ratio` of the calls, with bursts of `max_tokens` retries.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0) -> None:
+        """Initialize the budget, full.
+
+        Args:
+            ratio (float): The retries allowed per call. Defaults to 0.1.
+            max_tokens (float): The retries allowed in a burst. Defaults to 10.
+
+        Raises:
+            ValueError: If the ratio is negative or the maximum of tokens is lower than one.
+        """
+        if ratio < 0:
+            raise ValueError("The ratio of the retry budget must be positive.")
+        if max_tokens < 1:
+            raise ValueError("The retry budget must allow at least one retry.")
+        self._ratio: float = ratio
+        self._max_tokens: float = max_tokens
+        self._tokens: float = max_tokens
+
+    @property
+    def tokens(self) -> float:
+        """The retries left in the budget."""
+        return self._tokens
+
+    def deposit(self) -> None:
+        """Credit the budget for a call."""
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        """Debit the budget for a retry.
+
+        Returns:
+            bool: Whether the retry is allowed.
+        """
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class RetryPolicy:
+    """Retry the reads failing with a transient error, with an exponential backoff and a full jitter.
+
+    The delay before the attempt n + 1 is drawn in [0, min(max_delay, base_delay * 2 ** (n - 1))], spreading the
+    retries of the clients hit by the same election. The retries are bounded by the attempts of each call and by the
+    budget shared by all the calls.
+
+    - odm.repository.retries: the number of retryable failures, by operation and outcome: retried, or given up
+      because of the budget (budget_exhausted) or of the attempts (attempts_exhausted).
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        budget: RetryBudget | None = None,
+        meter: metrics.Meter | None = None,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            max_attempts (int): The maximum number of attempts of a call. Defaults to 3.
+            base_delay (float): The maximum seconds waited before the first retry, doubled for each next one.
+                Defaults to 0.05.
+            max_delay (float): The maximum seconds waited before a retry. Defaults to 1.
+            budget (RetryBudget | None): The budget of the retries. Defaults to None (a budget of 10% of the calls).
+            meter (metrics.Meter | None): The meter. Defaults to None (the meter of the global provider).
+
+        Raises:
+            ValueError: If the maximum number of attempts is not strictly positive or a delay is negative.
+        """
+        if max_attempts <= 0:
+            raise ValueError("The maximum number of attempts must be strictly positive.")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("The delays must be positive.")
+        self._max_attempts: int = max_attempts
+        self._base_delay: float = base_delay
+        self._max_delay: float = max_delay
+        self._budget: RetryBudget = budget or RetryBudget()
+        self._retries: metrics.Counter = (meter or _meter).create_counter(
+            name="odm.repository.retries",
+            unit="{retry}",
+            description="The number of repository calls failing with a transient error, by outcome.",
+        )
+
+    @property
+    def budget(self) -> RetryBudget:
+        """The budget of the retries."""
+        return self._budget
+
+    def delay(self, attempt: int) -> float:
+        """Draw the seconds to wait after the failed attempt.
+
+        Args:
+            attempt (int): The number of the failed attempt, from 1.
+
+        Returns:
+            float: The delay.
+        """
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1)))
+
+    def should_retry(self, operation: str, error: PyMongoError, attempt: int) -> bool:
+        """Tell whether the failed attempt is retried, recording the decision.
+
+        Args:
+            operation (str): The name of the operation, e.g. BookRepository.find.
+            error (PyMongoError): The error of the attempt.
+            attempt (int): The number of the failed attempt, from 1.
+
+        Returns:
+            bool: Whether the operation is attempted again.
+        """
+        if not is_transient(error):
+            return False
+        outcome: str = "retried"
+        if attempt >= self._max_attempts:
+            outcome = "attempts_exhausted"
+        elif not self._budget.withdraw():
+            outcome = "budget_exhausted"
+        self._retries.add(1, attributes={"operation": operation, "outcome": outcome})
+        if outcome != "retried":
+            _logger.warning(f"Giving up {operation} after {attempt} attempts ({outcome}). {error}")
+            return False
+        _logger.info(f"Retrying {operation} after a transient error. {error}")
+        return True
+
+    async def run(
+        self,
+        operation: str,
+        call: Callable[[], Awaitable[ResultGenericType]],
+        error_of: Callable[[BaseException], PyMongoError | None] | None = None,
+    ) -> ResultGenericType:
+        """Run the call, again after each transient error while the attempts and the budget allow it.
+
+        Args:
+            operation (str): The name of the operation, e.g. BookRepository.find.
+            call (Callable[[], Awaitable[ResultGenericType]]): The call, one per attempt, a read.
+            error_of (Callable[[BaseException], PyMongoError | None] | None): Extract the MongoDB error from the
+                PyMongoError or OperationError raised by the call. Defaults to None (the PyMongoError raised).
+
+        Returns:
+            ResultGenericType: The result of the first successful attempt.
+
+        Raises:
+            PyMongoError | OperationError: The error of the last attempt, the other exceptions as is.
+        """
+        self._budget.deposit()
+        attempt: int = 1
+        while True:
+            try:
+                return await call()
+            except (PyMongoError, OperationError) as exception:
+                error: PyMongoError | None = (
+                    error_of(exception)
+                    if error_of is not None
+                    else (exception if isinstance(exception, PyMongoError) else None)
+                )
+                if error is None or not self.should_retry(operation, error, attempt):
+                    raise
+            await asyncio.sleep(self.delay(attempt))
+            attempt += 1
@@ -0,0 +1,83 @@
+"""Provides the change tracking of the entities loaded by the repositories."""
+
+import weakref
+from typing import Any
+
+from pydantic import BaseModel
+
+# Fields maintained by the repository on every write, never considered as changes of the entity.
+_MANAGED_FIELDS: frozenset[str] = frozenset({"updated_at", "revision_id"})
+
+
+class EntitySnapshotTracker:
+    """Remember the stored state of the entities loaded or written by a repository.
+
+    The snapshots are keyed by the identity of the entity objects and are dropped with them,
+    so the tracker never keeps an entity alive.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._snapshots: dict[int, tuple[weakref.ref[BaseModel], dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        """Provide the number of entities tracked."""
+        return len(self._snapshots)
+
+    def track(self, entity: BaseModel, snapshot: dict[str, Any]) -> None:
+        """Remember the stored state of the entity.
+
+        Args:
+            entity (BaseModel): The entity.
+            snapshot (dict[str, Any]): The document of the entity, as stored in the database.
+        """
+        key: int = id(entity)
+
+        def _drop(_: weakref.ref[BaseModel]) -> None:
+            self._snapshots.pop(key, None)
+
+        self._snapshots[key] = (weakref.ref(entity, _drop), snapshot)
+
+    def get(self, entity: BaseModel) -> dict[str, Any] | None:
+        """Get the stored state of the entity.
+
+        Args:
+            entity (BaseModel): The entity.
+
+        Returns:
+            dict[str, Any] | None: The document of the entity as stored in the database, None if not tracked.
+        """
+        entry: tuple[weakref.ref[BaseModel], dict[str, Any]] | None = self._snapshots.get(id(entity))
+        if entry is None or entry[0]() is not entity:
+            return None
+        return entry[1]
+
+    def forget(self, entity: BaseModel) -> None:
+        """Stop tracking the entity.
+
+        Args:
+            entity (BaseModel): The entity.
+        """
+        if self.get(entity) is not None:
+            del self._snapshots[id(entity)]
+
+    @classmethod
+    def diff(cls, snapshot: dict[str, Any], current: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Compute the top-level fields changed between the stored and the current document.
+
+        Args:
+            snapshot (dict[str, Any]): The document as stored in the database.
+            current (dict[str, Any]): The document to store.
+
+        Returns:
+            tuple[dict[str, Any], dict[str, Any]]: The $set and the $unset of the changes.
+        """
+        set_fields: dict[str, Any] = {
+            key: value
+            for key, value in current.items()
+            if key not in _MANAGED_FIELDS and (key not in snapshot or snapshot[key] != value)
+        }
+        unset_fields: dict[str, Any] = {
+            key: "" for key in snapshot if key not in _MANAGED_FIELDS and key not in current
+        }
+        return set_fields, unset_fields
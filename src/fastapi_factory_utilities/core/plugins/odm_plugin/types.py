@@ -0,0 +1,233 @@
+"""Provides the result types for the ODM plugin repositories."""
+
+import datetime
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+EntityGenericType = TypeVar("EntityGenericType", bound=BaseModel)  # pylint: disable=invalid-name
+
+DUPLICATE_KEY_ERROR_CODES: frozenset[int] = frozenset({11000, 11001})
+
+
+class BulkWriteItemError(BaseModel):
+    """Provides the failure of a single item of a bulk operation.
+
+    Attributes:
+        index (int): The position of the item in the sequence given to the bulk operation.
+        code (int | None): The MongoDB error code.
+        message (str): The MongoDB error message.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    index: int
+    code: int | None = None
+    message: str = ""
+
+    @property
+    def is_duplicate_key(self) -> bool:
+        """Whether the item failed due to a duplicate key."""
+        return self.code in DUPLICATE_KEY_ERROR_CODES
+
+
+class InsertManyResult(BaseModel, Generic[EntityGenericType]):
+    """Provides the result of a bulk insert.
+
+    Attributes:
+        inserted (list[EntityGenericType]): The entities created, in input order.
+        errors (list[BulkWriteItemError]): The items which failed to be inserted.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    inserted: list[EntityGenericType] = Field(default_factory=list)
+    errors: list[BulkWriteItemError] = Field(default_factory=list)
+
+    @property
+    def inserted_count(self) -> int:
+        """The number of entities inserted."""
+        return len(self.inserted)
+
+    @property
+    def has_errors(self) -> bool:
+        """Whether at least one item failed."""
+        return len(self.errors) > 0
+
+
+class BulkUpdateResult(BaseModel):
+    """Provides the result of a bulk update or upsert.
+
+    Attributes:
+        matched_count (int): The number of documents matched by the operations.
+        modified_count (int): The number of documents modified.
+        upserted_ids (list[UUID]): The IDs of the documents created by an upsert.
+        errors (list[BulkWriteItemError]): The items which failed to be written.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    matched_count: int = 0
+    modified_count: int = 0
+    upserted_ids: list[UUID] = Field(default_factory=list)
+    errors: list[BulkWriteItemError] = Field(default_factory=list)
+
+    @property
+    def upserted_count(self) -> int:
+        """The number of documents created by an upsert."""
+        return len(self.upserted_ids)
+
+    @property
+    def has_errors(self) -> bool:
+        """Whether at least one item failed."""
+        return len(self.errors) > 0
+
+
+class Page(BaseModel, Generic[EntityGenericType]):
+    """Provides a page of a keyset pagination.
+
+    Attributes:
+        items (list[EntityGenericType]): The entities of the page.
+        next_cursor (str | None): The opaque token to request the next page, None on the last page.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    items: list[EntityGenericType] = Field(default_factory=list)
+    next_cursor: str | None = None
+
+    @property
+    def has_next(self) -> bool:
+        """Whether a next page exists."""
+        return self.next_cursor is not None
+
+
+class EntityCacheStats(BaseModel):
+    """Provides the metrics of an entity cache.
+
+    Attributes:
+        hits (int): The number of lookups served by the cache.
+        misses (int): The number of lookups not served by the cache.
+        evictions (int): The number of entities dropped for expiry or lack of space.
+        size (int): The number of entities cached.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The share of the lookups served by the cache, 0 without lookup."""
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class BufferedWriterStats(BaseModel):
+    """Provides the metrics of a buffered writer.
+
+    Attributes:
+        queue_depth (int): The number of entities waiting to be written.
+        written (int): The number of entities written.
+        failed (int): The number of entities which failed to be written, and were dropped.
+        flushes (int): The number of insert_many calls.
+        last_flush_duration (float): The seconds taken by the last insert_many call.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    queue_depth: int = 0
+    written: int = 0
+    failed: int = 0
+    flushes: int = 0
+    last_flush_duration: float = 0.0
+
+
+class SlowCommand(BaseModel):
+    """Provides a command slower than the threshold of the command profiler.
+
+    Attributes:
+        database (str): The database of the command.
+        collection (str | None): The collection of the command, None for the database commands.
+        command (str): The name of the command, e.g. find or aggregate.
+        shape (Any): The filter or pipeline of the command, with the values replaced by "?".
+        duration (float): The seconds taken by the command.
+        server (str): The address of the server.
+        finished_at (datetime.datetime): When the command finished.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    database: str
+    collection: str | None = None
+    command: str
+    shape: Any = None
+    duration: float
+    server: str
+    finished_at: datetime.datetime
+
+
+class IndexAdvice(BaseModel):
+    """Provides the execution plan of a query shape, explained by the index advisor.
+
+    Attributes:
+        collection (str): The collection of the query.
+        command (str): The command of the query: find, count or aggregate.
+        shape (Any): The query with its values replaced by "?".
+        stages (list[str]): The stages of the winning plan, e.g. ["FETCH", "IXSCAN"].
+        indexes (list[str]): The names of the indexes used by the winning plan.
+        docs_examined (int): The number of documents examined.
+        returned (int): The number of documents returned.
+        declared_index (list[str] | None): The keys of the declared index the query could use, None if none.
+        problems (list[str]): Why the query is inefficient, empty if it is not.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    collection: str
+    command: str
+    shape: Any = None
+    stages: list[str] = Field(default_factory=list)
+    indexes: list[str] = Field(default_factory=list)
+    docs_examined: int = 0
+    returned: int = 0
+    declared_index: list[str] | None = None
+    problems: list[str] = Field(default_factory=list)
+
+    @property
+    def collection_scan(self) -> bool:
+        """Whether the winning plan scans the whole collection."""
+        return "COLLSCAN" in self.stages
+
+
+class IndexAdvisorReport(BaseModel):
+    """Provides the query shapes explained by the index advisor.
+
+    Attributes:
+        advices (list[IndexAdvice]): The execution plans, one per query shape.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    advices: list[IndexAdvice] = Field(default_factory=list)
+
+    @property
+    def problems(self) -> list[IndexAdvice]:
+        """The query shapes with problems."""
+        return [advice for advice in self.advices if advice.problems]
+
+    @property
+    def has_problems(self) -> bool:
+        """Whether at least one query shape has problems, to gate a CI pipeline on."""
+        return len(self.problems) > 0
+
+    def __str__(self) -> str:
+        """Describe the query shapes with problems, one per line."""
+        return "\n".join(
+            f"{advice.collection}.{advice.command} {advice.shape}: {', '.join(advice.problems)}"
+            for advice in self.problems
+        )
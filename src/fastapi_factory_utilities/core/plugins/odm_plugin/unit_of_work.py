@@ -0,0 +1,274 @@
+"""Provides the unit of work grouping the writes of several repositories in one transaction."""
+
+import asyncio
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Self
+from uuid import UUID
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession, AsyncIOMotorCollection
+from pymongo import DeleteOne, InsertOne, ReplaceOne
+from pymongo.errors import PyMongoError
+
+from .exceptions import OperationError
+
+if TYPE_CHECKING:
+    from .repositories import AbstractRepository
+
+WriteOperation = InsertOne[Any] | ReplaceOne[Any] | DeleteOne
+
+# The session of the unit of work running in the context, with the task which entered it.
+_current_session: ContextVar[tuple[AsyncIOMotorClientSession, "asyncio.Task[Any] | None"] | None] = ContextVar(
+    "odm_unit_of_work_session", default=None
+)
+
+
+def get_unit_of_work_session() -> AsyncIOMotorClientSession | None:
+    """Provide the session of the unit of work entered by the current task, if any.
+
+    The tasks spawned inside a unit of work inherit its context but not its session, which does not support
+    concurrent operations.
+    """
+    current: tuple[AsyncIOMotorClientSession, asyncio.Task[Any] | None] | None = _current_session.get()
+    if current is None or current[1] is not asyncio.current_task():
+        return None
+    return current[0]
+
+
+def in_unit_of_work() -> bool:
+    """Whether a unit of work runs in the current context, including in the tasks spawned inside it."""
+    return _current_session.get() is not None
+
+
+class _CollectionWrites:
+    """The writes registered for one collection, flushed with one bulk_write."""
+
+    def __init__(self, collection: AsyncIOMotorCollection[Any]) -> None:
+        self.collection: AsyncIOMotorCollection[Any] = collection
+        self.operations: list[WriteOperation] = []
+        # Number of replacements, each of which must match a document.
+        self.replacements: int = 0
+
+
+class UnitOfWork:
+    """Share one session between the repositories and commit their writes atomically.
+
+    Inside the context, the repository reads made without a session use the session of the unit of work, except in
+    the tasks spawned inside it. The writes registered with `insert`, `update` and `delete` are kept in memory and
+    flushed at commit, with one bulk_write per collection, in one transaction. Since the writes are replayable, the
+    transaction is retried with a bounded exponential backoff when MongoDB reports a transient error.
+    The write methods of the repositories, which would write at once and outside of the transaction, raise an
+    OperationError inside the context, unless given another session.
+
+    The commit happens when the context exits without error, the writes are discarded otherwise.
+    The updates are guarded by the revision read: if a document was modified since, nothing is committed.
+    Transactions require a replica set or a sharded cluster, use `transactional=False` otherwise.
+
+    ```python
+    async with UnitOfWork(client=depends_odm_client(request)) as unit_of_work:
+        book = await book_repository.get_one_by_id(book_id)
+        book.available = False
+        unit_of_work.update(book_repository, book)
+        unit_of_work.insert(loan_repository, loan)
+    ```
+    """
+
+    def __init__(
+        self,
+        client: AsyncIOMotorClient[Any],
+        transactional: bool = True,
+        max_attempts: int = 3,
+        backoff: float = 0.05,
+        max_backoff: float = 1.0,
+    ) -> None:
+        """Initialize the unit of work.
+
+        Args:
+            client (AsyncIOMotorClient[Any]): The client of the database of the repositories.
+            transactional (bool): Whether the writes are committed in a transaction. Defaults to True.
+            max_attempts (int): The maximum number of attempts of the transaction. Defaults to 3.
+            backoff (float): The seconds waited before the second attempt, doubled for each next one.
+                Defaults to 0.05.
+            max_backoff (float): The maximum seconds waited between attempts. Defaults to 1.
+
+        Raises:
+            ValueError: If the maximum number of attempts is not strictly positive.
+        """
+        if max_attempts <= 0:
+            raise ValueError(f"The maximum number of attempts must be strictly positive, got {max_attempts}.")
+        self._client: AsyncIOMotorClient[Any] = client
+        self._transactional: bool = transactional
+        self._max_attempts: int = max_attempts
+        self._backoff: float = backoff
+        self._max_backoff: float = max_backoff
+        self._session: AsyncIOMotorClientSession | None = None
+        self._token: Token[tuple[AsyncIOMotorClientSession, asyncio.Task[Any] | None] | None] | None = None
+        self._writes: dict[str, _CollectionWrites] = {}
+        # Once committed, the written entities are no longer tracked and their cache entries are dropped.
+        self._written: list[tuple[AbstractRepository[Any, Any], UUID, Any]] = []
+
+    @property
+    def session(self) -> AsyncIOMotorClientSession | None:
+        """The session shared by the repositories, None outside of the context."""
+        return self._session
+
+    @property
+    def pending(self) -> int:
+        """The number of writes registered and not committed yet."""
+        return sum(len(writes.operations) for writes in self._writes.values())
+
+    async def __aenter__(self) -> Self:
+        """Start the session and share it with the repositories."""
+        try:
+            self._session = await self._client.start_session(causal_consistency=True)
+        except PyMongoError as error:
+            raise OperationError(f"Failed to create session: {error}") from error
+        self._token = _current_session.set((self._session, asyncio.current_task()))
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Commit the writes when the context exits without error, then end the session."""
+        assert self._session is not None
+        assert self._token is not None
+        try:
+            if exc_type is None:
+                await self.commit()
+        finally:
+            self.rollback()
+            _current_session.reset(self._token)
+            self._token = None
+            await self._session.end_session()
+            self._session = None
+
+    def _collection_writes(self, repository: "AbstractRepository[Any, Any]") -> _CollectionWrites:
+        collection: AsyncIOMotorCollection[Any] = repository._collection()  # pylint: disable=protected-access
+        writes: _CollectionWrites | None = self._writes.get(collection.name)
+        if writes is None:
+            writes = _CollectionWrites(collection=collection)
+            self._writes[collection.name] = writes
+        return writes
+
+    def insert(self, repository: "AbstractRepository[Any, Any]", entity: Any) -> None:
+        """Register the insertion of the entity.
+
+        Args:
+            repository (AbstractRepository[Any, Any]): The repository of the entity.
+            entity (Any): The entity to insert.
+
+        Raises:
+            ValueError: If the document cannot be created from the entity.
+        """
+        operation, document_id = repository._insert_operation(entity)  # pylint: disable=protected-access
+        self._collection_writes(repository).operations.append(operation)
+        self._written.append((repository, document_id, entity))
+
+    def update(self, repository: "AbstractRepository[Any, Any]", entity: Any) -> None:
+        """Register the replacement of the stored document of the entity.
+
+        Args:
+            repository (AbstractRepository[Any, Any]): The repository of the entity.
+            entity (Any): The entity to update.
+
+        Raises:
+            ValueError: If the document cannot be created from the entity.
+        """
+        operation, document_id = repository._replace_operation(entity)  # pylint: disable=protected-access
+        writes: _CollectionWrites = self._collection_writes(repository)
+        writes.operations.append(operation)
+        writes.replacements += 1
+        self._written.append((repository, document_id, entity))
+
+    def delete(self, repository: "AbstractRepository[Any, Any]", entity_id: UUID) -> None:
+        """Register the deletion of the entity.
+
+        Args:
+            repository (AbstractRepository[Any, Any]): The repository of the entity.
+            entity_id (UUID): The ID of the entity.
+        """
+        operation: DeleteOne = repository._delete_operation(entity_id)  # pylint: disable=protected-access
+        self._collection_writes(repository).operations.append(operation)
+        self._written.append((repository, entity_id, None))
+
+    def rollback(self) -> None:
+        """Discard the writes not committed yet."""
+        self._writes.clear()
+        self._written.clear()
+
+    async def commit(self) -> None:
+        """Flush the writes registered, with one bulk_write per collection.
+
+        The writes are discarded once the commit succeeds or fails.
+
+        Raises:
+            OperationError: If the writes fail, a document was modified since it was read,
+                or the transient errors persist after the last attempt.
+        """
+        if self._session is None:
+            raise OperationError("The unit of work must be entered before committing.")
+        if self.pending == 0:
+            return
+
+        try:
+            if not self._transactional:
+                await self._flush(self._session)
+            else:
+                await self._flush_in_transaction(self._session)
+        finally:
+            # Whether committed or not, the writes may have reached the database (without transaction).
+            for repository, document_id, entity in self._written:
+                if entity is not None:
+                    repository._tracker.forget(entity)  # pylint: disable=protected-access
+                repository._invalidate_cache(document_id)  # pylint: disable=protected-access
+            self.rollback()
+
+    async def _flush_in_transaction(self, session: AsyncIOMotorClientSession) -> None:
+        delay: float = self._backoff
+        for attempt in range(1, self._max_attempts + 1):
+            session.start_transaction()
+            try:
+                await self._flush(session)
+                await self._commit_transaction(session)
+                return
+            except (PyMongoError, OperationError) as error:
+                if session.in_transaction:  # type: ignore[truthy-function]  # A property, typed as a method.
+                    await session.abort_transaction()
+                transient: bool = isinstance(error, PyMongoError) and error.has_error_label("TransientTransactionError")
+                if isinstance(error, OperationError):
+                    raise
+                if not transient:
+                    raise OperationError(f"Failed to commit the unit of work: {error}") from error
+                if attempt == self._max_attempts:
+                    raise OperationError(
+                        f"Failed to commit the unit of work after {attempt} attempts: {error}"
+                    ) from error
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_backoff)
+
+    async def _commit_transaction(self, session: AsyncIOMotorClientSession) -> None:
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                await session.commit_transaction()
+                return
+            except PyMongoError as error:
+                # The outcome of the commit is unknown, committing again is safe.
+                if not error.has_error_label("UnknownTransactionCommitResult") or attempt == self._max_attempts:
+                    raise
+
+    async def _flush(self, session: AsyncIOMotorClientSession) -> None:
+        for writes in self._writes.values():
+            try:
+                result = await writes.collection.bulk_write(writes.operations, ordered=True, session=session)
+            except PyMongoError as error:
+                if session.in_transaction:  # type: ignore[truthy-function]  # A property, typed as a method.
+                    # Let the transaction retry decide on the transient errors.
+                    raise
+                raise OperationError(f"Failed to write {writes.collection.name}: {error}") from error
+            if result.matched_count < writes.replacements:
+                raise OperationError(
+                    f"Failed to write {writes.collection.name}: a document was modified or deleted since it was read."
+                )
@@ -0,0 +1,242 @@
+"""Provides the write-behind insertion of the entities, for the documents not needing per-request write latency."""
+
+import asyncio
+import contextvars
+import time
+from typing import Any, Generic, TypeVar
+
+from opentelemetry import metrics
+from pydantic import BaseModel
+from structlog.stdlib import BoundLogger, get_logger
+
+from .exceptions import ODMPluginBaseException, OperationError
+from .repositories import AbstractRepository
+from .types import BufferedWriterStats, InsertManyResult
+
+EntityGenericType = TypeVar("EntityGenericType", bound=BaseModel)  # pylint: disable=invalid-name
+
+_logger: BoundLogger = get_logger()
+
+_meter: metrics.Meter = metrics.get_meter(__name__)
+_queue_depth: metrics.UpDownCounter = _meter.create_up_down_counter(
+    name="odm.buffered_writer.queue.depth",
+    unit="{entity}",
+    description="The number of entities waiting to be written.",
+)
+_flush_duration: metrics.Histogram = _meter.create_histogram(
+    name="odm.buffered_writer.flush.duration",
+    unit="s",
+    description="The duration of the insert_many calls of the buffered writers.",
+)
+_written: metrics.Counter = _meter.create_counter(
+    name="odm.buffered_writer.written",
+    unit="{entity}",
+    description="The number of entities written by the buffered writers.",
+)
+_failed: metrics.Counter = _meter.create_counter(
+    name="odm.buffered_writer.failed",
+    unit="{entity}",
+    description="The number of entities the buffered writers failed to write.",
+)
+
+
+class BufferedWriter(Generic[EntityGenericType]):
+    """Queue the entities in memory and insert them in batches, in the background.
+
+    A batch is written with one insert_many call once `max_batch_size` entities are queued or `flush_interval`
+    seconds elapsed since the last flush. When `max_queue_size` entities are waiting, `put` waits for room,
+    slowing the producers down to the write throughput of the database.
+
+    The writes are fire-and-forget: the entities failing to be written (e.g. duplicate keys) are logged, counted
+    and dropped, and the entities still queued are lost if the process dies. Use it for audit or event documents,
+    never for the documents the request must read back.
+    """
+
+    def __init__(
+        self,
+        repository: AbstractRepository[Any, EntityGenericType],
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10_000,
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            repository (AbstractRepository[Any, EntityGenericType]): The repository inserting the entities.
+            max_batch_size (int): The maximum number of entities per insert_many call. Defaults to 500.
+            flush_interval (float): The maximum seconds an entity waits before being written. Defaults to 1.
+            max_queue_size (int): The number of queued entities above which `put` waits. Defaults to 10000.
+
+        Raises:
+            ValueError: If a size or the interval is not strictly positive.
+        """
+        if max_batch_size <= 0 or max_queue_size <= 0:
+            raise ValueError(
+                f"The batch and queue sizes must be strictly positive, got {max_batch_size} and {max_queue_size}."
+            )
+        if flush_interval <= 0:
+            raise ValueError(f"The flush interval must be strictly positive, got {flush_interval}.")
+        self._repository: AbstractRepository[Any, EntityGenericType] = repository
+        self._max_batch_size: int = max_batch_size
+        self._flush_interval: float = flush_interval
+        self._queue: asyncio.Queue[EntityGenericType] = asyncio.Queue(maxsize=max_queue_size)
+        self._batch_ready: asyncio.Event = asyncio.Event()
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._closed: bool = False
+        self._attributes: dict[str, str] = {"repository": type(repository).__name__}
+        self._written: int = 0
+        self._failed: int = 0
+        self._flushes: int = 0
+        self._last_flush_duration: float = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flushes are running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of entities waiting to be written."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start the background flushes."""
+        if self.running:
+            return
+        # Run in an empty context, not to inherit the session of a unit of work running in the caller.
+        self._task = asyncio.get_running_loop().create_task(self._run(), context=contextvars.Context())
+
+    async def put(self, entity: EntityGenericType) -> None:
+        """Queue the entity, waiting for room when the queue is full.
+
+        Args:
+            entity (EntityGenericType): The entity to insert.
+
+        Raises:
+            OperationError: If the writer is closed.
+        """
+        if self._closed:
+            raise OperationError("The buffered writer is closed.")
+        await self._queue.put(entity)
+        _queue_depth.add(1, attributes=self._attributes)
+        if self._closed:
+            # Closed while waiting for room: the final flush of close may already have run.
+            await self.flush()
+        elif self._queue.qsize() >= self._max_batch_size:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        """Write every entity queued, one batch after the other."""
+        async with self._flush_lock:
+            while not self._queue.empty():
+                batch: list[EntityGenericType] = [
+                    self._queue.get_nowait() for _ in range(min(self._max_batch_size, self._queue.qsize()))
+                ]
+                _queue_depth.add(-len(batch), attributes=self._attributes)
+                await self._write(batch)
+
+    async def close(self) -> None:
+        """Refuse the next entities, then stop the background flushes and write the entities queued.
+
+        The producers already waiting for room when the writer closes write their entity themselves.
+        """
+        self._closed = True
+        self._batch_ready.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> BufferedWriterStats:
+        """Provide the metrics of the writer.
+
+        Returns:
+            BufferedWriterStats: The metrics.
+        """
+        return BufferedWriterStats(
+            queue_depth=self._queue.qsize(),
+            written=self._written,
+            failed=self._failed,
+            flushes=self._flushes,
+            last_flush_duration=self._last_flush_duration,
+        )
+
+    async def _run(self) -> None:
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    async def _write(self, batch: list[EntityGenericType]) -> None:
+        start: float = time.perf_counter()
+        try:
+            result: InsertManyResult[EntityGenericType] = await self._repository.insert_many(
+                entities=batch, ordered=False
+            )
+        except (Exception, ODMPluginBaseException) as error:  # pylint: disable=broad-except
+            self._record_failures(len(batch))
+            _logger.error(f"Buffered writer failed to write {len(batch)} entities. {error}", **self._attributes)
+        else:
+            self._written += result.inserted_count
+            _written.add(result.inserted_count, attributes=self._attributes)
+            if result.has_errors:
+                self._record_failures(len(result.errors))
+                _logger.error(
+                    f"Buffered writer failed to write {len(result.errors)} entities. {result.errors[0].message}",
+                    **self._attributes,
+                )
+        finally:
+            self._last_flush_duration = time.perf_counter() - start
+            self._flushes += 1
+            _flush_duration.record(self._last_flush_duration, attributes=self._attributes)
+
+    def _record_failures(self, count: int) -> None:
+        self._failed += count
+        _failed.add(count, attributes=self._attributes)
+
+
+class BufferedWriters:
+    """Provide one started BufferedWriter per repository type, for the life of the application."""
+
+    def __init__(self, max_batch_size: int = 500, flush_interval: float = 1.0, max_queue_size: int = 10_000) -> None:
+        """Initialize the writers.
+
+        Args:
+            max_batch_size (int): The maximum number of entities per insert_many call. Defaults to 500.
+            flush_interval (float): The maximum seconds an entity waits before being written. Defaults to 1.
+            max_queue_size (int): The number of queued entities above which `put` waits. Defaults to 10000.
+        """
+        self._max_batch_size: int = max_batch_size
+        self._flush_interval: float = flush_interval
+        self._max_queue_size: int = max_queue_size
+        self._writers: dict[type[AbstractRepository[Any, Any]], BufferedWriter[Any]] = {}
+
+    def get(self, repository: AbstractRepository[Any, EntityGenericType]) -> BufferedWriter[EntityGenericType]:
+        """Get the writer of the repository type, created with the repository on first use.
+
+        Args:
+            repository (AbstractRepository[Any, EntityGenericType]): The repository.
+
+        Returns:
+            BufferedWriter[EntityGenericType]: The writer.
+        """
+        writer: BufferedWriter[Any] | None = self._writers.get(type(repository))
+        if writer is None:
+            writer = BufferedWriter(
+                repository=repository,
+                max_batch_size=self._max_batch_size,
+                flush_interval=self._flush_interval,
+                max_queue_size=self._max_queue_size,
+            )
+            writer.start()
+            self._writers[type(repository)] = writer
+        return writer
+
+    async def close(self) -> None:
+        """Write the entities queued by every writer and stop them."""
+        await asyncio.gather(*(writer.close() for writer in self._writers.values()))
+        self._writers.clear()
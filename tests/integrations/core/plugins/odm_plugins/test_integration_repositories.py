@@ -9,19 +9,29 @@ from beanie import (  # pyright: ignore[reportUnknownVariableType]
     SortDirection,
     init_beanie,
 )
+from bson import Binary
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
+from fastapi_factory_utilities.core.plugins.odm_plugin.aggregation import group, match, sort
+from fastapi_factory_utilities.core.plugins.odm_plugin.cache import EntityCache
 from fastapi_factory_utilities.core.plugins.odm_plugin.documents import BaseDocument
+from fastapi_factory_utilities.core.plugins.odm_plugin.enums import ReadPreferenceEnum
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import (
+    InvalidPaginationCursorError,
+    OperationError,
+)
 from fastapi_factory_utilities.core.plugins.odm_plugin.repositories import (
     AbstractRepository,
 )
+from fastapi_factory_utilities.core.plugins.odm_plugin.unit_of_work import UnitOfWork
 
 
 class DocumentForTest(BaseDocument):
     """Test document class."""
 
     my_field: str = Field(description="My field.")
+    counter: int = Field(default=0, description="Counter field for atomic update tests.")
     category: str | None = Field(default=None, description="Category field for filtering tests.")
 
 
@@ -31,12 +41,27 @@ class EntityForTest(BaseModel):
     id: UUID
     my_field: str
     category: str | None = None
+    counter: int = 0
 
     revision_id: UUID | None = Field(default=None)
     created_at: datetime.datetime | None = Field(default=None)
     updated_at: datetime.datetime | None = Field(default=None)
 
 
+class CategoryTotalForTest(BaseModel):
+    """Test aggregation output class."""
+
+    category: str | None = Field(alias="_id")
+    total: int
+
+
+class SummaryForTest(BaseModel):
+    """Test projection class."""
+
+    id: UUID = Field(alias="_id")
+    my_field: str
+
+
 class RepositoryForTest(AbstractRepository[DocumentForTest, EntityForTest]):
     """Test repository class."""
 
@@ -213,3 +238,497 @@ class TestAbstractRepository:
         assert sorted_entities[0].my_field == "C"
         assert sorted_entities[1].my_field == "B"
         assert sorted_entities[2].my_field == "A"
+
+    @pytest.mark.asyncio()
+    async def test_insert_many(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test insert_many method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entities = [EntityForTest(id=uuid4(), my_field=f"test_{i}") for i in range(5)]
+
+        result = await repository.insert_many(entities=entities, chunk_size=2)
+
+        assert result.inserted_count == 5  # noqa: PLR2004
+        assert not result.has_errors
+        assert [entity.id for entity in result.inserted] == [entity.id for entity in entities]
+        assert all(entity.created_at == entity.updated_at for entity in result.inserted)
+        assert len(await repository.find()) == 5  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_insert_many_with_duplicate_key(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test insert_many method reports duplicate keys without aborting the batch."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        existing: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="existing"))
+        entities = [
+            EntityForTest(id=uuid4(), my_field="test_0"),
+            EntityForTest(id=existing.id, my_field="duplicate"),
+            EntityForTest(id=uuid4(), my_field="test_2"),
+        ]
+
+        result = await repository.insert_many(entities=entities)
+
+        assert result.inserted_count == 2  # noqa: PLR2004
+        assert len(result.errors) == 1
+        assert result.errors[0].index == 1
+        assert result.errors[0].is_duplicate_key
+        assert len(await repository.find()) == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_bulk_update(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test bulk_update method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        inserted = await repository.insert_many(
+            entities=[EntityForTest(id=uuid4(), my_field=f"test_{i}") for i in range(3)]
+        )
+        for entity in inserted.inserted:
+            entity.category = "updated"
+
+        result = await repository.bulk_update(entities=inserted.inserted, chunk_size=2)
+
+        assert result.matched_count == 3  # noqa: PLR2004
+        assert result.modified_count == 3  # noqa: PLR2004
+        assert result.upserted_count == 0
+        assert all(entity.category == "updated" for entity in await repository.find())
+
+    @pytest.mark.asyncio()
+    async def test_bulk_update_with_stale_revision(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test bulk_update method does not overwrite a newer revision."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity_created: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="v1"))
+        await repository.update(entity=entity_created.model_copy(update={"my_field": "v2"}))
+
+        result = await repository.bulk_update(entities=[entity_created.model_copy(update={"my_field": "stale"})])
+
+        assert result.matched_count == 0
+        entity_found = await repository.get_one_by_id(entity_id=entity_created.id)
+        assert entity_found is not None
+        assert entity_found.my_field == "v2"
+
+    @pytest.mark.asyncio()
+    async def test_bulk_upsert(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test bulk_upsert method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        existing: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="existing"))
+        new_entity: EntityForTest = EntityForTest(id=uuid4(), my_field="new")
+
+        result = await repository.bulk_upsert(
+            entities=[existing.model_copy(update={"category": "A"}), new_entity],
+        )
+
+        assert result.matched_count == 1
+        assert result.modified_count == 1
+        assert result.upserted_ids == [new_entity.id]
+        existing_found = await repository.get_one_by_id(entity_id=existing.id)
+        assert existing_found is not None
+        assert existing_found.category == "A"
+        assert existing_found.created_at == existing.created_at
+        assert len(await repository.find()) == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_get_many_by_ids(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test get_many_by_ids method preserves the requested order and reports misses."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        inserted = await repository.insert_many(
+            entities=[EntityForTest(id=uuid4(), my_field=f"test_{i}") for i in range(3)]
+        )
+        missing_id: UUID = uuid4()
+        requested_ids: list[UUID] = [inserted.inserted[2].id, missing_id, inserted.inserted[0].id]
+
+        entities = await repository.get_many_by_ids(entity_ids=requested_ids, chunk_size=2)
+
+        assert list(entities) == requested_ids
+        assert entities[missing_id] is None
+        found = entities[inserted.inserted[2].id]
+        assert found is not None
+        assert found.my_field == "test_2"
+
+    @pytest.mark.asyncio()
+    async def test_stream(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test stream method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        await repository.insert_many(
+            entities=[EntityForTest(id=uuid4(), my_field=f"test_{i}", category="A" if i % 2 else "B") for i in range(5)]
+        )
+
+        streamed: list[EntityForTest] = [
+            entity
+            async for entity in repository.stream(
+                {"category": "A"}, sort=[("my_field", SortDirection.ASCENDING)], batch_size=1
+            )
+        ]
+
+        assert [entity.my_field for entity in streamed] == ["test_1", "test_3"]
+
+    @pytest.mark.asyncio()
+    async def test_paginate(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test paginate method walks all the entities once in sort order."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database, pagination_secret=b"secret")
+        await repository.insert_many(
+            entities=[EntityForTest(id=uuid4(), my_field=f"test_{i}", category="A") for i in range(5)]
+            + [EntityForTest(id=uuid4(), my_field="other", category="B")]
+        )
+        sort_keys: list[tuple[str, SortDirection]] = [("my_field", SortDirection.ASCENDING)]
+
+        walked: list[str] = []
+        cursor: str | None = None
+        pages: int = 0
+        while True:
+            page = await repository.paginate({"category": "A"}, sort_keys=sort_keys, after=cursor, page_size=2)
+            walked.extend(entity.my_field for entity in page.items)
+            pages += 1
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        assert walked == [f"test_{i}" for i in range(5)]
+        assert pages == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_paginate_with_invalid_cursor(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test paginate method rejects an altered cursor."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database, pagination_secret=b"secret")
+        await repository.insert_many(entities=[EntityForTest(id=uuid4(), my_field=f"test_{i}") for i in range(3)])
+        page = await repository.paginate(page_size=1)
+        assert page.next_cursor is not None
+
+        with pytest.raises(InvalidPaginationCursorError):
+            await repository.paginate(after=page.next_cursor[:-2], page_size=1)
+
+    @pytest.mark.asyncio()
+    async def test_update_tracked_entity(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test update method of a loaded entity only changes the modified fields."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity_created: EntityForTest = await repository.insert(
+            entity=EntityForTest(id=uuid4(), my_field="my_field", category="A")
+        )
+        entity_found = await repository.get_one_by_id(entity_id=entity_created.id)
+        assert entity_found is not None
+
+        # Another writer changes a field the entity does not modify
+        await async_motor_database[DocumentForTest.get_collection_name()].update_one(
+            {"_id": Binary.from_uuid(entity_created.id)}, {"$set": {"category": "B"}}
+        )
+        entity_found.my_field = "my_field_updated"
+        entity_updated: EntityForTest = await repository.update(entity=entity_found)
+
+        assert entity_updated.my_field == "my_field_updated"
+        assert entity_updated.revision_id != entity_found.revision_id
+        stored = await repository.get_one_by_id(entity_id=entity_created.id)
+        assert stored is not None
+        assert stored.my_field == "my_field_updated"
+        assert stored.category == "B"
+        assert stored.revision_id == entity_updated.revision_id
+
+    @pytest.mark.asyncio()
+    async def test_update_tracked_entity_with_stale_revision(
+        self, async_motor_database: AsyncIOMotorDatabase[Any]
+    ) -> None:
+        """Test update method of a loaded entity fails when the document was updated since it was read."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity_created: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="v1"))
+        other_repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        await other_repository.update(entity=entity_created.model_copy(update={"my_field": "v2"}))
+
+        entity_created.my_field = "stale"
+        with pytest.raises(OperationError):
+            await repository.update(entity=entity_created)
+
+    @pytest.mark.asyncio()
+    async def test_delete_one_not_found(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test delete_one_by_id method with an unknown ID."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity_created: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="my_field"))
+
+        await repository.delete_one_by_id(entity_id=entity_created.id, raise_if_not_found=True)
+        assert await repository.get_one_by_id(entity_id=entity_created.id) is None
+
+        await repository.delete_one_by_id(entity_id=entity_created.id)
+        with pytest.raises(ValueError):
+            await repository.delete_one_by_id(entity_id=entity_created.id, raise_if_not_found=True)
+
+    @pytest.mark.asyncio()
+    async def test_delete_many(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test delete_many method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        await repository.insert_many(
+            entities=[EntityForTest(id=uuid4(), my_field=f"test_{i}", category="A" if i % 2 else "B") for i in range(4)]
+        )
+
+        deleted_count: int = await repository.delete_many({"category": "A"})
+
+        assert deleted_count == 2  # noqa: PLR2004
+        assert all(entity.category == "B" for entity in await repository.find())
+
+    @pytest.mark.asyncio()
+    async def test_get_one_by_id_with_entity_cache(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test get_one_by_id is served by the entity cache and the writes keep it current."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        entity_cache: EntityCache[EntityForTest] = EntityCache()
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database, entity_cache=entity_cache)
+        entity_created: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="created"))
+
+        entity_cached: EntityForTest | None = await repository.get_one_by_id(entity_id=entity_created.id)
+        assert entity_cached is not None
+        assert entity_cached.my_field == "created"
+        assert entity_cache.stats.hits == 1
+
+        # The cached entity keeps its snapshot, so it can be updated.
+        entity_cached.my_field = "updated"
+        entity_updated: EntityForTest = await repository.update(entity=entity_cached)
+        entity_read: EntityForTest | None = await RepositoryForTest(
+            database=async_motor_database, entity_cache=entity_cache
+        ).get_one_by_id(entity_id=entity_created.id)
+        assert entity_read is not None
+        assert entity_read.my_field == "updated"
+        assert entity_read.revision_id == entity_updated.revision_id
+
+        await repository.delete_one_by_id(entity_id=entity_created.id)
+        assert await repository.get_one_by_id(entity_id=entity_created.id) is None
+        assert entity_cache.stats.misses == 1
+
+    @pytest.mark.asyncio()
+    async def test_aggregate(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test aggregate method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        await repository.insert_many(
+            entities=[EntityForTest(id=uuid4(), my_field=f"test_{i}", category="A" if i % 3 else "B") for i in range(6)]
+        )
+        pipeline = [
+            match({"category": {"$ne": None}}),
+            group("$category", total={"$sum": 1}),
+            sort(("total", SortDirection.DESCENDING)),
+        ]
+
+        totals: list[CategoryTotalForTest] = [
+            total async for total in repository.aggregate(pipeline, output_model=CategoryTotalForTest)
+        ]
+        raw_totals: list[dict[str, Any]] = [total async for total in repository.aggregate(pipeline)]
+
+        assert [(total.category, total.total) for total in totals] == [("A", 4), ("B", 2)]
+        assert raw_totals == [{"_id": "A", "total": 4}, {"_id": "B", "total": 2}]
+        with pytest.raises(ValueError):
+            _ = [total async for total in repository.aggregate([match({})], output_model=CategoryTotalForTest)]
+
+    @pytest.mark.asyncio()
+    async def test_aggregate_by_uuid(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test aggregate method with a UUID in a stage."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entities: list[EntityForTest] = [
+            EntityForTest(id=uuid4(), my_field=f"test_{i}", category="A" if i % 2 else "B") for i in range(4)
+        ]
+        await repository.insert_many(entities=entities)
+
+        totals: list[CategoryTotalForTest] = [
+            total
+            async for total in repository.aggregate(
+                [match({"_id": {"$in": [entities[0].id, entities[1].id]}}), group("$category", total={"$sum": 1})],
+                output_model=CategoryTotalForTest,
+            )
+        ]
+
+        assert sorted((total.category, total.total) for total in totals) == [("A", 1), ("B", 1)]
+
+    @pytest.mark.asyncio()
+    async def test_find_and_stream_with_projection_model(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test find and stream methods with a projection model."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity: EntityForTest = await repository.insert(
+            entity=EntityForTest(id=uuid4(), my_field="projected", category="A")
+        )
+
+        summaries: list[SummaryForTest] = await repository.find({"category": "A"}, projection_model=SummaryForTest)
+        streamed: list[SummaryForTest] = [
+            summary async for summary in repository.stream({"category": "A"}, projection_model=SummaryForTest)
+        ]
+
+        assert summaries == [SummaryForTest(_id=entity.id, my_field="projected")]
+        assert streamed == summaries
+
+    @pytest.mark.asyncio()
+    async def test_reads_with_read_preference(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test the reads routed with a read preference, served by the primary of a single node."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        entity_cache: EntityCache[EntityForTest] = EntityCache()
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database, entity_cache=entity_cache)
+        entity: EntityForTest = await repository.insert(
+            entity=EntityForTest(id=uuid4(), my_field="routed", category="A")
+        )
+        entity_cache.clear()
+
+        entity_read: EntityForTest | None = await repository.get_one_by_id(
+            entity_id=entity.id, read_preference=ReadPreferenceEnum.SECONDARY_PREFERRED
+        )
+        found: list[EntityForTest] = await repository.find(
+            {"category": "A"}, sort=[("my_field", SortDirection.ASCENDING)], read_preference=ReadPreferenceEnum.NEAREST
+        )
+        summaries: list[SummaryForTest] = await repository.find(
+            {"category": "A"}, projection_model=SummaryForTest, read_preference=ReadPreferenceEnum.NEAREST
+        )
+        streamed: list[EntityForTest] = [
+            streamed_entity
+            async for streamed_entity in repository.stream(
+                {"category": "A"}, read_preference=ReadPreferenceEnum.SECONDARY_PREFERRED
+            )
+        ]
+
+        assert entity_read == entity
+        # The reads from the secondaries do not fill the cache.
+        assert entity_cache.stats.size == 0
+        assert found == [entity]
+        assert streamed == [entity]
+        assert summaries == [SummaryForTest(_id=entity.id, my_field="routed")]
+
+    @pytest.mark.asyncio()
+    async def test_find_raw_json(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test the raw reads produce the JSON of the entities found."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        await repository.insert_many(
+            entities=[EntityForTest(id=uuid4(), my_field=f"raw_{i}", category="A") for i in range(3)]
+        )
+        entities: list[EntityForTest] = await repository.find(
+            {"category": "A"}, sort=[("my_field", SortDirection.ASCENDING)]
+        )
+
+        content: bytes = await repository.find_raw_json(
+            {"category": "A"}, sort=[("my_field", SortDirection.ASCENDING)], rename={"_id": "id"}
+        )
+        summaries: list[bytes] = [
+            summary
+            async for summary in repository.stream_raw_json(
+                {"category": "A"}, projection_model=SummaryForTest, sort=[("my_field", SortDirection.ASCENDING)]
+            )
+        ]
+
+        assert TypeAdapter(list[EntityForTest]).validate_json(content) == entities
+        assert [SummaryForTest.model_validate_json(summary) for summary in summaries] == [
+            SummaryForTest(_id=entity.id, my_field=entity.my_field) for entity in entities
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_count_and_exists(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test count, estimated_count and exists methods."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entities: list[EntityForTest] = [
+            EntityForTest(id=uuid4(), my_field=f"test_{i}", category="A" if i % 2 else "B") for i in range(5)
+        ]
+        await repository.insert_many(entities=entities)
+
+        assert await repository.count() == 5  # noqa: PLR2004
+        assert await repository.count({"category": "A"}) == 2  # noqa: PLR2004
+        assert await repository.count({"_id": {"$in": [entities[0].id, entities[1].id]}}) == 2  # noqa: PLR2004
+        assert await repository.estimated_count() == 5  # noqa: PLR2004
+        assert await repository.exists({"category": "B"})
+        assert not await repository.exists({"category": "C"})
+        assert await repository.exists({"_id": entities[0].id})
+        assert not await repository.exists({"_id": uuid4()})
+
+    @pytest.mark.asyncio()
+    async def test_find_one_and_update(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test find_one_and_update method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="before"))
+
+        entity_before: EntityForTest | None = await repository.find_one_and_update(
+            {"_id": entity.id}, {"$set": {"my_field": "after"}}, return_updated=False
+        )
+        entity_after: EntityForTest | None = await repository.find_one_and_update(
+            {"_id": entity.id}, {"$set": {"category": "A"}}
+        )
+        entity_upserted: EntityForTest | None = await repository.find_one_and_update(
+            {"my_field": "upserted"}, {"$set": {"category": "B"}}, upsert=True
+        )
+
+        assert entity_before is not None and entity_before.my_field == "before"
+        assert entity_after is not None
+        assert (entity_after.my_field, entity_after.category) == ("after", "A")
+        assert entity_after.revision_id not in (entity.revision_id, entity_before.revision_id)
+        assert entity_upserted is not None
+        assert isinstance(entity_upserted.id, UUID)
+        assert entity_upserted.created_at is not None
+        assert await repository.find_one_and_update({"my_field": "unknown"}, {"$set": {"category": "C"}}) is None
+        with pytest.raises(ValueError):
+            await repository.find_one_and_update({"_id": entity.id}, {"my_field": "replacement"})
+
+    @pytest.mark.asyncio()
+    async def test_upsert_one(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test upsert_one method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity_id: UUID = uuid4()
+
+        entity_created: EntityForTest = await repository.upsert_one(entity=EntityForTest(id=entity_id, my_field="v1"))
+        entity_updated: EntityForTest = await repository.upsert_one(entity=EntityForTest(id=entity_id, my_field="v2"))
+
+        assert entity_updated.id == entity_id
+        assert entity_updated.my_field == "v2"
+        assert entity_updated.created_at == entity_created.created_at
+        assert await repository.count() == 1
+
+    @pytest.mark.asyncio()
+    async def test_increment(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test increment method."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        entity: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="counter"))
+
+        await repository.increment(entity_id=entity.id, field="counter")
+        entity_incremented: EntityForTest | None = await repository.increment(
+            entity_id=entity.id, field="counter", by=4
+        )
+
+        assert entity_incremented is not None
+        assert entity_incremented.counter == 5  # noqa: PLR2004
+        assert await repository.increment(entity_id=uuid4(), field="counter") is None
+        with pytest.raises(ValueError):
+            await repository.increment(entity_id=entity.id, field="unknown")
+
+    @pytest.mark.asyncio()
+    async def test_unit_of_work(self, async_motor_database: AsyncIOMotorDatabase[Any]) -> None:
+        """Test the writes registered in a unit of work are flushed on exit."""
+        await init_beanie(database=async_motor_database, document_models=[DocumentForTest])
+        repository: RepositoryForTest = RepositoryForTest(database=async_motor_database)
+        updated: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="updated"))
+        deleted: EntityForTest = await repository.insert(entity=EntityForTest(id=uuid4(), my_field="deleted"))
+        inserted: EntityForTest = EntityForTest(id=uuid4(), my_field="inserted")
+
+        # The test database is a standalone server, without transactions.
+        async with UnitOfWork(client=async_motor_database.client, transactional=False) as unit_of_work:
+            entity_read: EntityForTest | None = await repository.get_one_by_id(entity_id=updated.id)
+            assert entity_read is not None
+            entity_read.category = "A"
+            unit_of_work.update(repository, entity_read)
+            unit_of_work.insert(repository, inserted)
+            unit_of_work.delete(repository, deleted.id)
+            assert unit_of_work.pending == 3  # noqa: PLR2004
+            assert await repository.exists({"_id": inserted.id}) is False
+
+        assert {entity.my_field: entity.category for entity in await repository.find()} == {
+            "updated": "A",
+            "inserted": None,
+        }
+        assert await repository.exists({"_id": inserted.id})
+        assert not await repository.exists({"_id": deleted.id})
+
+        # The entity read before the commit holds a stale revision.
+        async with UnitOfWork(client=async_motor_database.client, transactional=False) as unit_of_work:
+            with pytest.raises(OperationError):
+                unit_of_work.update(repository, entity_read)
+                await unit_of_work.commit()
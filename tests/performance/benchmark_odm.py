@@ -0,0 +1,164 @@
+"""Provides micro-benchmarks for the ODM plugin repositories.
+
+Run against a MongoDB server with:
+    MONGODB_URI=mongodb://localhost:27017 python tests/performance/benchmark_odm.py
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID, uuid4
+
+import bson
+from beanie import init_beanie  # pyright: ignore[reportUnknownVariableType]
+from beanie.odm.utils.parsing import parse_obj
+from bson.binary import UuidRepresentation
+from bson.raw_bson import RawBSONDocument
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pydantic import BaseModel, Field, TypeAdapter
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.converters import (
+    EntityDocumentConverter,
+    raw_document_to_json,
+)
+from fastapi_factory_utilities.core.plugins.odm_plugin.documents import BaseDocument
+from fastapi_factory_utilities.core.plugins.odm_plugin.enums import SessionPolicyEnum
+from fastapi_factory_utilities.core.plugins.odm_plugin.repositories import AbstractRepository
+
+ITERATIONS: int = int(os.environ.get("BENCHMARK_ITERATIONS", "2000"))
+
+
+class BenchmarkDocument(BaseDocument):
+    """Document used by the benchmarks."""
+
+    name: str
+    tags: list[str] = Field(default_factory=list)
+    score: float = 0.0
+
+
+class BenchmarkEntity(BaseModel):
+    """Entity used by the benchmarks."""
+
+    id: UUID
+    name: str
+    tags: list[str] = Field(default_factory=list)
+    score: float = 0.0
+    revision_id: UUID | None = None
+
+
+class BenchmarkRepository(AbstractRepository[BenchmarkDocument, BenchmarkEntity]):
+    """Repository used by the benchmarks."""
+
+
+async def measure(name: str, call: Callable[[], Awaitable[Any]], iterations: int = ITERATIONS) -> None:
+    """Run the call sequentially and print its latency distribution."""
+    durations: list[float] = []
+    for _ in range(iterations):
+        start: float = time.perf_counter()
+        await call()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    print(
+        f"{name:<48} mean={statistics.fmean(durations) * 1e6:9.1f}us "
+        f"p50={durations[len(durations) // 2] * 1e6:9.1f}us "
+        f"p99={durations[int(len(durations) * 0.99)] * 1e6:9.1f}us"
+    )
+
+
+def measure_cpu(name: str, call: Callable[[], Any], iterations: int = ITERATIONS * 10) -> None:
+    """Run the call in a tight loop and print its mean duration."""
+    start: float = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    print(f"{name:<48} mean={(time.perf_counter() - start) / iterations * 1e6:9.2f}us")
+
+
+async def benchmark_conversion(database: AsyncIOMotorDatabase[Any]) -> None:  # pylint: disable=unused-argument
+    """Compare the document to entity conversion paths."""
+    document = BenchmarkDocument(name="conversion", tags=[f"tag_{i}" for i in range(20)], score=1.5)
+    converter = EntityDocumentConverter(document_type=BenchmarkDocument, entity_type=BenchmarkEntity)
+    trusted_converter = EntityDocumentConverter(
+        document_type=BenchmarkDocument, entity_type=BenchmarkEntity, trusted=True
+    )
+    measure_cpu("to entity: Entity(**document.model_dump())", lambda: BenchmarkEntity(**document.model_dump()))
+    measure_cpu("to entity: converter", lambda: converter.to_entity(document))
+    measure_cpu("to entity: converter (trusted)", lambda: trusted_converter.to_entity(document))
+    entity: BenchmarkEntity = converter.to_entity(document)
+    measure_cpu("to document: Document(**entity.model_dump())", lambda: BenchmarkDocument(**entity.model_dump()))
+    measure_cpu("to document: converter", lambda: converter.to_document(entity))
+
+
+async def benchmark_session_policies(database: AsyncIOMotorDatabase[Any]) -> None:
+    """Compare get_one_by_id with and without the start of a client session."""
+    repository = BenchmarkRepository(database=database)
+    entity: BenchmarkEntity = await repository.insert(entity=BenchmarkEntity(id=uuid4(), name="session"))
+    for session_policy in SessionPolicyEnum:
+        await measure(
+            f"get_one_by_id session_policy={session_policy.value}",
+            lambda session_policy=session_policy: repository.get_one_by_id(  # type: ignore[misc]
+                entity_id=entity.id, session_policy=session_policy
+            ),
+        )
+
+
+async def benchmark_raw_reads(database: AsyncIOMotorDatabase[Any]) -> None:
+    """Compare the JSON of a page of entities with the raw BSON fast path."""
+    repository = BenchmarkRepository(database=database)
+    await repository.insert_many(
+        entities=[
+            BenchmarkEntity(id=uuid4(), name=f"raw_{i}", tags=[f"tag_{j}" for j in range(10)], score=i)
+            for i in range(100)
+        ]
+    )
+    entities_adapter: TypeAdapter[list[BenchmarkEntity]] = TypeAdapter(list[BenchmarkEntity])
+
+    document = BenchmarkDocument(name="raw", tags=[f"tag_{i}" for i in range(10)], score=1.5)
+    # The same document as read by the driver, decoded as beanie does and raw.
+    raw_bytes: bytes = bson.encode(
+        document.model_dump(by_alias=True),
+        codec_options=bson.CodecOptions(uuid_representation=UuidRepresentation.STANDARD),
+    )
+    stored: dict[str, Any] = bson.decode(
+        raw_bytes, codec_options=bson.CodecOptions(tz_aware=True, uuid_representation=UuidRepresentation.STANDARD)
+    )
+    raw = RawBSONDocument(raw_bytes)
+    converter = EntityDocumentConverter(document_type=BenchmarkDocument, entity_type=BenchmarkEntity)
+    measure_cpu(
+        "to json: parse + entity + model_dump_json",
+        lambda: converter.to_entity(parse_obj(BenchmarkDocument, stored)).model_dump_json(),  # type: ignore[arg-type]
+    )
+    measure_cpu("to json: raw_document_to_json", lambda: raw_document_to_json(raw, rename={"_id": "id"}))
+
+    async def find_as_json() -> bytes:
+        return entities_adapter.dump_json(await repository.find({"name": {"$regex": "^raw_"}}))
+
+    await measure("find 100 + dump_json", find_as_json, iterations=ITERATIONS // 10)
+    await measure(
+        "find_raw_json 100",
+        lambda: repository.find_raw_json({"name": {"$regex": "^raw_"}}, rename={"_id": "id"}),
+        iterations=ITERATIONS // 10,
+    )
+
+
+async def main() -> None:
+    """Run the benchmarks against a temporary database."""
+    client: AsyncIOMotorClient[Any] = AsyncIOMotorClient(
+        host=os.environ.get("MONGODB_URI", "mongodb://localhost:27017"), tz_aware=True
+    )
+    database_name: str = f"benchmark_{uuid4().hex}"
+    database: AsyncIOMotorDatabase[Any] = client[database_name]
+    await init_beanie(database=database, document_models=[BenchmarkDocument])
+    try:
+        await benchmark_conversion(database)
+        await benchmark_session_policies(database)
+        await benchmark_raw_reads(database)
+    finally:
+        await client.drop_database(database_name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""Provides the fixtures shared by the unit tests of the ODM plugin."""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from typing import Any
+from uuid import UUID
+
+import pytest
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import OperationError
+from fastapi_factory_utilities.core.plugins.odm_plugin.types import BulkWriteItemError, InsertManyResult
+
+
+class RepositoryForTest:
+    """Fake repository keeping the entities in memory and recording the batches of its calls."""
+
+    def __init__(self, stored: Iterable[Any] = (), fail: bool = False, duplicates: Iterable[UUID] = ()) -> None:
+        """Initialize the repository.
+
+        Args:
+            stored (Iterable[Any]): The entities stored.
+            fail (bool): Whether the calls fail.
+            duplicates (Iterable[UUID]): The IDs refused as duplicates by insert_many.
+        """
+        self.stored: dict[UUID, Any] = {entity.id: entity for entity in stored}
+        self.fail: bool = fail
+        self.duplicates: set[UUID] = set(duplicates)
+        # The entities inserted, or the IDs requested, by each call.
+        self.batches: list[list[Any]] = []
+        self._recorded: asyncio.Event = asyncio.Event()
+
+    async def insert_many(self, entities: list[Any], ordered: bool) -> InsertManyResult[Any]:
+        """Insert the entities, refusing the duplicates."""
+        assert not ordered
+        await asyncio.sleep(0)
+        if self.fail:
+            raise OperationError("Failed to insert documents.")
+        self._record(entities)
+        inserted: list[Any] = [entity for entity in entities if entity.id not in self.duplicates]
+        self.stored.update((entity.id, entity) for entity in inserted)
+        return InsertManyResult(
+            inserted=inserted,
+            errors=[
+                BulkWriteItemError(index=index, code=11000, message="duplicate key")
+                for index, entity in enumerate(entities)
+                if entity.id in self.duplicates
+            ],
+        )
+
+    async def get_many_by_ids(self, entity_ids: list[UUID]) -> dict[UUID, Any | None]:
+        """Provide the stored entities."""
+        self._record(entity_ids)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise OperationError("Failed to get documents.")
+        # A copy per call, as the documents read by the repositories.
+        return {
+            entity_id: self.stored[entity_id].model_copy() if entity_id in self.stored else None
+            for entity_id in entity_ids
+        }
+
+    async def wait_for_batches(self, count: int) -> None:
+        """Wait until the calls recorded at least `count` batches."""
+        while len(self.batches) < count:
+            self._recorded.clear()
+            await self._recorded.wait()
+
+    def _record(self, batch: list[Any]) -> None:
+        self.batches.append(batch)
+        self._recorded.set()
+
+
+@pytest.fixture(name="build_repository")
+def fixture_build_repository() -> Callable[..., Any]:
+    """Provide the factory of the fake repositories, standing for the repositories of the writers and loaders."""
+    return RepositoryForTest
@@ -0,0 +1,198 @@
+"""Provides unit tests for the advisor module."""
+
+from collections.abc import Mapping
+from types import SimpleNamespace
+from typing import Any, ClassVar
+
+import pytest
+from beanie import Indexed
+from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.advisor import IndexAdvisor, declared_indexes
+
+
+def explain_output(stage: Mapping[str, Any], docs_examined: int, returned: int) -> dict[str, Any]:
+    """Build the output of an explain with executionStats."""
+    return {
+        "queryPlanner": {"winningPlan": stage},
+        "executionStats": {"totalDocsExamined": docs_examined, "nReturned": returned},
+        "ok": 1,
+    }
+
+
+COLLECTION_SCAN: dict[str, Any] = explain_output({"stage": "COLLSCAN"}, docs_examined=1000, returned=1)
+INDEX_SCAN: dict[str, Any] = explain_output(
+    {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "isbn_1"}}, docs_examined=1, returned=1
+)
+
+
+class DatabaseForTest:
+    """Fake database answering the explains with a canned output."""
+
+    def __init__(self) -> None:
+        """Initialize the database."""
+        self.output: dict[str, Any] | Exception = COLLECTION_SCAN
+        self.commands: list[dict[str, Any]] = []
+
+    async def command(self, command: dict[str, Any]) -> dict[str, Any]:
+        """Explain the command."""
+        self.commands.append(command)
+        if isinstance(self.output, Exception):
+            raise self.output
+        return self.output
+
+
+class BookDocumentForTest(BaseModel):
+    """Fake document model, with an Indexed field and an index in its settings."""
+
+    isbn: Indexed(str)  # type: ignore[valid-type]
+    title: str
+    author: str
+    year: int
+
+    database: ClassVar[DatabaseForTest] = DatabaseForTest()
+    settings: ClassVar[SimpleNamespace] = SimpleNamespace(
+        indexes=[IndexModel([("author", ASCENDING), ("year", ASCENDING)])]
+    )
+
+    @classmethod
+    def get_motor_collection(cls) -> SimpleNamespace:
+        """Provide the collection."""
+        return SimpleNamespace(name="books", database=cls.database)
+
+    @classmethod
+    def get_settings(cls) -> SimpleNamespace:
+        """Provide the settings."""
+        return cls.settings
+
+
+@pytest.fixture(name="database")
+def fixture_database() -> DatabaseForTest:
+    """Reset the fake database."""
+    BookDocumentForTest.database = DatabaseForTest()
+    return BookDocumentForTest.database
+
+
+async def observe(advisor: IndexAdvisor, command: str, spec: dict[str, Any]) -> None:
+    """Observe a query on the fake document model."""
+    await advisor.observe(BookDocumentForTest, command, spec)  # type: ignore[arg-type]
+
+
+class TestIndexAdvisor:
+    """Unit tests for the IndexAdvisor class."""
+
+    def test_declared_indexes(self) -> None:
+        """Test the indexes are read from the Indexed annotations and the settings."""
+        assert declared_indexes(BookDocumentForTest) == [  # type: ignore[arg-type]
+            ["_id"],
+            ["isbn"],
+            ["author", "year"],
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_collection_scan_without_declared_index(self, database: DatabaseForTest) -> None:
+        """Test a collection scan on fields without index is flagged as a missing index."""
+        advisor = IndexAdvisor()
+
+        await observe(advisor, "find", {"filter": {"title": "Dune"}})
+
+        assert database.commands == [
+            {"explain": {"find": "books", "filter": {"title": "Dune"}}, "verbosity": "executionStats"}
+        ]
+        report = advisor.report()
+        assert report.has_problems
+        advice = report.advices[0]
+        assert advice.collection_scan
+        assert advice.shape == {"filter": {"title": "?"}}
+        assert advice.declared_index is None
+        assert "no declared index" in advice.problems[0]
+        assert "1000 documents examined for 1 returned" in advice.problems
+
+    @pytest.mark.asyncio()
+    async def test_collection_scan_with_declared_index(self, database: DatabaseForTest) -> None:
+        """Test a collection scan on an indexed field is flagged as an index not used."""
+        advisor = IndexAdvisor()
+
+        await observe(advisor, "aggregate", {"pipeline": [{"$match": {"author": "Herbert"}}], "cursor": {}})
+
+        assert database.commands[0]["explain"]["aggregate"] == "books"
+        advice = advisor.report().advices[0]
+        assert advice.declared_index == ["author", "year"]
+        assert "although the index ['author', 'year'] is declared" in advice.problems[0]
+
+    @pytest.mark.asyncio()
+    async def test_index_scan_passes(self, database: DatabaseForTest) -> None:
+        """Test a query served by an index has no problem."""
+        database.output = INDEX_SCAN
+        advisor = IndexAdvisor()
+
+        await observe(advisor, "find", {"filter": {"isbn": "0441013597"}, "limit": 1})
+
+        report = advisor.report()
+        assert not report.has_problems
+        assert report.advices[0].stages == ["FETCH", "IXSCAN"]
+        assert report.advices[0].indexes == ["isbn_1"]
+        assert str(report) == ""
+
+    @pytest.mark.asyncio()
+    async def test_examined_ratio(self, database: DatabaseForTest) -> None:
+        """Test an index scan examining too many documents per document returned is flagged."""
+        database.output = explain_output(
+            {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "author_1_year_1"}},
+            docs_examined=500,
+            returned=10,
+        )
+
+        await observe(strict := IndexAdvisor(), "find", {"filter": {"author": "Herbert", "title": "Dune"}})
+        await observe(lenient := IndexAdvisor(max_examined_ratio=100), "find", {"filter": {"author": "Herbert"}})
+
+        assert strict.report().problems[0].problems == ["500 documents examined for 10 returned"]
+        assert not lenient.report().has_problems
+
+    @pytest.mark.asyncio()
+    async def test_each_shape_is_explained_once(self, database: DatabaseForTest) -> None:
+        """Test the queries differing by their values only are explained once, in the background if asked."""
+        advisor = IndexAdvisor(background=True)
+
+        await observe(advisor, "find", {"filter": {"title": "Dune"}})
+        await observe(advisor, "find", {"filter": {"title": "Emma"}})
+        await observe(advisor, "count", {"query": {"title": "Dune"}})
+        await advisor.wait()
+
+        assert len(database.commands) == 2  # noqa: PLR2004
+        assert len(advisor.report().advices) == 2  # noqa: PLR2004
+
+        advisor.clear()
+        await observe(advisor, "find", {"filter": {"title": "Dune"}})
+        await advisor.wait()
+        assert len(database.commands) == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_failed_explain_is_retried(self, database: DatabaseForTest) -> None:
+        """Test a failed explain does not fail the query and is explained again next time."""
+        database.output = OperationFailure("explain failed")
+        advisor = IndexAdvisor()
+
+        await observe(advisor, "find", {"filter": {"title": "Dune"}})
+        assert advisor.report().advices == []
+
+        database.output = INDEX_SCAN
+        await observe(advisor, "find", {"filter": {"title": "Dune"}})
+        assert len(advisor.report().advices) == 1
+
+    @pytest.mark.asyncio()
+    async def test_unexpected_explain_is_retried(self, database: DatabaseForTest) -> None:
+        """Test an explain output the advisor cannot read does not fail the background task and is explained again."""
+        database.output = {"queryPlanner": "unexpected", "ok": 1}
+        advisor = IndexAdvisor(background=True)
+
+        await observe(advisor, "find", {"filter": {"title": "Dune"}})
+        await advisor.wait()
+        assert advisor.report().advices == []
+
+        database.output = INDEX_SCAN
+        await observe(advisor, "find", {"filter": {"title": "Dune"}})
+        await advisor.wait()
+        assert len(advisor.report().advices) == 1
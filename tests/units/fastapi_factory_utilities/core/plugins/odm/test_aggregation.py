@@ -0,0 +1,56 @@
+"""Provides unit tests for the aggregation module."""
+
+import pytest
+from beanie import SortDirection
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.aggregation import (
+    count_stage,
+    facet,
+    group,
+    limit,
+    lookup,
+    match,
+    project,
+    skip,
+    sort,
+    unwind,
+)
+
+
+class TestStages:
+    """Unit tests for the stage builders."""
+
+    def test_simple_stages(self) -> None:
+        """Test the stages wrapping their argument."""
+        assert match({"a": 1}) == {"$match": {"a": 1}}
+        assert skip(5) == {"$skip": 5}
+        assert limit(10) == {"$limit": 10}
+        assert project(a=1, b="$c") == {"$project": {"a": 1, "b": "$c"}}
+        assert count_stage("total") == {"$count": "total"}
+
+    def test_group(self) -> None:
+        """Test the group key and accumulators."""
+        assert group("$category", total={"$sum": 1}) == {"$group": {"_id": "$category", "total": {"$sum": 1}}}
+        assert group(None) == {"$group": {"_id": None}}
+
+    def test_sort(self) -> None:
+        """Test the sort keys keep their priority."""
+        stage = sort(("a", SortDirection.DESCENDING), ("_id", SortDirection.ASCENDING))
+
+        assert stage == {"$sort": {"a": -1, "_id": 1}}
+        assert list(stage["$sort"]) == ["a", "_id"]
+        with pytest.raises(ValueError):
+            sort()
+
+    def test_unwind_and_lookup(self) -> None:
+        """Test the stages with renamed options."""
+        assert unwind("$tags") == {"$unwind": {"path": "$tags", "preserveNullAndEmptyArrays": False}}
+        assert lookup("authors", "author_id", "_id", "author") == {
+            "$lookup": {"from": "authors", "localField": "author_id", "foreignField": "_id", "as": "author"}
+        }
+
+    def test_facet(self) -> None:
+        """Test the pipelines of a facet."""
+        assert facet(total=[count_stage("n")], first=[limit(1)]) == {
+            "$facet": {"total": [{"$count": "n"}], "first": [{"$limit": 1}]}
+        }
@@ -0,0 +1,34 @@
+"""Provides unit tests for the builder module."""
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.builder import ODMBuilder
+from fastapi_factory_utilities.core.plugins.odm_plugin.configs import ODMConfig
+from fastapi_factory_utilities.core.plugins.odm_plugin.enums import CompressorEnum, ReadPreferenceEnum
+
+
+class TestClientOptions:
+    """Unit tests for the client options built from the configuration."""
+
+    def test_unset_options_are_left_to_the_connection_string(self) -> None:
+        """Test no option is passed when the configuration leaves them unset."""
+        builder = ODMBuilder(application=None, odm_config=ODMConfig(uri="mongodb://localhost"))  # type: ignore[arg-type]
+
+        assert builder._client_options() == {}  # pylint: disable=protected-access
+
+    def test_options_from_the_environment(self) -> None:
+        """Test the options injected as strings are parsed and passed to the client."""
+        config = ODMConfig(
+            uri="mongodb://localhost",
+            max_pool_size="20",  # type: ignore[arg-type]
+            wait_queue_timeout_ms="500",  # type: ignore[arg-type]
+            compressors="zstd, zlib",  # type: ignore[arg-type]
+            read_preference="secondaryPreferred",  # type: ignore[arg-type]
+        )
+        builder = ODMBuilder(application=None, odm_config=config)  # type: ignore[arg-type]
+
+        assert config.compressors == [CompressorEnum.ZSTD, CompressorEnum.ZLIB]
+        assert builder._client_options() == {  # pylint: disable=protected-access
+            "maxPoolSize": 20,
+            "waitQueueTimeoutMS": 500,
+            "compressors": "zstd,zlib",
+            "readPreference": ReadPreferenceEnum.SECONDARY_PREFERRED,
+        }
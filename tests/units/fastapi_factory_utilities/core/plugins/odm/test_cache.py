@@ -0,0 +1,163 @@
+"""Provides unit tests for the cache module."""
+
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import BaseModel
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.cache import EntityCache
+
+
+class EntityForTest(BaseModel):
+    """Test entity class."""
+
+    id: UUID
+    tags: list[str]
+    revision_id: UUID | None = None
+
+
+class ClockForTest:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        """Provide the current time."""
+        return self.now
+
+
+class TestEntityCache:
+    """Unit tests for the EntityCache class."""
+
+    def test_invalid_settings(self) -> None:
+        """Test the size and the time to live must be strictly positive."""
+        with pytest.raises(ValueError):
+            EntityCache(max_size=0)
+        with pytest.raises(ValueError):
+            EntityCache(ttl=0)
+
+    def test_hit_and_miss(self) -> None:
+        """Test the lookups are counted and served with copies."""
+        cache: EntityCache[EntityForTest] = EntityCache()
+        entity = EntityForTest(id=uuid4(), tags=["a"])
+
+        assert cache.get(entity.id) is None
+        cache.refresh(entity.id, entity, {"_id": entity.id})
+        entity.tags.append("changed")
+
+        cached = cache.get(entity.id)
+        assert cached is not None
+        cached_entity, snapshot = cached
+        assert cached_entity.tags == ["a"]
+        assert snapshot == {"_id": entity.id}
+        cached_entity.tags.append("changed")
+        cached_again = cache.get(entity.id)
+        assert cached_again is not None
+        assert cached_again[0].tags == ["a"]
+
+        stats = cache.stats
+        assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+        assert stats.hit_ratio == pytest.approx(2 / 3)
+
+    def test_ttl(self) -> None:
+        """Test the entities expire."""
+        clock = ClockForTest()
+        cache: EntityCache[EntityForTest] = EntityCache(ttl=10, clock=clock)
+        entity = EntityForTest(id=uuid4(), tags=[])
+        cache.refresh(entity.id, entity)
+
+        clock.now = 9.9
+        assert cache.get(entity.id) is not None
+        clock.now = 10
+        assert cache.get(entity.id) is None
+        assert cache.stats.evictions == 1
+        assert len(cache) == 0
+
+    def test_lru_eviction(self) -> None:
+        """Test the least recently used entity is evicted first."""
+        cache: EntityCache[EntityForTest] = EntityCache(max_size=2)
+        first, second, third = (EntityForTest(id=uuid4(), tags=[]) for _ in range(3))
+        cache.refresh(first.id, first)
+        cache.refresh(second.id, second)
+        cache.get(first.id)
+        cache.refresh(third.id, third)
+
+        assert cache.get(second.id) is None
+        assert cache.get(first.id) is not None
+        assert cache.get(third.id) is not None
+        assert cache.stats.evictions == 1
+
+    def test_fill(self) -> None:
+        """Test a read fills the cache."""
+        cache: EntityCache[EntityForTest] = EntityCache()
+        entity = EntityForTest(id=uuid4(), tags=[])
+
+        cache.start_fill(entity.id)
+        cache.finish_fill(entity.id, entity)
+
+        assert cache.get(entity.id) is not None
+
+    def test_fill_not_found(self) -> None:
+        """Test the missing entities are not cached."""
+        cache: EntityCache[EntityForTest] = EntityCache()
+        entity_id: UUID = uuid4()
+
+        cache.start_fill(entity_id)
+        cache.finish_fill(entity_id, None)
+
+        assert len(cache) == 0
+
+    def test_fill_started_before_write_is_dropped(self) -> None:
+        """Test a read racing with a write never replaces the revision written."""
+        cache: EntityCache[EntityForTest] = EntityCache()
+        stored = EntityForTest(id=uuid4(), tags=["old"])
+        written = EntityForTest(id=stored.id, tags=["new"])
+
+        cache.start_fill(stored.id)
+        cache.refresh(written.id, written)
+        cache.finish_fill(stored.id, stored)
+
+        cached = cache.get(stored.id)
+        assert cached is not None
+        assert cached[0].tags == ["new"]
+
+        # Once no read is in flight, the reads fill the cache again.
+        cache.invalidate(stored.id)
+        cache.start_fill(stored.id)
+        cache.finish_fill(stored.id, stored)
+        assert cache.get(stored.id) is not None
+
+    def test_fill_started_before_clear_is_dropped(self) -> None:
+        """Test a read started before a clear is not cached."""
+        cache: EntityCache[EntityForTest] = EntityCache()
+        entity = EntityForTest(id=uuid4(), tags=[])
+
+        cache.start_fill(entity.id)
+        cache.clear()
+        cache.finish_fill(entity.id, entity)
+
+        assert len(cache) == 0
+
+    def test_update_during_fills_leaves_no_stale_revision(self) -> None:
+        """Test the reads overlapping an update cache neither the revision read before it nor an older one."""
+        cache: EntityCache[EntityForTest] = EntityCache()
+        stored = EntityForTest(id=uuid4(), tags=["old"], revision_id=uuid4())
+        updated = EntityForTest(id=stored.id, tags=["new"], revision_id=uuid4())
+
+        # A read of the stored revision is in flight when another repository updates the entity and invalidates it.
+        cache.start_fill(stored.id)
+        cache.invalidate(stored.id)
+        # A second read, started after the update, reads the updated revision and finishes first.
+        cache.start_fill(stored.id)
+        cache.finish_fill(updated.id, updated)
+        cache.finish_fill(stored.id, stored)
+
+        assert cache.get(stored.id) is None
+
+        cache.start_fill(stored.id)
+        cache.finish_fill(updated.id, updated)
+        cached = cache.get(stored.id)
+        assert cached is not None
+        assert cached[0].revision_id == updated.revision_id
@@ -0,0 +1,149 @@
+"""Provides unit tests for the converters module."""
+
+import datetime
+import json
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import bson
+import pytest
+from bson import Binary, Decimal128, ObjectId
+from bson.raw_bson import RawBSONDocument
+from pydantic import BaseModel, Field, field_validator
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.converters import (
+    EntityDocumentConverter,
+    get_converter,
+    raw_document_to_json,
+)
+from fastapi_factory_utilities.core.plugins.odm_plugin.documents import BaseDocument
+
+
+class AddressDocumentForTest(BaseModel):
+    """Nested model of the document."""
+
+    city: str
+
+
+class AddressEntityForTest(BaseModel):
+    """Nested model of the entity."""
+
+    city: str
+
+
+class DocumentForTest(BaseDocument):
+    """Test document class."""
+
+    name: str
+    address: AddressDocumentForTest | None = None
+    internal_note: str = "internal"
+
+
+class EntityForTest(BaseModel):
+    """Test entity class."""
+
+    id: UUID
+    name: str
+    address: AddressEntityForTest | None = None
+    created_at: datetime.datetime | None = Field(default=None)
+
+    @field_validator("name")
+    @classmethod
+    def name_must_not_be_blank(cls, value: str) -> str:
+        """Refuse blank names."""
+        if not value.strip():
+            raise ValueError("The name must not be blank.")
+        return value
+
+
+class TrustedEntityForTest(BaseModel):
+    """Test entity class, whose fields are all stored with the same types."""
+
+    id: UUID
+    name: str
+    internal_note: str
+
+    @field_validator("name")
+    @classmethod
+    def name_must_not_be_blank(cls, value: str) -> str:
+        """Refuse blank names."""
+        if not value.strip():
+            raise ValueError("The name must not be blank.")
+        return value
+
+
+class TestEntityDocumentConverter:
+    """Unit tests for the EntityDocumentConverter class."""
+
+    def test_to_entity(self) -> None:
+        """Test the conversion of the shared fields, with nested models of different types."""
+        converter = EntityDocumentConverter(document_type=DocumentForTest, entity_type=EntityForTest)
+        # Documents read from the database are already validated
+        document = DocumentForTest.model_construct(id=uuid4(), name="name", address=AddressDocumentForTest(city="city"))
+
+        entity: EntityForTest = converter.to_entity(document)
+
+        assert entity.id == document.id
+        assert entity.name == "name"
+        assert entity.address == AddressEntityForTest(city="city")
+        assert entity.created_at == document.created_at
+        assert not hasattr(entity, "internal_note")
+
+    def test_to_entity_is_validated(self) -> None:
+        """Test the entities are validated, the validators of the entity included."""
+        document = DocumentForTest.model_construct(id=uuid4(), name=" ")
+
+        with pytest.raises(ValueError):
+            EntityDocumentConverter(DocumentForTest, EntityForTest).to_entity(document)
+
+    def test_trusted_to_entity(self) -> None:
+        """Test the trusted conversion builds the entity without validating the values read."""
+        converter = EntityDocumentConverter(DocumentForTest, TrustedEntityForTest, trusted=True)
+        document = DocumentForTest.model_construct(id=uuid4(), name=" ")
+
+        entity: TrustedEntityForTest = converter.to_entity(document)
+
+        assert converter.trusted
+        assert entity == TrustedEntityForTest.model_construct(id=document.id, name=" ", internal_note="internal")
+        assert entity.model_fields_set == {"id", "name", "internal_note"}
+        assert entity.model_dump() == {"id": document.id, "name": " ", "internal_note": "internal"}
+
+    def test_trusted_requires_the_same_types(self) -> None:
+        """Test the trusted conversion is refused when a field of the entity must be converted."""
+        with pytest.raises(ValueError):
+            EntityDocumentConverter(DocumentForTest, EntityForTest, trusted=True)
+
+    def test_get_converter_is_cached(self) -> None:
+        """Test the converter is built once per document and entity pair."""
+        assert get_converter(DocumentForTest, EntityForTest) is get_converter(DocumentForTest, EntityForTest)
+        assert get_converter(DocumentForTest, EntityForTest) is not get_converter(DocumentForTest, DocumentForTest)
+
+
+class TestRawDocumentToJson:
+    """Unit tests for the raw_document_to_json function."""
+
+    def test_matches_the_json_of_the_entities(self) -> None:
+        """Test the UUIDs and the datetimes are encoded as in the JSON of the entities."""
+        identifier: UUID = uuid4()
+        created_at = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.UTC)
+        raw = RawBSONDocument(
+            bson.encode({"_id": Binary.from_uuid(identifier), "created_at": created_at, "tags": ["a"], "score": 1.5})
+        )
+
+        class EntityForJson(BaseModel):
+            id: UUID
+            created_at: datetime.datetime
+            tags: list[str]
+            score: float
+
+        expected: bytes = EntityForJson(id=identifier, created_at=created_at, tags=["a"], score=1.5).model_dump_json()
+        assert raw_document_to_json(raw, rename={"_id": "id"}) == expected.encode()
+
+    def test_other_bson_types(self) -> None:
+        """Test the BSON types without JSON equivalent are encoded as strings, the binary data in base64."""
+        object_id = ObjectId()
+        raw = RawBSONDocument(
+            bson.encode({"_id": object_id, "price": Decimal128(Decimal("9.99")), "blob": Binary(b"\x00\x01")})
+        )
+
+        assert json.loads(raw_document_to_json(raw)) == {"_id": str(object_id), "price": "9.99", "blob": "AAE="}
@@ -0,0 +1,101 @@
+"""Provides unit tests for the exports module."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncGenerator
+
+import pytest
+from pydantic import BaseModel
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.enums import ExportFormatEnum
+from fastapi_factory_utilities.core.plugins.odm_plugin.exports import export_response
+
+
+class BookForTest(BaseModel):
+    """Test entity class."""
+
+    title: str
+    year: int
+    tags: list[str]
+    subtitle: str | None = None
+
+
+class SourceForTest:
+    """Fake stream of a repository, recording how far it was read and whether it was closed."""
+
+    def __init__(self, count: int) -> None:
+        """Initialize the source."""
+        self.count: int = count
+        self.read: int = 0
+        self.closed: bool = False
+
+    async def stream(self) -> AsyncGenerator[BookForTest, None]:
+        """Yield the books."""
+        try:
+            for index in range(self.count):
+                self.read += 1
+                yield BookForTest(title=f"Book, {index}", year=1960 + index, tags=["sf"])
+        finally:
+            self.closed = True
+
+
+class TestExportResponse:
+    """Unit tests for the export_response function."""
+
+    @pytest.mark.asyncio()
+    async def test_ndjson(self) -> None:
+        """Test the entities are written one JSON object per line, grouped by chunk."""
+        source = SourceForTest(count=5)
+        response = export_response(source.stream(), chunk_size=2, filename="books.ndjson")
+
+        chunks: list[bytes] = [chunk async for chunk in response.body_iterator]  # type: ignore[misc]
+
+        assert response.media_type == "application/x-ndjson"
+        assert response.headers["content-disposition"] == 'attachment; filename="books.ndjson"'
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+        lines: list[str] = b"".join(chunks).decode().splitlines()
+        assert json.loads(lines[0]) == {"title": "Book, 0", "year": 1960, "tags": ["sf"], "subtitle": None}
+        assert source.closed
+
+    @pytest.mark.asyncio()
+    async def test_csv(self) -> None:
+        """Test the entities are written as CSV rows under a header, nested values as JSON."""
+        response = export_response(SourceForTest(count=2).stream(), ExportFormatEnum.CSV)
+
+        body: str = b"".join([chunk async for chunk in response.body_iterator]).decode()  # type: ignore[misc]
+
+        assert response.media_type == "text/csv; charset=utf-8"
+        assert list(csv.reader(io.StringIO(body))) == [
+            ["title", "year", "tags", "subtitle"],
+            ["Book, 0", "1960", '["sf"]', ""],
+            ["Book, 1", "1961", '["sf"]', ""],
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_fields(self) -> None:
+        """Test only the fields given are exported, the CSV header being written even without entity."""
+        ndjson = export_response(SourceForTest(count=1).stream(), fields=["title"])
+        empty_csv = export_response(SourceForTest(count=0).stream(), ExportFormatEnum.CSV, fields=["title", "year"])
+
+        assert [chunk async for chunk in ndjson.body_iterator] == [b'{"title":"Book, 0"}\n']  # type: ignore[misc]
+        assert [chunk async for chunk in empty_csv.body_iterator] == [b"title,year\r\n"]  # type: ignore[misc]
+
+    @pytest.mark.asyncio()
+    async def test_reads_as_it_sends(self) -> None:
+        """Test the source is read one chunk ahead at most, and closed when the client stops reading."""
+        source = SourceForTest(count=1000)
+        response = export_response(source.stream(), chunk_size=10)
+        body_iterator = response.body_iterator
+
+        async for _ in body_iterator:
+            break
+
+        assert source.read == 10  # noqa: PLR2004
+        await body_iterator.aclose()  # type: ignore[attr-defined]
+        assert source.closed
+
+    def test_invalid_chunk_size(self) -> None:
+        """Test the chunk size must be strictly positive."""
+        with pytest.raises(ValueError):
+            export_response(SourceForTest(count=1).stream(), chunk_size=0)
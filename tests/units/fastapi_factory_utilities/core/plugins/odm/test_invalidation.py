@@ -0,0 +1,242 @@
+"""Provides unit tests for the invalidation module."""
+
+import asyncio
+import time
+from collections.abc import Mapping
+from typing import Any, Self
+from uuid import UUID, uuid4
+
+import pytest
+from bson import Binary
+from pydantic import BaseModel
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.cache import EntityCache
+from fastapi_factory_utilities.core.plugins.odm_plugin.invalidation import ChangeStreamCacheInvalidator
+
+
+class EntityForTest(BaseModel):
+    """Test entity class."""
+
+    id: UUID
+
+
+class DocumentForTest:
+    """Test document model, standing for a beanie document."""
+
+    @classmethod
+    def get_collection_name(cls) -> str:
+        """Provide the collection name."""
+        return "tests"
+
+
+class ChangeStreamForTest:
+    """Fake change stream replaying events once released, then failing with an error or waiting forever."""
+
+    def __init__(self, events: list[Mapping[str, Any]], error: Exception | None, released: bool = True) -> None:
+        """Initialize the stream."""
+        self._events: list[Mapping[str, Any]] = list(events)
+        self._error: Exception | None = error
+        self.released: asyncio.Event = asyncio.Event()
+        if released:
+            self.released.set()
+        self.alive: bool = True
+        self.resume_token: Mapping[str, Any] | None = None
+
+    async def __aenter__(self) -> Self:
+        """Open the stream."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close the stream."""
+        self.alive = False
+
+    async def try_next(self) -> Mapping[str, Any] | None:
+        """Provide the next event."""
+        await self.released.wait()
+        if self._events:
+            event: Mapping[str, Any] = self._events.pop(0)
+            self.resume_token = event["_id"]
+            if event["operationType"] == "invalidate":
+                self.alive = False
+            return event
+        if self._error is not None:
+            raise self._error
+        await asyncio.Event().wait()
+        return None
+
+
+class DatabaseForTest:
+    """Fake database opening the scripted change streams and recording the resume tokens."""
+
+    def __init__(self, streams: list[ChangeStreamForTest]) -> None:
+        """Initialize the database."""
+        self._streams: list[ChangeStreamForTest] = streams
+        self.resume_tokens: list[Mapping[str, Any] | None] = []
+        self.all_opened: asyncio.Event = asyncio.Event()
+
+    def watch(self, pipeline: list[dict[str, Any]], resume_after: Mapping[str, Any] | None) -> ChangeStreamForTest:
+        """Open the next change stream."""
+        assert pipeline
+        self.resume_tokens.append(resume_after)
+        if len(self._streams) == 1:
+            self.all_opened.set()
+        return self._streams.pop(0)
+
+
+def change(operation_type: str, document_id: Any, token: int) -> dict[str, Any]:
+    """Build a change event."""
+    return {
+        "_id": {"_data": str(token)},
+        "operationType": operation_type,
+        "ns": {"db": "test", "coll": "tests"},
+        "documentKey": {"_id": document_id},
+    }
+
+
+def cache_with(*entity_ids: UUID) -> EntityCache[EntityForTest]:
+    """Build a cache holding the entities."""
+    cache: EntityCache[EntityForTest] = EntityCache()
+    for entity_id in entity_ids:
+        cache.refresh(entity_id, EntityForTest(id=entity_id))
+    return cache
+
+
+class TestChangeStreamCacheInvalidator:
+    """Unit tests for the ChangeStreamCacheInvalidator class."""
+
+    def build(self, database: Any, reconnect_delay: float = 0) -> ChangeStreamCacheInvalidator:
+        """Build an invalidator, without reconnection delay by default."""
+        return ChangeStreamCacheInvalidator(
+            database=database,
+            document_models=[DocumentForTest],  # type: ignore[list-item]
+            reconnect_delay=reconnect_delay,
+        )
+
+    def test_register_unknown_model(self) -> None:
+        """Test only the watched document models accept caches."""
+        invalidator: ChangeStreamCacheInvalidator = ChangeStreamCacheInvalidator(database=None, document_models=[])  # type: ignore[arg-type]
+        with pytest.raises(ValueError):
+            invalidator.register(DocumentForTest, EntityCache())  # type: ignore[arg-type]
+
+    def test_apply(self) -> None:
+        """Test the changed documents are invalidated, whatever the UUID representation."""
+        kept, updated, deleted = uuid4(), uuid4(), uuid4()
+        cache: EntityCache[EntityForTest] = cache_with(kept, updated, deleted)
+        invalidator: ChangeStreamCacheInvalidator = self.build(database=None)
+        invalidator.register(DocumentForTest, cache)  # type: ignore[arg-type]
+
+        invalidator.apply(change("update", Binary.from_uuid(updated), token=1))
+        invalidator.apply(change("delete", deleted, token=2))
+
+        assert cache.get(kept) is not None
+        assert cache.get(updated) is None
+        assert cache.get(deleted) is None
+        assert invalidator.invalidations == 2  # noqa: PLR2004
+
+    def test_apply_collection_events(self) -> None:
+        """Test the collection and database level events clear the caches."""
+        cache: EntityCache[EntityForTest] = cache_with(uuid4())
+        invalidator: ChangeStreamCacheInvalidator = self.build(database=None)
+        invalidator.register(DocumentForTest, cache)  # type: ignore[arg-type]
+
+        invalidator.apply(change("drop", None, token=1))
+
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio()
+    async def test_resume_after_disconnection(self) -> None:
+        """Test the stream resumes after the last change received."""
+        first, second = uuid4(), uuid4()
+        cache: EntityCache[EntityForTest] = cache_with()
+        resumed_stream = ChangeStreamForTest(events=[change("update", second, token=2)], error=None, released=False)
+        database = DatabaseForTest(
+            streams=[
+                ChangeStreamForTest(events=[change("update", first, token=1)], error=AutoReconnect("lost")),
+                resumed_stream,
+            ]
+        )
+        invalidator: ChangeStreamCacheInvalidator = self.build(database=database)
+        invalidator.register(DocumentForTest, cache)  # type: ignore[arg-type]
+
+        invalidator.start()
+        await asyncio.wait_for(database.all_opened.wait(), timeout=1)
+        # The cache filled while the stream was reconnected is not cleared.
+        cache.refresh(first, EntityForTest(id=first))
+        cache.refresh(second, EntityForTest(id=second))
+        resumed_stream.released.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        await invalidator.stop()
+
+        assert database.resume_tokens == [None, {"_data": "1"}]
+        assert invalidator.resume_token == {"_data": "2"}
+        assert cache.get(first) is not None
+        assert cache.get(second) is None
+        assert not invalidator.running
+
+    @pytest.mark.asyncio()
+    async def test_history_lost_clears_the_caches(self) -> None:
+        """Test the caches are cleared when the stream cannot be resumed."""
+        entity_id: UUID = uuid4()
+        cache: EntityCache[EntityForTest] = cache_with()
+        database = DatabaseForTest(
+            streams=[
+                ChangeStreamForTest(
+                    events=[change("update", uuid4(), token=1)],
+                    error=OperationFailure("history lost", code=286),
+                ),
+                ChangeStreamForTest(events=[], error=None),
+            ]
+        )
+        invalidator: ChangeStreamCacheInvalidator = self.build(database=database)
+        invalidator.register(DocumentForTest, cache)  # type: ignore[arg-type]
+
+        invalidator.start()
+        # Let the first stream replay its event before filling the cache.
+        await asyncio.sleep(0)
+        cache.refresh(entity_id, EntityForTest(id=entity_id))
+        await asyncio.wait_for(database.all_opened.wait(), timeout=1)
+        await invalidator.stop()
+
+        assert database.resume_tokens == [None, None]
+        assert cache.get(entity_id) is None
+
+    @pytest.mark.asyncio()
+    async def test_unexpected_error_clears_the_caches_and_reconnects(self) -> None:
+        """Test an error other than a MongoDB one does not end the task and clears the caches."""
+        entity_id: UUID = uuid4()
+        cache: EntityCache[EntityForTest] = cache_with()
+        first_stream = ChangeStreamForTest(events=[], error=ValueError("undecodable change"), released=False)
+        database = DatabaseForTest(streams=[first_stream, ChangeStreamForTest(events=[], error=None)])
+        invalidator: ChangeStreamCacheInvalidator = self.build(database=database)
+        invalidator.register(DocumentForTest, cache)  # type: ignore[arg-type]
+
+        invalidator.start()
+        await asyncio.sleep(0)
+        cache.refresh(entity_id, EntityForTest(id=entity_id))
+        first_stream.released.set()
+        await asyncio.wait_for(database.all_opened.wait(), timeout=1)
+
+        assert invalidator.running
+        assert cache.get(entity_id) is None
+        await invalidator.stop()
+
+    @pytest.mark.asyncio()
+    async def test_closed_stream_is_reopened_after_the_delay(self) -> None:
+        """Test a stream closed by the server is not reopened at once."""
+        database = DatabaseForTest(
+            streams=[
+                ChangeStreamForTest(events=[change("invalidate", None, token=1)], error=None),
+                ChangeStreamForTest(events=[], error=None),
+            ]
+        )
+        invalidator: ChangeStreamCacheInvalidator = self.build(database=database, reconnect_delay=0.05)
+
+        started: float = time.monotonic()
+        invalidator.start()
+        await asyncio.wait_for(database.all_opened.wait(), timeout=1)
+
+        assert time.monotonic() - started >= 0.05  # noqa: PLR2004
+        assert database.resume_tokens == [None, None]
+        await invalidator.stop()
@@ -0,0 +1,90 @@
+"""Provides unit tests for the loaders module."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import BaseModel
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import OperationError
+from fastapi_factory_utilities.core.plugins.odm_plugin.loaders import EntityLoader, EntityLoaders
+
+
+class EntityForTest(BaseModel):
+    """Test entity class."""
+
+    id: UUID
+
+
+class TestEntityLoader:
+    """Unit tests for the EntityLoader class."""
+
+    @pytest.mark.asyncio()
+    async def test_lookups_of_a_tick_are_batched(self, build_repository: Callable[..., Any]) -> None:
+        """Test the concurrent lookups share one query and the same entity objects."""
+        first, second, missing = uuid4(), uuid4(), uuid4()
+        repository = build_repository(stored=[EntityForTest(id=first), EntityForTest(id=second)])
+        loader: EntityLoader[EntityForTest] = EntityLoader(repository=repository)
+
+        results = await asyncio.gather(
+            loader.load(first), loader.load(second), loader.load(first), loader.load(missing)
+        )
+
+        assert repository.batches == [[first, second, missing]]
+        assert results[0] is results[2]
+        assert results[1] is not None and results[1].id == second
+        assert results[3] is None
+
+    @pytest.mark.asyncio()
+    async def test_entities_are_kept_for_the_life_of_the_loader(self, build_repository: Callable[..., Any]) -> None:
+        """Test an entity is read once, until cleared."""
+        entity_id: UUID = uuid4()
+        repository = build_repository(stored=[EntityForTest(id=entity_id)])
+        loader: EntityLoader[EntityForTest] = EntityLoader(repository=repository)
+
+        entity = await loader.load(entity_id)
+        assert await loader.load_many([entity_id]) == [entity]
+        assert len(repository.batches) == 1
+
+        loader.clear(entity_id)
+        assert await loader.load(entity_id) is not entity
+        assert len(repository.batches) == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_prime(self, build_repository: Callable[..., Any]) -> None:
+        """Test a primed entity is returned without query."""
+        repository = build_repository()
+        loader: EntityLoader[EntityForTest] = EntityLoader(repository=repository)
+        entity = EntityForTest(id=uuid4())
+
+        loader.prime(entity.id, entity)
+
+        assert await loader.load(entity.id) is entity
+        assert repository.batches == []
+
+    @pytest.mark.asyncio()
+    async def test_failure_is_not_remembered(self, build_repository: Callable[..., Any]) -> None:
+        """Test a failed batch fails every lookup and is retried by the next lookup."""
+        entity_id: UUID = uuid4()
+        repository = build_repository(stored=[EntityForTest(id=entity_id)], fail=True)
+        loader: EntityLoader[EntityForTest] = EntityLoader(repository=repository)
+
+        results: list[Any] = await asyncio.gather(loader.load(entity_id), loader.load(uuid4()), return_exceptions=True)
+        assert all(isinstance(result, OperationError) for result in results)
+
+        repository.fail = False
+        assert await loader.load(entity_id) is not None
+
+
+class TestEntityLoaders:
+    """Unit tests for the EntityLoaders class."""
+
+    def test_one_loader_per_repository_type(self, build_repository: Callable[..., Any]) -> None:
+        """Test the repositories of the same type share a loader."""
+        loaders = EntityLoaders()
+
+        loader = loaders.get(build_repository())
+
+        assert loaders.get(build_repository()) is loader
@@ -0,0 +1,124 @@
+"""Provides unit tests for the monitoring module."""
+
+import datetime
+from typing import Any
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from pymongo import monitoring
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.monitoring import (
+    CommandProfiler,
+    PoolMetricsListener,
+    normalize_shape,
+)
+
+
+def collect(reader: InMemoryMetricReader) -> dict[str, list[Any]]:
+    """Collect the data points by metric name."""
+    metrics_data = reader.get_metrics_data()
+    assert metrics_data is not None
+    return {
+        metric.name: list(metric.data.data_points)
+        for resource_metrics in metrics_data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+
+
+class TestPoolMetricsListener:
+    """Unit tests for the PoolMetricsListener class."""
+
+    def test_checkouts_are_recorded(self) -> None:
+        """Test the checkout durations and the connections used are recorded by server."""
+        reader = InMemoryMetricReader()
+        listener = PoolMetricsListener(meter=MeterProvider(metric_readers=[reader]).get_meter("test"))
+        address: tuple[str, int] = ("localhost", 27017)
+
+        listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(address, 1, 0.25))
+        listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(address, 2, 0.5))
+        listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(address, 1))
+        listener.connection_check_out_failed(monitoring.ConnectionCheckOutFailedEvent(address, "timeout", 1.0))
+
+        points: dict[str, list[Any]] = collect(reader)
+        durations = {point.attributes["outcome"]: point for point in points["odm.pool.checkout.duration"]}
+        assert durations["success"].count == 2  # noqa: PLR2004
+        assert durations["success"].sum == 0.75  # noqa: PLR2004
+        assert durations["success"].attributes["server"] == "localhost:27017"
+        assert durations["timeout"].count == 1
+        assert points["odm.pool.connections.used"][0].value == 1
+
+
+ADDRESS: tuple[str, int] = ("localhost", 27017)
+
+
+def run_command(profiler: CommandProfiler, request_id: int, command: dict[str, Any], duration_ms: int) -> None:
+    """Send the events of a successful command to the profiler."""
+    profiler.started(monitoring.CommandStartedEvent(command, "test", request_id, ADDRESS, request_id))
+    profiler.succeeded(
+        monitoring.CommandSucceededEvent(
+            datetime.timedelta(milliseconds=duration_ms),
+            {"ok": 1},
+            next(iter(command)),
+            request_id,
+            ADDRESS,
+            request_id,
+            database_name="test",
+        )
+    )
+
+
+class TestCommandProfiler:
+    """Unit tests for the CommandProfiler class."""
+
+    def test_normalize_shape(self) -> None:
+        """Test the values are replaced while the fields, operators, clauses and field paths are kept."""
+        assert normalize_shape(
+            {"status": "active", "age": {"$gt": 18}, "tags": {"$in": ["a", "b"]}, "$or": [{"a": 1}, {"b": None}]}
+        ) == {"status": "?", "age": {"$gt": "?"}, "tags": {"$in": "?"}, "$or": [{"a": "?"}, {"b": "?"}]}
+        assert normalize_shape([{"$match": {"a": 1}}, {"$group": {"_id": "$category", "total": {"$sum": 1}}}]) == [
+            {"$match": {"a": "?"}},
+            {"$group": {"_id": "$category", "total": {"$sum": "?"}}},
+        ]
+
+    def test_durations_are_recorded(self) -> None:
+        """Test the duration of every command is recorded by collection and command."""
+        reader = InMemoryMetricReader()
+        profiler = CommandProfiler(meter=MeterProvider(metric_readers=[reader]).get_meter("test"))
+
+        run_command(profiler, 1, {"find": "books", "filter": {"title": "Dune"}}, duration_ms=5)
+        run_command(profiler, 2, {"getMore": 42, "collection": "books"}, duration_ms=3)
+        profiler.started(monitoring.CommandStartedEvent({"insert": "books"}, "test", 3, ADDRESS, 3))
+        profiler.failed(
+            monitoring.CommandFailedEvent(datetime.timedelta(milliseconds=1), {"ok": 0}, "insert", 3, ADDRESS, 3)
+        )
+
+        points = {
+            (point.attributes["collection"], point.attributes["command"], point.attributes["outcome"]): point
+            for point in collect(reader)["odm.command.duration"]
+        }
+        assert points[("books", "find", "success")].sum == 0.005  # noqa: PLR2004
+        assert points[("books", "getMore", "success")].count == 1
+        assert points[("books", "insert", "failure")].count == 1
+        assert profiler.slow_commands() == []
+
+    def test_slow_commands_are_kept(self) -> None:
+        """Test the slow commands are kept with their shape, slowest first, within the limit."""
+        profiler = CommandProfiler(slow_threshold_ms=10, max_slow_commands=2)
+
+        run_command(profiler, 1, {"find": "books", "filter": {"title": "Dune"}}, duration_ms=50)
+        run_command(profiler, 2, {"delete": "books", "deletes": [{"q": {"year": 1965}, "limit": 0}]}, duration_ms=20)
+        run_command(profiler, 3, {"aggregate": "books", "pipeline": [{"$match": {"year": 1965}}]}, duration_ms=30)
+        run_command(profiler, 4, {"find": "books", "filter": {}}, duration_ms=1)
+
+        slow_commands = profiler.slow_commands()
+        assert [(slow.command, slow.shape) for slow in slow_commands] == [
+            ("aggregate", [{"$match": {"year": "?"}}]),
+            ("delete", {"year": "?"}),
+        ]
+        assert slow_commands[0].collection == "books"
+        assert slow_commands[0].server == "localhost:27017"
+        assert profiler.slow_commands(limit=1) == slow_commands[:1]
+
+        profiler.clear()
+        assert profiler.slow_commands() == []
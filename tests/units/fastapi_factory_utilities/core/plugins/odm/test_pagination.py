@@ -0,0 +1,83 @@
+"""Provides unit tests for the pagination module."""
+
+import datetime
+from uuid import uuid4
+
+import pytest
+from beanie import SortDirection
+from bson import Binary
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import InvalidPaginationCursorError
+from fastapi_factory_utilities.core.plugins.odm_plugin.pagination import (
+    KeysetCursorCodec,
+    build_keyset_filter,
+    get_value_at_path,
+)
+
+SORT_KEYS: list[tuple[str, SortDirection]] = [
+    ("created_at", SortDirection.DESCENDING),
+    ("_id", SortDirection.ASCENDING),
+]
+
+
+class TestKeysetCursorCodec:
+    """Unit tests for the KeysetCursorCodec class."""
+
+    def test_round_trip(self) -> None:
+        """Test the values are restored from the token."""
+        codec = KeysetCursorCodec(secret=b"secret")
+        values = [datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.UTC), Binary.from_uuid(uuid4())]
+
+        token: str = codec.encode(SORT_KEYS, values)
+
+        assert codec.decode(token, SORT_KEYS) == values
+
+    def test_altered_token(self) -> None:
+        """Test an altered token is rejected."""
+        token: str = KeysetCursorCodec(secret=b"secret").encode(SORT_KEYS, [1, 2])
+
+        with pytest.raises(InvalidPaginationCursorError):
+            KeysetCursorCodec(secret=b"other").decode(token, SORT_KEYS)
+        with pytest.raises(InvalidPaginationCursorError):
+            KeysetCursorCodec(secret=b"secret").decode("A" + token, SORT_KEYS)
+        with pytest.raises(InvalidPaginationCursorError):
+            KeysetCursorCodec(secret=b"secret").decode("not-a-token", SORT_KEYS)
+
+    def test_other_sort_keys(self) -> None:
+        """Test a token built for other sort keys is rejected."""
+        codec = KeysetCursorCodec(secret=b"secret")
+        token: str = codec.encode(SORT_KEYS, [1, 2])
+
+        with pytest.raises(InvalidPaginationCursorError):
+            codec.decode(token, [("_id", SortDirection.ASCENDING)])
+
+    def test_empty_secret(self) -> None:
+        """Test an empty secret is refused."""
+        with pytest.raises(ValueError):
+            KeysetCursorCodec(secret=b"")
+
+
+class TestKeysetHelpers:
+    """Unit tests for the keyset helper functions."""
+
+    def test_build_keyset_filter(self) -> None:
+        """Test the filter selects the documents after the values."""
+        assert build_keyset_filter(SORT_KEYS, [1, 2]) == {
+            "$or": [
+                {"created_at": {"$lt": 1}},
+                {"created_at": 1, "_id": {"$gt": 2}},
+            ]
+        }
+
+    def test_build_keyset_filter_invalid_values(self) -> None:
+        """Test the number of values must match the sort keys."""
+        with pytest.raises(ValueError):
+            build_keyset_filter(SORT_KEYS, [1])
+
+    def test_get_value_at_path(self) -> None:
+        """Test the retrieval of nested values."""
+        document = {"a": {"b": 1}, "c": 2}
+
+        assert get_value_at_path(document, "a.b") == 1
+        assert get_value_at_path(document, "c") == 2  # noqa: PLR2004
+        assert get_value_at_path(document, "c.d") is None
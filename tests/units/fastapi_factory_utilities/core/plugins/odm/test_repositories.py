@@ -1,11 +1,53 @@
 """Provides unit tests for the repositories module."""
 
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any, ClassVar
+from uuid import uuid4
+
+import bson
+import pytest
+from bson.codec_options import CodecOptions
 from pydantic import BaseModel
+from pymongo.read_preferences import Nearest, Primary, Secondary, SecondaryPreferred
 
+from fastapi_factory_utilities.core.plugins.odm_plugin.advisor import IndexAdvisor
+from fastapi_factory_utilities.core.plugins.odm_plugin.aggregation import group, match
 from fastapi_factory_utilities.core.plugins.odm_plugin.documents import BaseDocument
+from fastapi_factory_utilities.core.plugins.odm_plugin.enums import ReadPreferenceEnum, SessionPolicyEnum
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import ODMPluginConfigError
 from fastapi_factory_utilities.core.plugins.odm_plugin.repositories import (
     AbstractRepository,
+    _chunked,  # pyright: ignore[reportPrivateUsage]
+    managed_session,
 )
+from fastapi_factory_utilities.core.plugins.odm_plugin.retries import RetryPolicy
+
+
+class SessionOwnerForTest:
+    """Provide a fake session to the managed_session decorator."""
+
+    SESSION_POLICY: SessionPolicyEnum = SessionPolicyEnum.EXPLICIT_CAUSAL
+
+    def __init__(self) -> None:
+        """Initialize the session owner."""
+        self.opened_sessions: list[bool] = []
+
+    @asynccontextmanager
+    async def get_session(self, causal_consistency: bool = True) -> AsyncGenerator[str, None]:
+        """Yield a fake session."""
+        self.opened_sessions.append(causal_consistency)
+        yield "managed"
+
+    @managed_session()
+    async def generate(self, session: Any = None) -> AsyncGenerator[Any, None]:
+        """Yield the session received."""
+        yield session
+
+    @managed_session()
+    async def call(self, session: Any = None) -> Any:
+        """Return the session received."""
+        return session
 
 
 class TestUnitRepositories:
@@ -32,3 +74,211 @@ class TestUnitRepositories:
         # pylint: disable=protected-access
         assert repository._document_type == ConcreteDocument  # pyright: ignore[reportPrivateUsage]
         assert repository._entity_type == ConcreteEntity  # pyright: ignore[reportPrivateUsage]
+
+    def test_chunked(self) -> None:
+        """Test the split of items into chunks."""
+        assert list(_chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+        assert not list(_chunked([], 2))
+
+    def test_chunked_invalid_size(self) -> None:
+        """Test the split of items with an invalid chunk size."""
+        with pytest.raises(ValueError):
+            list(_chunked(range(5), 0))
+
+    async def test_managed_session_with_async_generator(self) -> None:
+        """Test the session management of async generator methods."""
+        owner = SessionOwnerForTest()
+
+        assert [session async for session in owner.generate()] == ["managed"]
+        assert [session async for session in owner.generate(session="given")] == ["given"]
+        assert owner.opened_sessions == [True]
+
+    async def test_managed_session_policies(self) -> None:
+        """Test the session acquired for each session policy."""
+        owner = SessionOwnerForTest()
+
+        assert await owner.call() == "managed"
+        assert await owner.call(session_policy=SessionPolicyEnum.IMPLICIT) == "managed"
+        assert await owner.call(session_policy=SessionPolicyEnum.NONE) is None
+        assert await owner.call(session="given", session_policy=SessionPolicyEnum.IMPLICIT) == "given"
+        assert [session async for session in owner.generate(session_policy=SessionPolicyEnum.NONE)] == [None]
+        assert owner.opened_sessions == [True, False]
+
+    def test_read_preference_resolution(self) -> None:
+        """Test the read preference of a call combines its mode with the settings of the repository."""
+
+        class ConcreteDocument(BaseDocument):
+            pass
+
+        class ConcreteEntity(BaseModel):
+            pass
+
+        class ConcreteRepository(AbstractRepository[ConcreteDocument, ConcreteEntity]):
+            READ_PREFERENCE = ReadPreferenceEnum.SECONDARY_PREFERRED
+            READ_PREFERENCE_TAG_SETS: ClassVar[list[dict[str, str]] | None] = [{"dc": "east"}, {}]
+            MAX_STALENESS_SECONDS = 120
+
+        # pylint: disable=protected-access
+        repository = ConcreteRepository(database=None)  # type: ignore
+        given: Secondary = Secondary(tag_sets=[{"dc": "west"}])
+
+        assert repository._read_preference(None) == SecondaryPreferred(tag_sets=[{"dc": "east"}, {}], max_staleness=120)
+        assert repository._read_preference(ReadPreferenceEnum.NEAREST) == Nearest(
+            tag_sets=[{"dc": "east"}, {}], max_staleness=120
+        )
+        assert repository._read_preference(ReadPreferenceEnum.PRIMARY) == Primary()
+        assert repository._read_preference(given) is given
+
+    def test_read_preference_defaults_to_the_client(self) -> None:
+        """Test no read preference is set when neither the repository nor the call select one."""
+
+        class ConcreteDocument(BaseDocument):
+            pass
+
+        class ConcreteEntity(BaseModel):
+            pass
+
+        class ConcreteRepository(AbstractRepository[ConcreteDocument, ConcreteEntity]):
+            pass
+
+        repository = ConcreteRepository(database=None)  # type: ignore
+
+        assert repository._read_preference(None) is None  # pylint: disable=protected-access
+
+    def test_retry_policy_and_index_advisor_are_injected(self) -> None:
+        """Test the retry policy and the index advisor given to the repository override the ones of its class."""
+
+        class ConcreteDocument(BaseDocument):
+            pass
+
+        class ConcreteEntity(BaseModel):
+            pass
+
+        class ConcreteRepository(AbstractRepository[ConcreteDocument, ConcreteEntity]):
+            RETRY_POLICY: ClassVar[RetryPolicy | None] = RetryPolicy()
+            INDEX_ADVISOR: ClassVar[IndexAdvisor | None] = IndexAdvisor()
+
+        policy = RetryPolicy()
+        advisor = IndexAdvisor()
+        repository = ConcreteRepository(database=None)  # type: ignore
+        injected = ConcreteRepository(database=None, retry_policy=policy, index_advisor=advisor)  # type: ignore
+
+        assert repository.retry_policy is ConcreteRepository.RETRY_POLICY
+        assert repository.index_advisor is ConcreteRepository.INDEX_ADVISOR
+        assert injected.retry_policy is policy
+        assert injected.index_advisor is advisor
+        assert AbstractRepository.RETRY_POLICY is None
+        assert AbstractRepository.INDEX_ADVISOR is None
+
+    async def test_paginate_requires_a_secret(self) -> None:
+        """Test the repositories without a pagination secret refuse to paginate, instead of signing with their own."""
+
+        class ConcreteDocument(BaseDocument):
+            pass
+
+        class ConcreteEntity(BaseModel):
+            pass
+
+        class ConcreteRepository(AbstractRepository[ConcreteDocument, ConcreteEntity]):
+            pass
+
+        class SignedRepository(AbstractRepository[ConcreteDocument, ConcreteEntity]):
+            PAGINATION_SECRET: ClassVar[bytes | None] = b"class secret"
+
+        repository = ConcreteRepository(database=None)  # type: ignore
+
+        assert repository.pagination_secret is None
+        with pytest.raises(ODMPluginConfigError):
+            await repository.paginate()
+        assert ConcreteRepository(database=None, pagination_secret=b"shared").pagination_secret == b"shared"  # type: ignore
+        assert SignedRepository(database=None).pagination_secret == b"class secret"  # type: ignore
+
+
+class CollectionForTest:
+    """Fake collection encoding the filters as the driver does, with the default codec options of a client."""
+
+    def __init__(self) -> None:
+        """Initialize the collection."""
+        self.filters: list[dict[str, Any]] = []
+
+    def _encode(self, query: dict[str, Any]) -> None:
+        # Raises ValueError for a native UUID, the uuidRepresentation of the client being unspecified.
+        bson.encode(query, codec_options=CodecOptions())
+        self.filters.append(query)
+
+    async def count_documents(self, query: dict[str, Any], session: Any = None) -> int:
+        """Count the documents."""
+        self._encode(query)
+        return 1
+
+    async def find_one(self, query: dict[str, Any], projection: Any = None, session: Any = None) -> dict[str, Any]:
+        """Find a document."""
+        self._encode(query)
+        return {"_id": query.get("_id")}
+
+    async def aggregate(
+        self, pipeline: list[dict[str, Any]], session: Any = None, **kwargs: Any
+    ) -> AsyncGenerator[Any, None]:
+        """Run a pipeline."""
+        for stage in pipeline:
+            self._encode(stage)
+        yield {"_id": "A", "total": 1}
+
+
+class TestRawFilters:
+    """Unit tests for the raw filters of count, exists and aggregate."""
+
+    async def test_uuid_filters_are_encoded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the UUIDs of a raw filter are encoded before reaching the driver."""
+
+        class ConcreteDocument(BaseDocument):
+            pass
+
+        class ConcreteEntity(BaseModel):
+            pass
+
+        class ConcreteRepository(AbstractRepository[ConcreteDocument, ConcreteEntity]):
+            pass
+
+        collection = CollectionForTest()
+        monkeypatch.setattr(ConcreteDocument, "get_motor_collection", classmethod(lambda cls: collection))
+        repository = ConcreteRepository(database=None)  # type: ignore
+        entity_id = uuid4()
+
+        assert await repository.exists({"_id": entity_id}, session_policy=SessionPolicyEnum.NONE)
+        assert await repository.count({"_id": {"$in": [entity_id]}}, session_policy=SessionPolicyEnum.NONE) == 1
+        assert collection.filters == [
+            {"_id": bson.Binary.from_uuid(entity_id)},
+            {"_id": {"$in": [bson.Binary.from_uuid(entity_id)]}},
+        ]
+
+    async def test_uuid_stages_are_encoded(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the UUIDs of the stages of a pipeline are encoded before reaching the driver."""
+
+        class ConcreteDocument(BaseDocument):
+            pass
+
+        class ConcreteEntity(BaseModel):
+            pass
+
+        class ConcreteRepository(AbstractRepository[ConcreteDocument, ConcreteEntity]):
+            pass
+
+        collection = CollectionForTest()
+        monkeypatch.setattr(ConcreteDocument, "get_motor_collection", classmethod(lambda cls: collection))
+        repository = ConcreteRepository(database=None)  # type: ignore
+        entity_id = uuid4()
+
+        results = [
+            result
+            async for result in repository.aggregate(
+                [match({"_id": entity_id}), group("$category", total={"$sum": 1})],
+                session_policy=SessionPolicyEnum.NONE,
+            )
+        ]
+
+        assert results == [{"_id": "A", "total": 1}]
+        assert collection.filters == [
+            {"$match": {"_id": bson.Binary.from_uuid(entity_id)}},
+            {"$group": {"_id": "$category", "total": {"$sum": 1}}},
+        ]
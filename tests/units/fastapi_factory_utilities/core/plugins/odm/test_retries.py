@@ -0,0 +1,191 @@
+"""Provides unit tests for the retries module and the retried decorator of the repositories."""
+
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from pymongo.errors import AutoReconnect, OperationFailure, PyMongoError, ServerSelectionTimeoutError
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import OperationError
+from fastapi_factory_utilities.core.plugins.odm_plugin.repositories import retried
+from fastapi_factory_utilities.core.plugins.odm_plugin.retries import RetryBudget, RetryPolicy, is_transient
+
+
+def labelled(label: str) -> OperationFailure:
+    """Build a server error with the label."""
+    return OperationFailure("NotWritablePrimary", code=10107, details={"errorLabels": [label]})
+
+
+def build_policy(reader: InMemoryMetricReader | None = None, **kwargs: Any) -> RetryPolicy:
+    """Build a policy without delay between the attempts."""
+    meter = MeterProvider(metric_readers=[reader] if reader is not None else []).get_meter("test")
+    return RetryPolicy(base_delay=0, max_delay=0, meter=meter, **kwargs)
+
+
+class RepositoryForTest:
+    """Fake repository failing with the errors given, then succeeding."""
+
+    def __init__(self, errors: list[PyMongoError], retry_policy: RetryPolicy | None) -> None:
+        """Initialize the repository."""
+        self.errors: list[PyMongoError] = errors
+        self.retry_policy: RetryPolicy | None = retry_policy
+        self.calls: int = 0
+
+    def _attempt(self) -> None:
+        self.calls += 1
+        if self.errors:
+            error: PyMongoError = self.errors.pop(0)
+            raise OperationError(f"Failed: {error}") from error
+
+    @retried()
+    async def find(self) -> str:
+        """Read."""
+        self._attempt()
+        return "found"
+
+    @retried()
+    async def find_twice(self) -> str:
+        """Read through another retried method."""
+        return await self.find() + await self.find()
+
+    @retried()
+    async def stream(self) -> AsyncGenerator[int, None]:
+        """Stream, failing after the first item once the errors of the start are consumed."""
+        self._attempt()
+        yield 1
+        self._attempt()
+        yield 2
+
+
+@pytest.fixture(name="policy")
+def fixture_policy() -> RetryPolicy:
+    """Provide a retry policy without delay."""
+    return build_policy()
+
+
+class TestRetryPolicy:
+    """Unit tests for the RetryPolicy and RetryBudget classes."""
+
+    def test_is_transient(self) -> None:
+        """Test the labelled errors and the network errors are transient, not the server selection timeouts."""
+        assert is_transient(labelled("RetryableWriteError"))
+        assert is_transient(labelled("TransientTransactionError"))
+        assert is_transient(AutoReconnect("connection reset"))
+        assert not is_transient(ServerSelectionTimeoutError("no primary"))
+        assert not is_transient(OperationFailure("bad query", code=2))
+
+    def test_delay_is_bounded(self) -> None:
+        """Test the delays are drawn below the exponential backoff, capped at the maximum delay."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+
+        assert all(0 <= policy.delay(1) <= 0.1 for _ in range(100))  # noqa: PLR2004
+        assert all(0 <= policy.delay(5) <= 0.3 for _ in range(100))  # noqa: PLR2004
+
+    def test_budget(self) -> None:
+        """Test the budget allows a burst of retries, then a ratio of the calls."""
+        budget = RetryBudget(ratio=0.5, max_tokens=2)
+
+        assert budget.withdraw()
+        assert budget.withdraw()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert budget.withdraw()
+
+    @pytest.mark.asyncio()
+    async def test_retries_are_recorded(self) -> None:
+        """Test the retries and the calls given up are counted by operation and outcome."""
+        reader = InMemoryMetricReader()
+        policy: RetryPolicy = build_policy(reader, max_attempts=2)
+        errors: list[PyMongoError] = [AutoReconnect("1"), AutoReconnect("2"), AutoReconnect("3")]
+
+        async def call() -> None:
+            raise errors.pop(0)
+
+        with pytest.raises(AutoReconnect):
+            await policy.run("BookRepository.find", call)
+
+        metrics_data = reader.get_metrics_data()
+        assert metrics_data is not None
+        points = {
+            point.attributes["outcome"]: point.value
+            for resource_metrics in metrics_data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+            for point in metric.data.data_points
+        }
+        assert points == {"retried": 1, "attempts_exhausted": 1}
+        assert len(errors) == 1
+
+    @pytest.mark.asyncio()
+    async def test_other_exceptions_are_raised(self) -> None:
+        """Test the exceptions other than the MongoDB errors are raised at once."""
+        policy: RetryPolicy = build_policy()
+        calls: list[int] = []
+
+        async def call() -> None:
+            calls.append(1)
+            raise ValueError("not a MongoDB error")
+
+        with pytest.raises(ValueError):
+            await policy.run("BookRepository.find", call)
+        assert len(calls) == 1
+
+
+class TestRetried:
+    """Unit tests for the retried decorator."""
+
+    @pytest.mark.asyncio()
+    async def test_reads_retry_network_errors(self, policy: RetryPolicy) -> None:
+        """Test a read failing with network errors succeeds within the attempts."""
+        repository = RepositoryForTest(errors=[AutoReconnect("1"), AutoReconnect("2")], retry_policy=policy)
+
+        assert await repository.find() == "found"
+        assert repository.calls == 3  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_budget_stops_the_retries(self) -> None:
+        """Test the calls are not retried once the budget is spent."""
+        repository = RepositoryForTest(
+            errors=[AutoReconnect("1"), AutoReconnect("2")],
+            retry_policy=build_policy(budget=RetryBudget(ratio=0, max_tokens=1)),
+        )
+
+        with pytest.raises(OperationError):
+            await repository.find()
+        assert repository.calls == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_nested_calls_are_retried_once(self, policy: RetryPolicy) -> None:
+        """Test the retried methods called by a retried method do not retry on their own."""
+        repository = RepositoryForTest(errors=[AutoReconnect("1"), AutoReconnect("2")], retry_policy=policy)
+
+        assert await repository.find_twice() == "foundfound"
+        # The first call fails, then the first nested call of the retry fails, then both nested calls succeed.
+        assert repository.calls == 4  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_generators_retry_before_the_first_item(self, policy: RetryPolicy) -> None:
+        """Test a stream is retried until it yields, not once items were consumed."""
+        repository = RepositoryForTest(errors=[AutoReconnect("1")], retry_policy=policy)
+        assert [item async for item in repository.stream()] == [1, 2]
+
+        repository = RepositoryForTest(errors=[], retry_policy=policy)
+        items: list[int] = []
+        with pytest.raises(OperationError):
+            async for item in repository.stream():
+                items.append(item)
+                repository.errors.append(AutoReconnect("after the first item"))
+        assert items == [1]
+
+    @pytest.mark.asyncio()
+    async def test_without_policy(self) -> None:
+        """Test the calls are not retried without a retry policy."""
+        repository = RepositoryForTest(errors=[AutoReconnect("1")], retry_policy=None)
+
+        with pytest.raises(OperationError):
+            await repository.find()
+        assert repository.calls == 1
@@ -0,0 +1,50 @@
+"""Provides unit tests for the tracking module."""
+
+import gc
+
+from pydantic import BaseModel
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.tracking import EntitySnapshotTracker
+
+
+class EntityForTest(BaseModel):
+    """Test entity class."""
+
+    name: str
+
+
+class TestEntitySnapshotTracker:
+    """Unit tests for the EntitySnapshotTracker class."""
+
+    def test_track_and_forget(self) -> None:
+        """Test the snapshot is bound to the entity object."""
+        tracker = EntitySnapshotTracker()
+        entity = EntityForTest(name="name")
+        tracker.track(entity, {"name": "name"})
+
+        assert tracker.get(entity) == {"name": "name"}
+        assert tracker.get(entity.model_copy()) is None
+
+        tracker.forget(entity)
+        assert tracker.get(entity) is None
+
+    def test_snapshot_dropped_with_entity(self) -> None:
+        """Test the tracker does not keep the entities alive."""
+        tracker = EntitySnapshotTracker()
+        entity = EntityForTest(name="name")
+        tracker.track(entity, {"name": "name"})
+
+        del entity
+        gc.collect()
+
+        assert len(tracker) == 0
+
+    def test_diff(self) -> None:
+        """Test the changes ignore the fields managed by the repository."""
+        snapshot = {"_id": 1, "a": 1, "b": 2, "removed": 3, "updated_at": 1, "revision_id": 1}
+        current = {"_id": 1, "a": 1, "b": 3, "added": 4, "updated_at": 2, "revision_id": 2}
+
+        set_fields, unset_fields = EntitySnapshotTracker.diff(snapshot=snapshot, current=current)
+
+        assert set_fields == {"b": 3, "added": 4}
+        assert unset_fields == {"removed": ""}
@@ -0,0 +1,221 @@
+"""Provides unit tests for the unit_of_work module."""
+
+import asyncio
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from pymongo import InsertOne
+from pymongo.errors import OperationFailure, PyMongoError
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.enums import SessionPolicyEnum
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import OperationError
+from fastapi_factory_utilities.core.plugins.odm_plugin.repositories import managed_session
+from fastapi_factory_utilities.core.plugins.odm_plugin.tracking import EntitySnapshotTracker
+from fastapi_factory_utilities.core.plugins.odm_plugin.unit_of_work import UnitOfWork, get_unit_of_work_session
+
+
+class SessionForTest:
+    """Fake session recording the transactions."""
+
+    def __init__(self) -> None:
+        """Initialize the session."""
+        self.in_transaction: bool = False
+        self.events: list[str] = []
+        self.ended: bool = False
+
+    def start_transaction(self) -> None:
+        """Start a transaction."""
+        self.in_transaction = True
+        self.events.append("start")
+
+    async def commit_transaction(self) -> None:
+        """Commit the transaction."""
+        self.in_transaction = False
+        self.events.append("commit")
+
+    async def abort_transaction(self) -> None:
+        """Abort the transaction."""
+        self.in_transaction = False
+        self.events.append("abort")
+
+    async def end_session(self) -> None:
+        """End the session."""
+        self.ended = True
+
+
+class ClientForTest:
+    """Fake client providing the fake session."""
+
+    def __init__(self) -> None:
+        """Initialize the client."""
+        self.session: SessionForTest = SessionForTest()
+
+    async def start_session(self, causal_consistency: bool) -> SessionForTest:
+        """Start the session."""
+        assert causal_consistency
+        return self.session
+
+
+class BulkWriteResultForTest:
+    """Fake bulk write result."""
+
+    matched_count: int = 0
+
+
+class CollectionForTest:
+    """Fake collection failing the first bulk writes with the given errors."""
+
+    name: str = "tests"
+
+    def __init__(self, errors: list[PyMongoError]) -> None:
+        """Initialize the collection."""
+        self.errors: list[PyMongoError] = errors
+        self.written: list[list[Any]] = []
+
+    async def bulk_write(self, operations: list[Any], ordered: bool, session: SessionForTest) -> BulkWriteResultForTest:
+        """Write the operations."""
+        assert ordered
+        if self.errors:
+            raise self.errors.pop(0)
+        self.written.append(operations)
+        return BulkWriteResultForTest()
+
+
+class RepositoryForTest:
+    """Fake repository building insert operations."""
+
+    def __init__(self, collection: CollectionForTest) -> None:
+        """Initialize the repository."""
+        self.collection: CollectionForTest = collection
+        self._tracker: EntitySnapshotTracker = EntitySnapshotTracker()
+        self.invalidated: list[UUID] = []
+
+    def _collection(self) -> CollectionForTest:
+        return self.collection
+
+    def _insert_operation(self, entity: dict[str, Any]) -> tuple[InsertOne[Any], UUID]:
+        return InsertOne(entity), entity["_id"]
+
+    def _invalidate_cache(self, entity_id: UUID) -> None:
+        self.invalidated.append(entity_id)
+
+
+class WriterForTest:
+    """Fake repository method writing with the session received."""
+
+    SESSION_POLICY: SessionPolicyEnum = SessionPolicyEnum.NONE
+
+    @managed_session(write=True)
+    async def write(self, session: Any = None) -> Any:
+        """Return the session received."""
+        return session
+
+
+def transient_error() -> OperationFailure:
+    """Build an error labelled as transient by the server."""
+    return OperationFailure("write conflict", code=112, details={"errorLabels": ["TransientTransactionError"]})
+
+
+class TestUnitOfWork:
+    """Unit tests for the UnitOfWork class."""
+
+    @pytest.mark.asyncio()
+    async def test_commit_on_exit(self) -> None:
+        """Test the writes are committed in a transaction when the context exits."""
+        client = ClientForTest()
+        collection = CollectionForTest(errors=[])
+        repository = RepositoryForTest(collection=collection)
+        entity_id: UUID = uuid4()
+
+        async with UnitOfWork(client=client) as unit_of_work:  # type: ignore[arg-type]
+            assert get_unit_of_work_session() is client.session
+            unit_of_work.insert(repository, {"_id": entity_id})  # type: ignore[arg-type]
+            assert collection.written == []
+
+        assert get_unit_of_work_session() is None
+        assert len(collection.written) == 1
+        assert client.session.events == ["start", "commit"]
+        assert client.session.ended
+        assert repository.invalidated == [entity_id]
+
+    @pytest.mark.asyncio()
+    async def test_discard_on_error(self) -> None:
+        """Test the writes are discarded when the context exits with an error."""
+        client = ClientForTest()
+        collection = CollectionForTest(errors=[])
+
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(client=client) as unit_of_work:  # type: ignore[arg-type]
+                unit_of_work.insert(RepositoryForTest(collection=collection), {"_id": uuid4()})  # type: ignore[arg-type]
+                raise RuntimeError("failure")
+
+        assert collection.written == []
+        assert client.session.events == []
+
+    @pytest.mark.asyncio()
+    async def test_transient_errors_are_retried(self) -> None:
+        """Test the transaction is retried on transient errors."""
+        client = ClientForTest()
+        collection = CollectionForTest(errors=[transient_error()])
+
+        async with UnitOfWork(client=client, backoff=0) as unit_of_work:  # type: ignore[arg-type]
+            unit_of_work.insert(RepositoryForTest(collection=collection), {"_id": uuid4()})  # type: ignore[arg-type]
+
+        assert len(collection.written) == 1
+        assert client.session.events == ["start", "abort", "start", "commit"]
+
+    @pytest.mark.asyncio()
+    async def test_retries_are_bounded(self) -> None:
+        """Test the transient errors fail the commit after the last attempt."""
+        client = ClientForTest()
+        collection = CollectionForTest(errors=[transient_error(), transient_error()])
+
+        with pytest.raises(OperationError):
+            async with UnitOfWork(client=client, max_attempts=2, backoff=0) as unit_of_work:  # type: ignore[arg-type]
+                unit_of_work.insert(RepositoryForTest(collection=collection), {"_id": uuid4()})  # type: ignore[arg-type]
+
+        assert collection.written == []
+        assert client.session.events == ["start", "abort", "start", "abort"]
+
+    @pytest.mark.asyncio()
+    async def test_other_errors_are_not_retried(self) -> None:
+        """Test the errors not labelled as transient fail the commit at once."""
+        client = ClientForTest()
+        collection = CollectionForTest(errors=[OperationFailure("invalid", code=2)])
+
+        with pytest.raises(OperationError):
+            async with UnitOfWork(client=client, backoff=0) as unit_of_work:  # type: ignore[arg-type]
+                unit_of_work.insert(RepositoryForTest(collection=collection), {"_id": uuid4()})  # type: ignore[arg-type]
+
+        assert client.session.events == ["start", "abort"]
+
+    @pytest.mark.asyncio()
+    async def test_direct_writes_are_refused(self) -> None:
+        """Test the repositories cannot write inside a unit of work, outside of its transaction."""
+        client = ClientForTest()
+        writer = WriterForTest()
+
+        async with UnitOfWork(client=client) as unit_of_work:  # type: ignore[arg-type]
+            with pytest.raises(OperationError):
+                await writer.write()
+            with pytest.raises(OperationError):
+                await writer.write(session=unit_of_work.session)
+            with pytest.raises(OperationError):
+                await asyncio.create_task(writer.write())
+            assert await writer.write(session="other") == "other"
+
+        assert await writer.write() is None
+        assert client.session.events == []
+
+    @pytest.mark.asyncio()
+    async def test_spawned_tasks_do_not_share_the_session(self) -> None:
+        """Test the tasks spawned inside a unit of work do not use its session concurrently."""
+        client = ClientForTest()
+
+        async def read_session() -> Any:
+            return get_unit_of_work_session()
+
+        async with UnitOfWork(client=client):  # type: ignore[arg-type]
+            assert await asyncio.gather(read_session(), read_session()) == [None, None]
+            assert await read_session() is client.session
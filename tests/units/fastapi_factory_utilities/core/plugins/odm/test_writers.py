@@ -0,0 +1,167 @@
+"""Provides unit tests for the writers module."""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import BaseModel
+
+from fastapi_factory_utilities.core.plugins.odm_plugin.exceptions import OperationError
+from fastapi_factory_utilities.core.plugins.odm_plugin.types import InsertManyResult
+from fastapi_factory_utilities.core.plugins.odm_plugin.writers import BufferedWriter, BufferedWriters
+
+
+class EntityForTest(BaseModel):
+    """Test entity class."""
+
+    id: UUID
+
+
+async def yield_to_the_writer() -> None:
+    """Let the background flushes and the waiting producers run their pending steps."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestBufferedWriter:
+    """Unit tests for the BufferedWriter class."""
+
+    @pytest.mark.asyncio()
+    async def test_flush_on_batch_size(self, build_repository: Callable[..., Any]) -> None:
+        """Test a full batch is written without waiting for the interval."""
+        repository = build_repository()
+        writer: BufferedWriter[EntityForTest] = BufferedWriter(
+            repository=repository, max_batch_size=2, flush_interval=60
+        )
+        writer.start()
+
+        await writer.put(EntityForTest(id=uuid4()))
+        await yield_to_the_writer()
+        assert repository.batches == []
+        assert writer.queue_depth == 1
+
+        await writer.put(EntityForTest(id=uuid4()))
+        await asyncio.wait_for(repository.wait_for_batches(1), timeout=1)
+        # Wait for the background flush to end, the queue being empty.
+        await writer.flush()
+        assert [len(batch) for batch in repository.batches] == [2]
+        assert writer.stats().written == 2  # noqa: PLR2004
+
+        await writer.close()
+
+    @pytest.mark.asyncio()
+    async def test_flush_on_interval(self, build_repository: Callable[..., Any]) -> None:
+        """Test a partial batch is written once the interval elapsed."""
+        repository = build_repository()
+        writer: BufferedWriter[EntityForTest] = BufferedWriter(
+            repository=repository, max_batch_size=100, flush_interval=0.01
+        )
+        writer.start()
+
+        await writer.put(EntityForTest(id=uuid4()))
+        await asyncio.wait_for(repository.wait_for_batches(1), timeout=1)
+
+        assert [len(batch) for batch in repository.batches] == [1]
+        await writer.close()
+
+    @pytest.mark.asyncio()
+    async def test_backpressure(self, build_repository: Callable[..., Any]) -> None:
+        """Test put waits for room when the queue is full."""
+        repository = build_repository()
+        writer: BufferedWriter[EntityForTest] = BufferedWriter(repository=repository, max_queue_size=1)
+
+        await writer.put(EntityForTest(id=uuid4()))
+        blocked: asyncio.Task[None] = asyncio.create_task(writer.put(EntityForTest(id=uuid4())))
+        await yield_to_the_writer()
+        assert not blocked.done()
+
+        await writer.flush()
+        await asyncio.wait_for(blocked, timeout=1)
+        await writer.flush()
+        assert writer.stats().written == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio()
+    async def test_close_writes_the_queue(self, build_repository: Callable[..., Any]) -> None:
+        """Test closing writes the entities queued and refuses the next ones."""
+        repository = build_repository()
+        writer: BufferedWriter[EntityForTest] = BufferedWriter(
+            repository=repository, max_batch_size=2, flush_interval=60
+        )
+        writer.start()
+        for _ in range(3):
+            await writer.put(EntityForTest(id=uuid4()))
+
+        await writer.close()
+
+        assert sum(len(batch) for batch in repository.batches) == 3  # noqa: PLR2004
+        assert not writer.running
+        with pytest.raises(OperationError):
+            await writer.put(EntityForTest(id=uuid4()))
+
+    @pytest.mark.asyncio()
+    async def test_close_writes_the_entities_waiting_for_room(self, build_repository: Callable[..., Any]) -> None:
+        """Test an entity waiting for room when the writer closes is written, not lost after the final flush."""
+        repository = build_repository()
+
+        async def insert_many_without_yielding(entities: list[Any], ordered: bool) -> InsertManyResult[Any]:
+            assert not ordered
+            repository.batches.append(entities)
+            return InsertManyResult(inserted=entities, errors=[])
+
+        # The final flush then ends before the waiting producer enqueues its entity.
+        repository.insert_many = insert_many_without_yielding
+        writer: BufferedWriter[EntityForTest] = BufferedWriter(repository=repository, max_queue_size=1)
+        await writer.put(EntityForTest(id=uuid4()))
+        blocked: asyncio.Task[None] = asyncio.create_task(writer.put(EntityForTest(id=uuid4())))
+        await yield_to_the_writer()
+
+        await writer.close()
+        await asyncio.wait_for(blocked, timeout=1)
+
+        assert writer.stats().written == 2  # noqa: PLR2004
+        assert writer.queue_depth == 0
+
+    @pytest.mark.asyncio()
+    async def test_failures_are_counted_and_dropped(self, build_repository: Callable[..., Any]) -> None:
+        """Test the failed entities are counted without stopping the writer."""
+        duplicate: UUID = uuid4()
+        repository = build_repository(duplicates=[duplicate])
+        writer: BufferedWriter[EntityForTest] = BufferedWriter(repository=repository)
+
+        await writer.put(EntityForTest(id=duplicate))
+        await writer.put(EntityForTest(id=uuid4()))
+        await writer.flush()
+        repository.fail = True
+        await writer.put(EntityForTest(id=uuid4()))
+        await writer.flush()
+
+        stats = writer.stats()
+        assert stats.written == 1
+        assert stats.failed == 2  # noqa: PLR2004
+        assert stats.flushes == 2  # noqa: PLR2004
+        assert stats.queue_depth == 0
+
+    def test_invalid_settings(self, build_repository: Callable[..., Any]) -> None:
+        """Test the sizes and the interval must be strictly positive."""
+        with pytest.raises(ValueError):
+            BufferedWriter(repository=build_repository(), max_batch_size=0)
+        with pytest.raises(ValueError):
+            BufferedWriter(repository=build_repository(), flush_interval=0)
+
+
+class TestBufferedWriters:
+    """Unit tests for the BufferedWriters class."""
+
+    @pytest.mark.asyncio()
+    async def test_one_started_writer_per_repository_type(self, build_repository: Callable[..., Any]) -> None:
+        """Test the repositories of the same type share a started writer, closed with the writers."""
+        writers = BufferedWriters()
+
+        writer = writers.get(build_repository())
+
+        assert writers.get(build_repository()) is writer
+        assert writer.running
+        await writers.close()
+        assert not writer.running